@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — birleştirilebilir skor analizi (tüm popülasyon)
+# - Özet bir "küp"tür: (Kaynak, Prefix, Çalıştırma tipi, Tip, Tablo, Toplam Puan) hücresi başına
+#   satır adedi + kriter başına tam puan alan satır adedi
+# - Parça / işçi başına ayrı hesaplanıp birleştirilir (toplama); sonuç birleştirme sırasından bağımsızdır
+# - Histogram, yüzdelikler, ortalama/min/max, A/B/C/D, kriter geçme oranları ve Prefix / otomasyon / tip /
+#   kaynak kırılımları küpten okunur — satırlar yeniden taranmaz; filtre (prefix, otomasyon) küpte uygulanır
+# - Toplam puan tamsayı olduğundan yüzdelikler np.percentile (linear) ile birebir aynıdır
+
+import numpy as np
+import pandas as pd
+
+from multifile import SOURCE_COL, split_sources
+from scoring import CRITERIA, MAX_BY_TABLE, TABLE_BASE, TABLE_CODES, TABLE_RULES, TABLES, score_compact
+
+DIMS = ["Kaynak", "Prefix", "Automation", "Tip"]
+CELL_COLS = DIMS + ["Tablo", "Toplam Puan"]
+PASS_COLS = [f"{c} ✓" for c in CRITERIA]          # kriterden tam puan alan satır adedi
+COUNT_COLS = ["Adet"] + PASS_COLS
+SOURCE_DIM_COLS = [SOURCE_COL, "_Prefix", "_Automation"]   # boyutların okunduğu türetilmiş kolonlar
+DIM_LABELS = {"Prefix": "Prefix", "Automation": "Çalıştırma tipi", "Tip": "Tip", "Kaynak": "Kaynak"}
+PERCENTILES = (10, 25, 50, 75, 90)
+
+def _empty_cube() -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype=object if c in DIMS + ["Tablo"] else np.int64)
+                         for c in CELL_COLS + COUNT_COLS})
+
+def _group(frame: pd.DataFrame) -> pd.DataFrame:
+    if len(frame) == 0:
+        return _empty_cube()
+    return frame.groupby(CELL_COLS, sort=False)[COUNT_COLS].sum().reset_index()
+
+def _dim_values(source: pd.DataFrame, index) -> dict:
+    """Boyut kolonları kaynak çerçeveden (filtrelerle aynı türetilmiş kolonlar: _Prefix / _Automation / _Source)."""
+    n = len(index)
+    def col(name, default):
+        return source.loc[index, name].to_numpy(dtype=object) if name in source.columns else np.full(n, default, object)
+    return {"Kaynak": col(SOURCE_COL, ""), "Prefix": col("_Prefix", ""), "Automation": col("_Automation", "Manuel")}
+
+def _cells(dims: dict, types, tables, totals, passes) -> pd.DataFrame:
+    frame = pd.DataFrame({**dims, "Tip": types, "Tablo": tables, "Toplam Puan": np.asarray(totals, np.int64),
+                          "Adet": 1, **{c: passes[:, k].astype(np.int64) for k, c in enumerate(PASS_COLS)}})
+    return _group(frame)
+
+def cell_percent(cube: pd.DataFrame) -> np.ndarray:
+    """Hücre başına Skor % (finalize_results ile aynı formül)."""
+    maxes = cube["Tablo"].map(MAX_BY_TABLE).fillna(100).to_numpy(dtype=float)
+    return np.round(np.clip(cube["Toplam Puan"].to_numpy(dtype=float) / maxes, 0, 1) * 100, 1)
+
+def _percentile(values: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """Sıralı (değer, adet) histogramında np.percentile(..., method='linear') karşılığı."""
+    n = int(counts.sum())
+    pos = (n - 1) * q / 100
+    lo = int(np.floor(pos))
+    cum = np.cumsum(counts)
+    v_lo = values[np.searchsorted(cum, lo + 1)]
+    v_hi = values[np.searchsorted(cum, min(lo + 2, n))]
+    return float(v_lo + (v_hi - v_lo) * (pos - lo))
+
+class ScoreAnalytics:
+    """Birleştirilebilir skor özeti. add_* ile parça eklenir, merge ile başka özet katılır;
+    sorgular (histogram, yüzdelik, kırılım...) birikmiş küpten hesaplanır."""
+
+    def __init__(self, cube: pd.DataFrame=None):
+        self._parts = [] if cube is None else [cube]
+        self._cube = None
+
+    @property
+    def cube(self) -> pd.DataFrame:
+        """Hücre başına adetler (bekleyen parçalar ilk erişimde tek küpte toplanır)."""
+        if self._cube is None or self._parts:
+            parts = ([self._cube] if self._cube is not None else []) + self._parts
+            parts = [p for p in parts if len(p)]
+            self._cube = _group(pd.concat(parts, ignore_index=True)) if len(parts) > 1 else \
+                (parts[0] if parts else _empty_cube())
+            self._parts = []
+        return self._cube
+
+    def add_results(self, results: pd.DataFrame, source: pd.DataFrame) -> "ScoreAnalytics":
+        """score_frame sonuçlarını ekler (finalize_results uygulanmış olabilir); `source` satırları
+        (indeksle) kapsayan kaynak çerçeve — Prefix / otomasyon / kaynak oradan okunur."""
+        if len(results) == 0:
+            return self
+        codes = np.array([TABLE_CODES[t] for t in results["Tablo"].tolist()], dtype=np.intp)
+        base = TABLE_BASE[codes]
+        passes = np.zeros((len(results), len(CRITERIA)), dtype=bool)
+        for k, c in enumerate(CRITERIA):
+            if c in results.columns:
+                passes[:, k] = results[c].to_numpy(dtype=float) == base   # pasif kriter NaN → False
+        self._parts.append(_cells(_dim_values(source, results.index), results["_type"].to_numpy(dtype=object),
+                                  results["Tablo"].to_numpy(dtype=object), results["Toplam Puan"].to_numpy(), passes))
+        return self
+
+    def add_compact(self, compact, source: pd.DataFrame) -> "ScoreAnalytics":
+        """CompactResults'ı ekler (açıklama metinleri üretilmez); `source` add_results'taki gibi."""
+        if len(compact) == 0:
+            return self
+        passes = compact.active & (compact.points == TABLE_BASE[compact.tables][:, None])
+        self._parts.append(_cells(_dim_values(source, compact.index), np.array(compact.type_labels, dtype=object),
+                                  np.array(compact.table_labels, dtype=object), compact.total, passes))
+        return self
+
+    def merge(self, other: "ScoreAnalytics") -> "ScoreAnalytics":
+        self._parts.append(other.cube)
+        return self
+
+    @classmethod
+    def merged(cls, parts) -> "ScoreAnalytics":
+        out = cls()
+        for p in parts:
+            out.merge(p if isinstance(p, ScoreAnalytics) else cls(p))
+        return out
+
+    def filtered(self, prefixes=None, automation: str="Tümü") -> "ScoreAnalytics":
+        """scoring.filter_frame ile aynı prefix / Çalıştırma tipi filtresi, küp üzerinde."""
+        cube = self.cube
+        if prefixes:
+            cube = cube[cube["Prefix"].isin(prefixes)]
+        if automation == "Sadece Otomasyon":
+            cube = cube[cube["Automation"] == "Otomasyon"]
+        elif automation == "Sadece Manuel":
+            cube = cube[cube["Automation"] == "Manuel"]
+        return ScoreAnalytics(cube.reset_index(drop=True))
+
+    # ---------- Sorgular ----------
+    @property
+    def count(self) -> int:
+        return int(self.cube["Adet"].sum())
+
+    def _totals(self, cube: pd.DataFrame=None):
+        """(sıralı toplam puan değerleri, adetler)."""
+        h = (self.cube if cube is None else cube).groupby("Toplam Puan")["Adet"].sum().sort_index()
+        return h.index.to_numpy(dtype=np.int64), h.to_numpy(dtype=np.int64)
+
+    @property
+    def avg(self) -> float:
+        v, n = self._totals()
+        return round(float((v * n).sum() / n.sum()), 1) if n.sum() else 0
+
+    @property
+    def min(self):
+        v, _ = self._totals()
+        return int(v[0]) if len(v) else None
+
+    @property
+    def max(self):
+        v, _ = self._totals()
+        return int(v[-1]) if len(v) else None
+
+    def distribution(self) -> pd.Series:
+        d = self.cube.groupby("Tablo")["Adet"].sum()
+        return pd.Series({t: int(d.get(t, 0)) for t in TABLES}, name="count")
+
+    def percentiles(self, qs=PERCENTILES) -> pd.Series:
+        """Toplam puan yüzdelikleri (P10, P25...)."""
+        v, n = self._totals()
+        if not n.sum():
+            return pd.Series({f"P{q}": np.nan for q in qs}, dtype=float)
+        return pd.Series({f"P{q}": round(_percentile(v, n, q), 1) for q in qs})
+
+    def histogram(self, bins: int=10) -> pd.Series:
+        """Skor % histogramı (finalize_results'taki Skor % ile; son aralık 100'ü de kapsar)."""
+        cube = self.cube
+        pct = cell_percent(cube)
+        width = 100 / bins
+        idx = np.minimum((pct // width).astype(np.intp), bins - 1)
+        counts = np.bincount(idx, weights=cube["Adet"].to_numpy(dtype=float), minlength=bins).astype(np.int64)
+        labels = [f"{round(i * width):d}–{round((i + 1) * width):d}" for i in range(bins)]
+        return pd.Series(counts, index=pd.Index(labels, name="Skor %"), name="Adet")
+
+    def pass_rates(self) -> pd.DataFrame:
+        """Kriter başına: aktif olduğu satır, tam puan alan satır ve oran (%)."""
+        cube = self.cube
+        by_table = cube.groupby("Tablo")[COUNT_COLS].sum()
+        rows = []
+        for k, (c, pc) in enumerate(zip(CRITERIA, PASS_COLS)):
+            active = int(sum(by_table.loc[t, "Adet"] for t in by_table.index if k + 1 in TABLE_RULES[t][1]))
+            passed = int(by_table[pc].sum())
+            rows.append({"Kriter": c, "Aktif": active, "Tam puan": passed,
+                         "Oran %": round(passed / active * 100, 1) if active else np.nan})
+        return pd.DataFrame(rows)
+
+    def breakdown(self, dim: str) -> pd.DataFrame:
+        """Boyut (DIMS) değeri başına adet, ortalama/min/max/medyan puan, A/B/C/D ve kriter geçme oranları (%)."""
+        cube = self.cube
+        cols = [dim, "Adet", "Ortalama", "Min", "Medyan", "Max", *TABLES, *CRITERIA]
+        if len(cube) == 0:
+            return pd.DataFrame(columns=cols)
+        rows = []
+        for value, part in cube.groupby(dim, sort=True):
+            v, n = self._totals(part)
+            dist = part.groupby("Tablo")["Adet"].sum()
+            row = {dim: value, "Adet": int(n.sum()), "Ortalama": round(float((v * n).sum() / n.sum()), 1),
+                   "Min": int(v[0]), "Medyan": round(_percentile(v, n, 50), 1), "Max": int(v[-1]),
+                   **{t: int(dist.get(t, 0)) for t in TABLES}}
+            for k, (c, pc) in enumerate(zip(CRITERIA, PASS_COLS)):
+                active = int(sum(dist.get(t, 0) for t in TABLES if k + 1 in TABLE_RULES[t][1]))
+                row[c] = round(int(part[pc].sum()) / active * 100, 1) if active else np.nan
+            rows.append(row)
+        return pd.DataFrame(rows, columns=cols).rename(columns={dim: DIM_LABELS[dim]})
+
+def analyze_frame(df: pd.DataFrame, df_cols=None, parsed=None, source_cols=None, pool=None) -> ScoreAnalytics:
+    """Çerçevenin tüm satırlarını sıkıştırılmış skorlayıp özetler (sonuç çerçevesi kurulmaz).
+    `source_cols` (çoklu dosya): her kaynak kendi şemasıyla; `pool` (ScoringPool): bölümler işçilerde
+    skorlanıp özetlenir, yalnızca küpler döner."""
+    if source_cols:
+        groups = list(split_sources(df, source_cols))
+    else:
+        groups = [(df, df.columns if df_cols is None else df_cols)] if len(df) else []
+    if pool is not None:
+        return pool.analyze_groups(groups, df)
+    out = ScoreAnalytics()
+    for part, cols in groups:
+        out.add_compact(score_compact(part, cols, parsed), df)
+    return out
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — komut satırı (UI'sız toplu skorlama)
+# - `;` ayraçlı Jira/Xray export'unu okur, TÜM satırları skorlar (örnekleme yok)
+# - İndirme butonuyla aynı kolonları `;` ayraçlı CSV olarak yazar
+#
+# Kullanım:
+#   python batch.py export.csv -o skorlar.csv
+#   python batch.py export.csv --prefix QB284050 --automation "Sadece Manuel" --debug
+#   python batch.py export.csv --verify-signals      # sinyal tarayıcı + metin kuralları + steps JSON kontrolü
+#   python batch.py export.csv --chunksize 50000     # akış modu: RAM'e sığmayan export'lar
+#   python batch.py export.csv --workers 0           # tüm çekirdeklerle paralel skorlama
+#   python batch.py export.csv --store .score_store.sqlite   # yalnızca değişen satırları skorla
+#   python batch.py export.csv --profile profil.json  # aşama süreleri & sayaçlar
+#   python batch.py export.csv --sample 300 --stratify prefix,automation --seed 123   # katmanlı örneklem
+#   python batch.py export.csv --sample 300 --chunksize 50000 --seed 123   # rezervuar (akış) örneklem
+#   python batch.py export.csv -o skorlar.parquet     # tipli çıktı (csv.gz / parquet / arrow)
+#   python batch.py exports/ "gunluk/*.csv" --workers 0   # çoklu dosya: tek rapor, Kaynak kolonu
+#   python batch.py export.csv --features ozellik.parquet  # metin hattı özelliklerini de kaydet
+#   python batch.py ozellik.parquet -o skorlar.csv    # özelliklerden skorla (kural ayarı denemeleri, CSV taranmaz)
+#   python batch.py ozellik.parquet --summary         # yalnızca dağılım / ortalama (dosya yazılmaz)
+#   python batch.py export.csv --history .trend_history.sqlite   # trend geçmişine ekle (sorgu: history.py)
+
+import argparse
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from analytics import ScoreAnalytics
+from ingest import load_export
+from multifile import IO_WORKERS, combine, expand_inputs, per_source, read_sources, score_sources, source_labels, \
+    source_summary
+from parallel import ScoringPool, resolve_workers
+from decoding import available_decoders, set_decoder
+from export import EXPORT_FORMATS, format_from_path, write_results
+from features import StaleFeatures, extract_features, is_features_path, load_many_features, save_features
+from filtering import FilterIndex, sample_positions
+from history import HistoryStore
+from profiling import NULL_PROFILER, Profiler, profiling
+from sampling import STRATA_DIMS, category_codes, reservoir_sample, stratified_positions
+from scoring import (
+    CRITERIA, MAX_BY_TABLE, STEPS_COLS, TABLES, feature_tables, pick_first_existing, verify_steps_cell, filter_frame, finalize_results, score_feature_frame,
+    score_features_compact, score_frame, row_texts, predict_tables, rules_fingerprint, verify_text_rules,
+)
+from signals import verify_row
+from store import ScoreStore
+from streaming import iter_export_chunks, stream_score
+
+AUTOMATION_CHOICES = ["Tümü", "Sadece Otomasyon", "Sadece Manuel"]
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Test case CSV export'unu UI olmadan skorlar.")
+    p.add_argument("input", nargs="+",
+                   help="CSV export dosyası / klasör (*.csv) / glob; birden fazla dosya tek raporda birleşir "
+                        "(ayraç dosya başına koklanır, varsayılan `;`)")
+    p.add_argument("-o", "--output", default=None,
+                   help="Sonuç dosyası yolu (varsayılan: testcase_skorlari_<zaman>.<biçim>)")
+    p.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                   help="Çıktı biçimi (varsayılan: -o uzantısından, yoksa csv)")
+    p.add_argument("--prefix", action="append", default=[],
+                   help="Key prefix filtresi (birden fazla verilebilir)")
+    p.add_argument("--automation", choices=AUTOMATION_CHOICES, default="Tümü",
+                   help="Çalıştırma tipi filtresi")
+    p.add_argument("--debug", action="store_true", help="Sinyal & karar kolonlarını da yaz")
+    p.add_argument("--verify-signals", action="store_true",
+                   help="Skorlamak yerine derlenmiş sinyal tarayıcıyı, Expected yazım / tek blok "
+                        "kurallarını ve steps JSON çözümünü referans uygulamayla karşılaştır")
+    p.add_argument("--chunksize", type=int, default=0,
+                   help="Akış modu: export'u bu kadar satırlık parçalarla oku, sonuçları parça parça yaz")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Paralel skorlama süreç sayısı (1: seri, 0: tüm çekirdekler)")
+    p.add_argument("--store", default=None,
+                   help="Artımlı skor deposu (SQLite) yolu; yalnızca yeni/değişmiş satırlar skorlanır")
+    p.add_argument("--profile", default=None,
+                   help="Aşama süreleri ve sayaçları bu JSON dosyasına yaz (paralelde işçi aşamaları hariç)")
+    p.add_argument("--sample", type=int, default=0,
+                   help="Yalnızca bu kadar satırlık örneklemi skorla (--chunksize ile: rezervuar örnekleme)")
+    p.add_argument("--stratify", default="",
+                   help=f"Katmanlı örnekleme boyutları, virgülle: {','.join(STRATA_DIMS)}")
+    p.add_argument("--seed", type=int, default=None, help="Örnekleme tohumu (tekrarlanabilir örneklem)")
+    p.add_argument("--io-workers", type=int, default=IO_WORKERS,
+                   help="Çoklu dosyada eşzamanlı okunan dosya sayısı")
+    p.add_argument("--features", default=None,
+                   help="Satır özelliklerini (sinyaller, blok sayıları, Expected isabetleri...) bu Parquet "
+                        "dosyasına yaz ve özelliklerden skorla; dosya sonra girdi olarak verilebilir")
+    p.add_argument("--json-decoder", choices=available_decoders(), default=None,
+                   help="Steps JSON çözücüsü (varsayılan: kuruluysa orjson, değilse json; sonuç aynı)")
+    p.add_argument("--summary", action="store_true",
+                   help="Özellik dosyası girdisinde sonuç yazmadan yalnızca özet (dağılım, ortalama, kriter ortalamaları)")
+    p.add_argument("--history", default=None,
+                   help="Çalıştırmayı bu trend geçmişi deposuna (SQLite) ekle: Key başına skor + özet; "
+                        "delta sorguları: python history.py <yol> ...")
+    return p
+
+def parse_strata(value: str) -> list:
+    dims = [d.strip() for d in value.split(",") if d.strip()]
+    bad = [d for d in dims if d not in STRATA_DIMS]
+    if bad:
+        raise SystemExit(f"Bilinmeyen katman: {', '.join(bad)} (geçerli: {', '.join(STRATA_DIMS)})")
+    return dims
+
+def sample_frame(df, args, tables):
+    """--sample / --stratify: filtrelenmiş çerçeveden (katmanlı veya düz) örneklem.
+    `tables()`: 'table' katmanı için satır başına tablo kararı."""
+    n = min(args.sample, len(df))
+    pos = np.arange(len(df))
+    dims = parse_strata(args.stratify)
+    if not dims:
+        return df.iloc[sample_positions(pos, n, args.seed)]
+    findex = FilterIndex(df)
+    strata = [category_codes(tables()) if d == "table" else findex.codes(d) for d in dims]
+    return df.iloc[stratified_positions(strata, pos, n, args.seed)]
+
+def verify_signals(df) -> int:
+    """Export'u regresyon korpusu olarak kullanır; farklı sinyal üreten satırları raporlar."""
+    mismatches = 0
+    steps_col = pick_first_existing(STEPS_COLS, df.columns)
+    for cell in dict.fromkeys(df[steps_col].tolist()) if steps_col else ():
+        diffs = verify_steps_cell(cell)
+        if diffs:
+            mismatches += 1
+            print(f"❌ steps hücresi {str(cell)[:60]!r}: {', '.join(diffs)}", file=sys.stderr)
+    for key, summary, actions, expecteds, pre_text, labels_text in row_texts(df):
+        diffs = verify_row(summary, actions, expecteds, pre_text, labels_text) + verify_text_rules(actions, expecteds)
+        if diffs:
+            mismatches += 1
+            print(f"❌ {key}: {', '.join(diffs)}", file=sys.stderr)
+    print(f"{'✅' if mismatches == 0 else '❌'} {len(df)} satır, {mismatches} farklı sinyal", file=sys.stderr)
+    return 0 if mismatches == 0 else 1
+
+def print_summary(stats):
+    dist = stats.distribution()
+    print(f"Dağılım (A/B/C/D): {dist['A']}/{dist['B']}/{dist['C']}/{dist['D']} • "
+          f"Ortalama: {stats.avg} • Min: {stats.min} • Max: {stats.max}", file=sys.stderr)
+    print(f"Otomasyon: {stats.automation_counts.get('Otomasyon', 0)} • "
+          f"Manuel: {stats.automation_counts.get('Manuel', 0)}", file=sys.stderr)
+    if stats.source_counts:
+        print(" • ".join(f"{k}: {n}" for k, n in stats.source_counts.items()), file=sys.stderr)
+    print_analytics(stats.analytics)
+
+def print_analytics(an):
+    """Analiz küpünden puan yüzdelikleri ve kriter geçme oranları (tam puan alan / aktif satır)."""
+    print("Yüzdelikler: " + " • ".join(f"{q}: {v}" for q, v in an.percentiles().items()), file=sys.stderr)
+    rates = [f"{r['Kriter']} %{r['Oran %']}" for r in an.pass_rates().to_dict("records") if r["Aktif"]]
+    print("Kriter geçme (tam puan): " + " • ".join(rates), file=sys.stderr)
+
+def print_compact_summary(compact, feats):
+    """Açıklama metni üretmeden özet: tablo dağılımı, ortalama/min/max puan ve Skor %, kriter ortalamaları."""
+    total = compact.total
+    dist = np.bincount(compact.tables, minlength=len(TABLES))
+    max_pts = np.array([MAX_BY_TABLE[t] for t in TABLES])[compact.tables]
+    pct = np.clip(total / max_pts, 0, 1) * 100
+    print(f"✅ {len(compact)} satır (özelliklerden)", file=sys.stderr)
+    print(f"Dağılım (A/B/C/D): {'/'.join(str(int(n)) for n in dist)} • Ortalama: {round(total.mean(), 1)} • "
+          f"Min: {int(total.min())} • Max: {int(total.max())} • Skor %: {round(pct.mean(), 1)}", file=sys.stderr)
+    auto = feats["_Automation"].value_counts() if "_Automation" in feats.columns else {}
+    print(f"Otomasyon: {int(auto.get('Otomasyon', 0))} • Manuel: {int(auto.get('Manuel', 0))}", file=sys.stderr)
+    active = compact.active
+    means = [f"{c} {compact.points[active[:, k], k].mean():.1f}" for k, c in enumerate(CRITERIA) if active[:, k].any()]
+    print("Kriter ortalamaları (aktif satırlarda): " + " • ".join(means), file=sys.stderr)
+    print_analytics(ScoreAnalytics().add_compact(compact, feats))
+
+def print_sources(results):
+    for row in source_summary(results).to_dict("records"):
+        print(f"📄 {row['Kaynak']}: {row['Adet']} satır • ort. {row['Ortalama']} • "
+              f"A/B/C/D {row['A']}/{row['B']}/{row['C']}/{row['D']}", file=sys.stderr)
+
+def history_label(args) -> str:
+    parts = [" ".join(args.input)]
+    if args.prefix:
+        parts.append(f"prefix={','.join(args.prefix)}")
+    if args.automation != "Tümü":
+        parts.append(args.automation)
+    return " • ".join(parts)
+
+def print_history(run_id, path):
+    print(f"🗂 Trend geçmişine eklendi: çalıştırma #{run_id} → {path}", file=sys.stderr)
+
+def run_streaming(args, src, out, fmt, store=None) -> int:
+    run = HistoryStore(args.history).begin(history_label(args), rules=rules_fingerprint()) if args.history else None
+    try:
+        stats = stream_score(src, out, chunksize=args.chunksize, debug=args.debug,
+                             prefixes=args.prefix, automation=args.automation, workers=args.workers,
+                             store=store, out_format=fmt, history=run)
+    except BaseException:
+        if run is not None: run.abort()
+        raise
+    if stats.count == 0:
+        if run is not None: run.abort()
+        print("Filtreler sonrası kaynak veri boş.", file=sys.stderr)
+        return 1
+    if run is not None:
+        print_history(run.commit(), args.history)
+    print(f"✅ {stats.count} satır skorlandı (akış) → {out}", file=sys.stderr)
+    if store is not None:
+        print(f"♻️ {stats.reused} satır depodan", file=sys.stderr)
+    print_summary(stats)
+    return 0
+
+def score_all(df, args, store=None, source_cols=None):
+    """Tüm çerçeveyi skorlar: gerekirse süreç havuzu ve/veya skor deposu üzerinden.
+    `source_cols` (çoklu dosya): her kaynak kendi şemasıyla; havuzda tüm kaynaklar birlikte bölünür."""
+    pool = ScoringPool(args.workers) if resolve_workers(args.workers) > 1 else None
+    try:
+        scorer = pool.score if pool else score_frame
+        if source_cols:
+            scorer = lambda part, cols=None, debug=False: score_sources(part, source_cols, score_frame, debug, pool)
+        if store is None:
+            return scorer(df, debug=args.debug), 0
+        return store.score(df, debug=args.debug, scorer=scorer)
+    finally:
+        if pool: pool.close()
+
+def run_features(args, sources, out, fmt) -> int:
+    """Girdi özellik dosyaları: metin hattı çalışmaz, yalnızca özelliklerden skorlama."""
+    if args.chunksize or args.store or args.verify_signals or args.features:
+        print("Özellik dosyası girdisi --chunksize / --store / --verify-signals / --features ile kullanılmaz.",
+              file=sys.stderr)
+        return 2
+    try:
+        feats = load_many_features(sources)
+    except (StaleFeatures, ValueError, RuntimeError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    feats = filter_frame(feats, args.prefix, args.automation)
+    if len(feats) == 0:
+        print("Filtreler sonrası kaynak veri boş.", file=sys.stderr)
+        return 1
+    if args.sample:
+        feats = sample_frame(feats, args, lambda: feature_tables(feats))
+    if args.summary:
+        print_compact_summary(score_features_compact(feats), feats)
+        return 0
+    return write_report(args, finalize_results(score_feature_frame(feats, args.debug), feats), out, fmt, len(sources),
+                        source=feats)
+
+def write_report(args, results, out, fmt, n_files: int, reused=None, source=None) -> int:
+    """`source`: sonuçların kaynak çerçevesi (--history kaydı prefix / otomasyon / kaynak boyutlarını oradan okur)."""
+    multi = "Kaynak" in results.columns
+    write_results(results, out, fmt, args.debug, sources=multi)
+    if args.history:
+        print_history(HistoryStore(args.history).record(results, source, history_label(args), rules=rules_fingerprint()),
+                      args.history)
+    print(f"✅ {len(results)} satır skorlandı ({n_files} dosya) → {out}" if n_files > 1
+          else f"✅ {len(results)} satır skorlandı → {out}", file=sys.stderr)
+    if reused is not None:
+        print(f"♻️ {reused} satır depodan", file=sys.stderr)
+    if multi:
+        print_sources(results)
+    return 0
+
+def run(args) -> int:
+    paths = expand_inputs(args.input)
+    if not paths:
+        print(f"Girdiyle eşleşen dosya yok: {' '.join(args.input)}", file=sys.stderr)
+        return 2
+    multi = len(paths) > 1
+    sources = list(zip(source_labels(paths), paths))
+    fmt = args.format or (format_from_path(args.output) if args.output else "csv")
+    out = args.output or f"testcase_skorlari_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt}"
+    if args.history and (args.sample or args.verify_signals or args.summary):
+        print("--history tüm satırların skorlandığı çalıştırmalarla kullanılır (--sample / --verify-signals / "
+              "--summary hariç).", file=sys.stderr)
+        return 2
+    if any(is_features_path(p) for p in paths):
+        if not all(is_features_path(p) for p in paths):
+            print("CSV export'ları ve özellik dosyaları birlikte verilemez.", file=sys.stderr)
+            return 2
+        return run_features(args, sources, out, fmt)
+    if args.features and (args.chunksize or args.store):
+        print("--features akış modu (--chunksize) ve --store ile kullanılmaz.", file=sys.stderr)
+        return 2
+    store = ScoreStore(args.store) if args.store else None
+    if args.chunksize and args.sample and args.stratify:
+        print("--stratify akış modunda (--chunksize) desteklenmez; rezervuar örnekleme düzdür.", file=sys.stderr)
+        return 2
+    source_cols = None
+    if args.chunksize and not args.verify_signals:
+        if not args.sample:
+            return run_streaming(args, sources if multi else paths[0], out, fmt, store)
+        if multi:
+            print("--sample akış modunda (--chunksize) tek dosyayla kullanılır.", file=sys.stderr)
+            return 2
+        # Rezervuar: dosya belleğe alınmadan örneklem; yalnızca örneklem skorlanır
+        chunks = (filter_frame(c, args.prefix, args.automation) for c in iter_export_chunks(paths[0], args.chunksize))
+        df = reservoir_sample(chunks, args.sample, args.seed)
+    elif multi:
+        # Dosyalar eşzamanlı okunur; doğrulama dosya başına (şema dosyadan dosyaya değişebilir)
+        frames = read_sources(sources, args.io_workers)
+        if args.verify_signals:
+            return max(verify_signals(filter_frame(f, args.prefix, args.automation)) for _, f in frames)
+        df, source_cols = combine(frames)
+        df = filter_frame(df, args.prefix, args.automation)
+    else:
+        df = load_export(paths[0])
+        df = filter_frame(df, args.prefix, args.automation)
+    if len(df) == 0:
+        print("Filtreler sonrası kaynak veri boş.", file=sys.stderr)
+        return 1
+    if args.verify_signals:
+        return verify_signals(df)
+    if args.features:
+        # Özellikler filtrelenmiş tüm satırlar için kaydedilir; örneklem ve skorlama özelliklerden
+        feats = extract_features(df, source_cols=source_cols)
+        save_features(feats, args.features)
+        print(f"🧬 {len(feats)} satırın özellikleri → {args.features}", file=sys.stderr)
+        if args.sample and not args.chunksize:
+            feats = sample_frame(feats, args, lambda: feature_tables(feats))
+        return write_report(args, finalize_results(score_feature_frame(feats, args.debug), feats), out, fmt,
+                            len(paths), source=feats)
+    if args.sample and not args.chunksize:
+        df = sample_frame(df, args, lambda: per_source(df, source_cols, lambda part, cols: predict_tables(part, cols)))
+
+    scored, reused = score_all(df, args, store, source_cols)
+    return write_report(args, finalize_results(scored, df), out, fmt, len(paths),
+                        reused if store is not None else None, source=df)
+
+def print_profile(prof, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(prof.to_json())
+    for row in prof.to_dict()["stages"]:
+        print(f"⏱ {row['stage']:<22} {row['seconds'] * 1000:>10.1f} ms  ×{row['calls']}", file=sys.stderr)
+    for name, n in prof.counters.items():
+        print(f"# {name:<22} {n:>10}", file=sys.stderr)
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.json_decoder:
+        set_decoder(args.json_decoder)
+    with profiling(Profiler() if args.profile else NULL_PROFILER) as prof:
+        rc = run(args)
+    if args.profile:
+        print_profile(prof, args.profile)
+    return rc
+
+if __name__ == "__main__":
+    sys.exit(main())
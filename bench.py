@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — benchmark & sentetik export üretici
+# - Deterministik (seed) Jira/Xray benzeri export: TR/EN steps JSON, hücrede HTML,
+#   çift tırnaklı (""…"") JSON, boş precondition kolonları, Automated varyantları
+# - Aşama bazlı süre, satır/sn ve tepe bellek: okuma, filtre, skorlama, çıktı, skor analizi
+# - Kural fonksiyonları için mikro ölçümler (parse_steps, choose_table, ...)
+# - --baseline ile önceki JSON rapora göre gerileme kontrolü
+#
+# Kullanım:
+#   python bench.py --sizes 1k,10k,100k
+#   python bench.py --sizes 10k --json bench.json
+#   python bench.py --sizes 10k --baseline bench.json --tolerance 0.25
+#   python bench.py --generate 1m -o synthetic_1m.csv
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from analytics import DIMS, ScoreAnalytics
+from ingest import read_export
+from selection import extremes
+from scoring import (
+    MAX_BY_TABLE, derive_columns, filter_frame, score_frame, score_compact, finalize_results, result_columns,
+    parse_steps, parse_row_steps, parse_steps_column, choose_table, expected_style_penalty, expected_style_hits,
+    block_has_many_substeps, score_one, STEPS_COLS, PRECOND_EXACT_COLS,
+)
+
+# ---------- Sentetik export ----------
+EXPORT_COLUMNS = ["Issue key", "Summary", "Priority", "Labels", "Labels", STEPS_COLS[0],
+                  PRECOND_EXACT_COLS[0], PRECOND_EXACT_COLS[1], "Automated"]
+PREFIXES = ["QB284050", "QM284050", "PAY", "CRM", "APP"]
+SUMMARIES = [
+    "Kullanıcı giriş ekranında hatalı şifre uyarısı", "Login test edilir", "Kısa",
+    "Profil güncelleme akışı web üzerinde kontrol edilir", "Backend API response şeması doğrulaması",
+    "Ödeme sayfası iOS cihazda açılır", "Subscription renewal flow with active subscription",
+    "Ön koşul: abonelik aktif kullanıcı ile fatura görüntüleme", "", "Android push bildirim izni",
+]
+ACTIONS = [
+    "Uygulama açılır", "Login olunur ve ana ekran açılır", "POST /api/v1/users request gönderilir",
+    "Butona tıklanır, form doldurulur, sonra kaydet ve ardından çıkılır",
+    "1. Ayarlar açılır\n2. Profil seçilir\n3. Kaydet tıklanır",
+    "SELECT * FROM subscribers WHERE msisdn = '5551234567'",
+    "Kullanıcı giriş yapmış olmalı ve role config gerekli",
+    "<p>Ekran <b>açılır</b></p><br/>Menüden <span>Fatura</span> seçilir",
+    "Open the app on Chrome and click the Login button", "GET /billing/invoices çağrılır",
+    "Dropdown'dan tarih seçilir; filtre uygulanır; liste yenilenir", "kontrol edildi",
+]
+EXPECTEDS = [
+    "Hata mesajı gösterilir", "Başarılı oldu", "Kayıt yapıldı ve kullanıcıya gösterildi",
+    "Response 200 döner ve body içinde token bulunur", "<ul><li>Liste görüntülenir</li></ul>",
+    "The invoice list is displayed", "İşlem tamamlandı, kayıt edildi, bildirim gönderilmedi",
+    "n/a", "", "Ekran açılmalı",
+]
+DATAS = ["", "-", "msisdn=5551234567", "{\"amount\": 10}", "user_id: 42", "n/a", "email: test@example.com"]
+PRIORITIES = ["High", "Medium", "Low", "", "Highest"]
+LABELS = ["", "backend", "ui android", "regression", "web", "ios smoke"]
+PRECONDS = ["", "", "", "PRE-101", "PRE-7, PRE-8", "  "]
+AUTOMATED = ["", "No", "Yes", "TRUE", "android-automated", "ios_automated", "Manual"]
+
+def _steps_json(rng: random.Random) -> str:
+    steps = []
+    for i in range(rng.choice([0, 1, 1, 2, 3, 4])):
+        fields = {("Action" if rng.random() < 0.9 else "Step"): rng.choice(ACTIONS)}
+        if rng.random() < 0.5:
+            fields["Data"] = rng.choice(DATAS)
+        fields["Expected Result" if rng.random() < 0.85 else "Expected"] = rng.choice(EXPECTEDS)
+        fields["Attachments"] = []
+        steps.append({"id": i + 1, "index": i + 1, "fields": fields})
+    raw = json.dumps(steps, ensure_ascii=False)
+    r = rng.random()
+    if r < 0.10:   # dışa aktarımda iki kez tırnaklanmış JSON
+        return '"' + raw.replace('"', '""') + '"'
+    if r < 0.13:
+        return ""
+    return raw
+
+def iter_rows(n: int, seed: int=0):
+    """Deterministik sentetik satırlar (EXPORT_COLUMNS sırasıyla)."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield [
+            f"{rng.choice(PREFIXES)}-{i + 1}", rng.choice(SUMMARIES), rng.choice(PRIORITIES),
+            rng.choice(LABELS), rng.choice(LABELS), _steps_json(rng),
+            rng.choice(PRECONDS), rng.choice(PRECONDS), rng.choice(AUTOMATED),
+        ]
+
+def write_export(out, n: int, seed: int=0):
+    """`;` ayraçlı sentetik export'u dosya yoluna veya metin akışına yazar."""
+    fh = open(out, "w", encoding="utf-8", newline="") if isinstance(out, str) else out
+    try:
+        w = csv.writer(fh, delimiter=";")
+        w.writerow(EXPORT_COLUMNS)
+        w.writerows(iter_rows(n, seed))
+    finally:
+        if isinstance(out, str): fh.close()
+
+def generate_export(n: int, seed: int=0) -> bytes:
+    buf = io.StringIO()
+    write_export(buf, n, seed)
+    return buf.getvalue().encode("utf-8")
+
+# ---------- Ölçüm ----------
+def _measure(fn):
+    """(sonuç, saniye, tepe bellek MB)"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn()
+    secs = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, secs, peak / 1e6
+
+def _stage(report: dict, name: str, rows: int, fn, trace_memory: bool=True):
+    if trace_memory:
+        out, secs, peak = _measure(fn)
+    else:
+        t0 = time.perf_counter(); out = fn(); secs = time.perf_counter() - t0; peak = None
+    report[name] = {"seconds": round(secs, 4), "rows_per_sec": round(rows / secs, 1) if secs else None,
+                    "peak_mb": round(peak, 1) if peak is not None else None}
+    return out
+
+def bench_pipeline(n: int, seed: int=0, trace_memory: bool=True) -> dict:
+    """Uçtan uca aşamalar: okuma → türetme/filtre → skorlama → çıktı (sıralama + CSV)."""
+    data = generate_export(n, seed)
+    rep = {}
+    df = _stage(rep, "ingest", n, lambda: read_export(data), trace_memory)
+    df = _stage(rep, "derive_filter", n, lambda: filter_frame(derive_columns(df), None, "Tümü"), trace_memory)
+    results = _stage(rep, "score", n, lambda: finalize_results(score_frame(df), df), trace_memory)
+
+    def render():
+        extremes(results, 5)
+        return results[result_columns()].to_csv(index=False, sep=';', encoding='utf-8')
+    _stage(rep, "render_export", n, render, trace_memory)
+
+    def analyze():
+        an = ScoreAnalytics().add_results(results, df)
+        return an.histogram(), an.percentiles(), an.pass_rates(), [an.breakdown(d) for d in DIMS]
+    _stage(rep, "analytics", n, analyze, trace_memory)
+    rep["total_seconds"] = round(sum(v["seconds"] for v in rep.values()), 4)
+    rep["rows_per_sec"] = round(n / rep["total_seconds"], 1) if rep["total_seconds"] else None
+    # Satır başına sonuç belleği: pandas nesne kolonları vs CompactResults
+    rep["frame_bytes_per_row"] = round(results.memory_usage(deep=True).sum() / n, 1) if n else None
+    rep["compact_bytes_per_row"] = round(score_compact(df).nbytes / n, 1) if n else None
+    return rep
+
+def bench_rules(n: int, seed: int=0) -> dict:
+    """Kural fonksiyonları mikro ölçümleri (toplam süre ve çağrı/sn)."""
+    df = derive_columns(read_export(generate_export(n, seed)))
+    cells = df[STEPS_COLS[0]].tolist()
+    parsed = [parse_row_steps(c) for c in cells]
+    rows = [r for _, r in df.iterrows()]
+    cols = df.columns
+    singles = [p.actions[0] for p in parsed if len(p.actions) == 1]
+
+    cases = {
+        "parse_steps": lambda: [parse_steps(c) for c in cells],
+        "parse_steps_column": lambda: parse_steps_column(cells),
+        "choose_table": lambda: [choose_table("", p.actions, p.expected, "", data_written=p.data_written,
+                                              pre_written_csv=False) for p in parsed],
+        "expected_style_penalty": lambda: [expected_style_penalty(p.expected) for p in parsed],
+        "block_has_many_substeps": lambda: [block_has_many_substeps(t) for t in singles],
+        "score_one": lambda: [score_one(r, cols) for r in rows],
+    }
+    rep = {}
+    for name, fn in cases.items():
+        calls = len(singles) if name == "block_has_many_substeps" else n
+        # Metin kuralı önbellekleri boşaltılır: ölçüm tekrar eden metinlerin ilk taramasını içerir
+        expected_style_hits.cache_clear(); block_has_many_substeps.cache_clear()
+        t0 = time.perf_counter(); fn(); secs = time.perf_counter() - t0
+        rep[name] = {"seconds": round(secs, 4), "calls_per_sec": round(calls / secs, 1) if secs else None}
+    return rep
+
+# ---------- Gerileme kontrolü ----------
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Süresi baseline'a göre (1 + tolerance) katından fazla artan ölçümleri döner."""
+    regressions = []
+    for size, sections in report.items():
+        for section, stages in sections.items():
+            for stage, m in stages.items():
+                if not isinstance(m, dict): continue
+                old = baseline.get(size, {}).get(section, {}).get(stage)
+                if old and old.get("seconds") and m["seconds"] > old["seconds"] * (1 + tolerance):
+                    regressions.append(f"{size}/{section}/{stage}: {old['seconds']}s → {m['seconds']}s")
+    return regressions
+
+def parse_size(s: str) -> int:
+    s = s.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(s[-1:], 1)
+    return int(float(s[:-1] if mult > 1 else s) * mult)
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Skorlama hattı benchmark'ı ve sentetik export üretici.")
+    p.add_argument("--sizes", default="1k,10k", help="Virgülle ayrılmış satır sayıları (örn. 1k,10k,100k,1m)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--no-memory", action="store_true", help="tracemalloc kapalı (süreler daha gerçekçi)")
+    p.add_argument("--rules", action="store_true", help="Kural fonksiyonu mikro ölçümlerini de çalıştır")
+    p.add_argument("--json", default=None, help="Raporu JSON olarak yaz")
+    p.add_argument("--baseline", default=None, help="Karşılaştırılacak önceki JSON rapor")
+    p.add_argument("--tolerance", type=float, default=0.25, help="İzin verilen yavaşlama oranı")
+    p.add_argument("--generate", default=None, help="Yalnızca bu boyutta sentetik export üret (-o ile)")
+    p.add_argument("-o", "--output", default=None, help="--generate çıktı yolu (varsayılan stdout)")
+    return p
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.generate:
+        write_export(args.output or sys.stdout, parse_size(args.generate), args.seed)
+        return 0
+
+    report = {}
+    for size in args.sizes.split(","):
+        n = parse_size(size)
+        report[size] = {"pipeline": bench_pipeline(n, args.seed, trace_memory=not args.no_memory)}
+        if args.rules:
+            report[size]["rules"] = bench_rules(n, args.seed)
+        for section, stages in report[size].items():
+            for stage, m in stages.items():
+                if isinstance(m, dict):
+                    extra = f" • tepe {m['peak_mb']} MB" if m.get("peak_mb") is not None else ""
+                    rate = m.get("rows_per_sec") or m.get("calls_per_sec")
+                    print(f"{size:>6} {section:<8} {stage:<24} {m['seconds']:>9.4f}s • {rate}/sn{extra}")
+        print(f"{size:>6} pipeline toplam {report[size]['pipeline']['total_seconds']}s • "
+              f"{report[size]['pipeline']['rows_per_sec']} satır/sn • sonuç "
+              f"{report[size]['pipeline']['frame_bytes_per_row']} B/satır "
+              f"(kompakt {report[size]['pipeline']['compact_bytes_per_row']} B/satır)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        for r in regressions:
+            print(f"❌ gerileme: {r}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — Manual Test Steps JSON çözümü
+# - Arka uç: orjson kuruluysa orjson, değilse stdlib json (set_decoder ile seçilebilir)
+# - orjson'un reddettiği ama stdlib'in kabul ettiği hücreler (NaN, çok büyük sayı...) stdlib ile
+#   yeniden denenir: çözülen hücre kümesi ve sonuç arka uçtan bağımsızdır
+# - CSV'nin çift tırnaklı biçimi ("[{""fields"": ...}]") çözmeden önce tanınır; başarısız ilk deneme
+#   ve istisna maliyeti yok
+# - Yalnızca kuralların okuduğu alanlar çıkarılır (Action / Adım / Step, Data, Expected Result / Expected)
+# - decode_many: bir kolonun benzersiz hücrelerini toplu çözer (aynı içerik bir kez)
+
+import json
+
+from profiling import current as current_profiler
+
+try:
+    import orjson
+except ImportError:   # isteğe bağlı hızlandırıcı
+    orjson = None
+
+STEP_FIELDS = ["Action", "Data", "Expected Result", "Expected", "Attachments", "Step", "Adım"]
+
+def _orjson_loads(txt: str):
+    try:
+        return orjson.loads(txt)
+    except orjson.JSONDecodeError:
+        return json.loads(txt)   # stdlib daha toleranslı (NaN/Infinity, büyük tamsayılar); hata aynen yükselir
+
+DECODERS = {"json": json.loads}
+if orjson is not None:
+    DECODERS["orjson"] = _orjson_loads
+_decoder = "orjson" if orjson is not None else "json"
+
+def available_decoders() -> list:
+    return list(DECODERS)
+
+def current_decoder() -> str:
+    return _decoder
+
+def set_decoder(name: str):
+    """Çözücü arka ucunu seçer ('json' / 'orjson'); kurulu değilse ValueError."""
+    global _decoder
+    if name not in DECODERS:
+        raise ValueError(f"Bilinmeyen/kurulu olmayan JSON çözücü: {name} ({', '.join(DECODERS)})")
+    _decoder = name
+
+def _doubled_quotes(txt: str) -> bool:
+    """Tırnaklarla sarılı ve içinde `""` olan metin geçerli bir JSON dizgesi olamaz: doğrudan
+    çift tırnak açılımına gidilir (eski akışta ilk json.loads her zaman hata veriyordu)."""
+    return len(txt) >= 2 and txt[0] == '"' and txt[-1] == '"' and '""' in txt[1:-1]
+
+def decode_cell(cell) -> list:
+    """Steps hücresinin ham adım listesi (çözülemezse / liste değilse [])."""
+    raw = cell if isinstance(cell, str) else ""
+    txt = raw.strip()
+    if not txt:
+        return []
+    loads = DECODERS[_decoder]
+    prof = current_profiler()
+    prof.count("json:decode")
+    if _doubled_quotes(txt):
+        prof.count("json:doubled")
+        return _decode_doubled(txt, loads)
+    try:
+        data = loads(txt)
+    except Exception:
+        prof.count("json:fallback")
+        if txt.startswith('"') and txt.endswith('"'):
+            return _decode_doubled(txt, loads)
+        return []
+    return data if isinstance(data, list) else []
+
+def _decode_doubled(txt: str, loads) -> list:
+    try:
+        data = loads(txt[1:-1].replace('""', '"'))
+    except Exception:
+        return []
+    return data if isinstance(data, list) else []
+
+def decode_many(cells) -> dict:
+    """Hücre → ham adım listesi (benzersiz hücreler). Yaygın '[...]' biçimi sıkı bir döngüde doğrudan
+    çözülür (hücre başına ek kontrol / sayaç yok); diğerleri ve çözülemeyenler decode_cell'e düşer."""
+    loads = DECODERS[_decoder]
+    out = {}
+    direct = 0
+    for c in dict.fromkeys(c if isinstance(c, str) else "" for c in cells):
+        txt = c.strip()
+        if txt[:1] == "[":
+            try:
+                data = loads(txt)
+            except Exception:
+                pass
+            else:
+                out[c] = data if isinstance(data, list) else []
+                direct += 1
+                continue
+        out[c] = decode_cell(c)
+    current_profiler().count("json:decode", direct)
+    return out
+
+def _fields(step) -> dict:
+    f = step.get("fields", {}) if isinstance(step, dict) else {}
+    return f if isinstance(f, dict) else {}
+
+def normalize_steps(steps: list) -> list:
+    """Normalize biçim: adım başına {"fields": {STEP_FIELDS}} — eksik alan "", metin olmayan alan yok."""
+    norm = []
+    for s in steps:
+        fields = _fields(s)
+        norm.append({"fields": {k: v for k in STEP_FIELDS if isinstance(v := fields.get(k, ""), str)}})
+    return norm
+
+def extract_blocks(steps: list) -> tuple:
+    """(action, data, expected) blokları — normalize_steps + get_*_blocks ile aynı, ara dict kurmadan.
+    Normalize biçimde eksik alan "" olur, metin olmayan alan atılır (get(..., varsayılan) ona düşer)."""
+    actions, data, expected, alts = [], [], [], []
+    for s in steps:
+        f = s.get("fields") if isinstance(s, dict) else None
+        if not isinstance(f, dict) or not f:
+            continue
+        v = f.get("Action")
+        if isinstance(v, str) and (v := v.strip()):
+            actions.append(v)
+        v = f.get("Data")
+        if isinstance(v, str) and (v := v.strip()):
+            data.append(v)
+        # "Expected Result" yalnızca metin olmayan bir değerse normalize biçimde yoktu → "Expected"e düşülür
+        v = f.get("Expected Result", "")
+        if not isinstance(v, str):
+            v = f.get("Expected")
+        if isinstance(v, str) and (v := v.strip()):
+            expected.append(v)
+        if not actions:
+            for alt in ("Adım", "Step"):
+                v = f.get(alt)
+                if isinstance(v, str) and (v := v.strip()):
+                    alts.append(v)
+    return (actions or alts), data, expected
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — isteğe bağlı debug ayrıntıları
+# - Skorlama debug kolonsuz yapılır; sinyal/karar açıklamaları yalnızca bakılan satırlar için üretilir
+# - Kaynak: yüklenen çerçeve + önbellekteki ParsedSteps serisi (steps JSON yeniden çözülmez)
+# - Üretilen ayrıntı indeks etiketi başına saklanır; aynı satıra ikinci bakış bedava
+# - Çoklu dosya çerçevesinde her satır kendi dosyasının kolon şemasıyla açıklanır
+
+import pandas as pd
+
+from multifile import per_source
+from profiling import current as current_profiler
+from scoring import DEBUG_DETAIL_COLS, KEY_COLS, _first_truthy_text, debug_frame
+
+class LazyDebug:
+    """Bir çerçevenin satır başına debug ayrıntıları; ilk istenişte hesaplanır, sonra bellekten gelir."""
+
+    def __init__(self, df: pd.DataFrame, df_cols=None, parsed=None, source_cols=None):
+        self.df = df
+        self.cols = df.columns if df_cols is None else df_cols
+        self.parsed = parsed
+        self.source_cols = source_cols   # çoklu dosya: {kaynak: kolonlar}
+        self._memo = {}        # indeks etiketi → ayrıntı dict
+        self._by_key = None    # Key → indeks etiketi (ilk Key aramasında kurulur)
+
+    def __len__(self): return len(self._memo)
+
+    def _fill(self, labels):
+        missing = [l for l in dict.fromkeys(labels) if l not in self._memo]
+        if missing:
+            current_profiler().count("debug:rows", len(missing))
+            rows = self.df.loc[missing]
+            if self.source_cols:
+                part = per_source(rows, self.source_cols, lambda p, cols: debug_frame(p, cols, self.parsed))
+            else:
+                part = debug_frame(rows, self.cols, self.parsed.loc[missing] if self.parsed is not None else None)
+            self._memo.update(zip(missing, part.to_dict("records")))
+
+    def get(self, label) -> dict:
+        """İndeks etiketindeki satırın debug ayrıntıları."""
+        self._fill([label])
+        return self._memo[label]
+
+    def for_key(self, key: str):
+        """Key ile ayrıntılar (ilk eşleşen satır); bulunamazsa None."""
+        if self._by_key is None:
+            self._by_key = {}
+            for label, k in zip(self.df.index, _first_truthy_text(self.df, KEY_COLS)):
+                self._by_key.setdefault(k.strip(), label)
+        label = self._by_key.get(str(key).strip())
+        return None if label is None else self.get(label)
+
+    def frame(self, labels) -> pd.DataFrame:
+        """Etiketler için debug kolonları (eksikler tek seferde hesaplanır)."""
+        labels = list(labels)
+        self._fill(labels)
+        return pd.DataFrame([self._memo[l] for l in labels], index=labels, columns=DEBUG_DETAIL_COLS)
+
+    def attach(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Sonuç çerçevesine debug kolonlarını ekler (results indeksi kaynak çerçeveyle aynı olmalı)."""
+        return results.join(self.frame(results.index)[DEBUG_DETAIL_COLS])
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — sonuç dışa aktarma
+# - Biçimler: csv (`;`), csv.gz, parquet, arrow (Feather v2 / IPC dosyası)
+# - Tipli kolonlar: Kaynak / Prefix / Tablo / Automation / _type kategorik (dictionary),
+#   puanlar küçük tamsayı, Skor % float32, debug bayrakları boolean
+# - ResultWriter parça parça yazar (akış modu); tüm sonuç bellekte birikmez
+# - pyarrow yalnızca parquet/arrow için gerekir (Streamlit kurulumuyla gelir)
+
+import gzip
+
+import numpy as np
+import pandas as pd
+
+from scoring import result_columns
+
+EXPORT_FORMATS = ["csv", "csv.gz", "parquet", "arrow"]
+MIME_TYPES = {"csv": "text/csv", "csv.gz": "application/gzip",
+              "parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+
+CATEGORY_COLS = ["Kaynak", "Prefix", "Tablo", "Automation", "_type"]
+SMALL_INT_COLS = {"Toplam Puan": "int16", "_exp_hits": "int16", "_exp_penalty": "int8"}
+FLOAT_COLS = {"Skor %": "float32"}
+BOOL_COLS = ["_data_needed", "_pre_needed", "_data_strong", "_data_written", "_pre_written_csv"]
+
+def _is_text_col(c) -> bool:
+    return c not in SMALL_INT_COLS and c not in FLOAT_COLS and c not in BOOL_COLS
+
+def _as_text(s: pd.Series) -> pd.Series:
+    """Metin kolonu: boş olmayan değerler str (CSV'den okunan yalnızca sayı içeren hücreler dahil)."""
+    return s.astype(object).map(str, na_action="ignore").where(s.notna(), None)
+
+def format_from_path(path, default: str="csv") -> str:
+    """Dosya uzantısından biçim (.feather → arrow); tanınmazsa `default`."""
+    p = str(path).lower()
+    if p.endswith(".feather"):
+        return "arrow"
+    for fmt in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if p.endswith("." + fmt):
+            return fmt
+    return default
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise RuntimeError("parquet/arrow çıktısı için pyarrow gerekli: pip install pyarrow") from e
+    return pyarrow
+
+def _arrow_schema(pa, cols):
+    fields = []
+    for c in cols:
+        if c in CATEGORY_COLS: t = pa.dictionary(pa.int32(), pa.string())
+        elif c in SMALL_INT_COLS: t = pa.from_numpy_dtype(np.dtype(SMALL_INT_COLS[c]))
+        elif c in FLOAT_COLS: t = pa.from_numpy_dtype(np.dtype(FLOAT_COLS[c]))
+        elif c in BOOL_COLS: t = pa.bool_()
+        else: t = pa.string()
+        fields.append(pa.field(c, t))
+    return pa.schema(fields)
+
+class ResultWriter:
+    """finalize_results uygulanmış sonuç parçalarını seçilen biçimde tek dosyaya yazar."""
+
+    def __init__(self, path, fmt: str=None, debug: bool=False, sources: bool=False):
+        self.path = path
+        self.fmt = fmt or format_from_path(path)
+        if self.fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Bilinmeyen çıktı biçimi: {self.fmt} ({', '.join(EXPORT_FORMATS)})")
+        self.cols = result_columns(debug, sources)
+        self.rows = 0
+        self._header = True
+        self._fh = None
+        self._writer = None
+        self._categories = {c: [] for c in CATEGORY_COLS}   # parçalar arası büyüyen sözlük
+        if self.fmt in ("parquet", "arrow"):
+            self._pa = _require_pyarrow()
+            self._schema = _arrow_schema(self._pa, self.cols)
+
+    def typed(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Sonuç kolonlarını kalıcı tiplere çevirir (kategoriler önceki parçalarla uyumlu)."""
+        out = {}
+        for c in self.cols:
+            s = results[c]
+            if c in CATEGORY_COLS:
+                vals = _as_text(s)
+                known = self._categories[c]
+                seen = set(known)
+                known.extend(v for v in dict.fromkeys(vals.dropna().tolist()) if v not in seen)
+                out[c] = pd.Categorical(vals, categories=list(known))
+            elif c in SMALL_INT_COLS:
+                out[c] = s.astype(SMALL_INT_COLS[c])
+            elif c in FLOAT_COLS:
+                out[c] = s.astype(FLOAT_COLS[c])
+            elif c in BOOL_COLS:
+                out[c] = s.astype("boolean")
+            else:
+                out[c] = _as_text(s)
+        return pd.DataFrame(out, index=results.index)
+
+    def _open(self):
+        if self.fmt == "csv":
+            self._fh = open(self.path, "w", encoding="utf-8", newline="")
+        elif self.fmt == "csv.gz":
+            self._fh = gzip.open(self.path, "wt", encoding="utf-8", newline="")
+        elif self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        else:
+            import pyarrow.ipc as ipc
+            self._writer = ipc.new_file(self.path, self._schema,
+                                        options=ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    def write(self, results: pd.DataFrame):
+        if self._fh is None and self._writer is None:
+            self._open()
+        if self._fh is not None:
+            results[self.cols].to_csv(self._fh, header=self._header, index=False, sep=';')
+            self._header = False
+        elif len(results):
+            table = self._pa.Table.from_pandas(self.typed(results), schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        self.rows += len(results)
+
+    def close(self):
+        if self._fh is None and self._writer is None:
+            self.write(pd.DataFrame(columns=self.cols))   # boş sonuç: yalnızca başlık / şema
+        if self._fh is not None:
+            self._fh.close(); self._fh = None
+        if self._writer is not None:
+            self._writer.close(); self._writer = None
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+def write_results(results: pd.DataFrame, path, fmt: str=None, debug: bool=False, sources: bool=False) -> int:
+    """Tek seferde yazım; yazılan satır sayısını döner."""
+    with ResultWriter(path, fmt, debug, sources) as w:
+        w.write(results)
+    return w.rows
+
+def convert_csv(src, path, fmt: str, debug: bool=False, chunksize: int=50_000, sources: bool=False) -> int:
+    """Akış modunun `;` ayraçlı sonuç CSV'sini parça parça başka biçime çevirir.
+    Metin kolonları str okunur: parçada yalnızca sayı olan Summary / Key / Prefix tamsayıya dönmez."""
+    with ResultWriter(path, fmt, debug, sources) as w:
+        text = {c: str for c in w.cols if _is_text_col(c)}
+        with pd.read_csv(src, sep=';', chunksize=chunksize, dtype=text) as reader:
+            for chunk in reader:
+                w.write(chunk)
+    return w.rows
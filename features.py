@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — kalıcı özellik deposu (kolon bazlı Parquet)
+# - Metin hattı (steps JSON, sinyal taraması, Expected yazım / tek blok kuralları) satır başına bir kez
+#   çalışır; çıktısı özellik kolonları olarak diske yazılır (scoring.FEATURE_COLS)
+# - Skorlama özelliklerden yapılır: tablo kararı, kriter puanları ve ceza basamakları ucuz bir geçiştir —
+#   TABLE_RULES / choose_table / penalty_for_hits ayarları metinler yeniden taranmadan denenebilir
+# - Dosya metin kuralları parmak iziyle işaretlenir; desenler değişince eski dosya reddedilir
+# - Key / Summary / Prefix / Automation (çoklu dosyada Kaynak) da saklanır: skorlama için CSV gerekmez
+# - pyarrow gerekir (parquet çıktısıyla aynı)
+
+import json
+
+import pandas as pd
+
+from export import _require_pyarrow
+from multifile import SOURCE_COL, per_source
+from scoring import FEATURE_COLS, FEATURES_VERSION, feature_frame, features_fingerprint
+
+FEATURES_META_KEY = b"testcase_evaluator.features"
+DERIVED_COLS = ["_Prefix", "_Automation", SOURCE_COL]   # filtre / sonuç kolonları için kaynaktan taşınır
+
+class StaleFeatures(ValueError):
+    """Özellik dosyası farklı metin kurallarıyla üretilmiş; export'tan yeniden çıkarılmalı."""
+
+def is_features_path(path) -> bool:
+    return str(path).lower().endswith(".parquet")
+
+def extract_features(df: pd.DataFrame, df_cols=None, parsed=None, source_cols=None) -> pd.DataFrame:
+    """derive_columns uygulanmış çerçevenin özellikleri (df indeksiyle) + _Prefix / _Automation / _Source.
+    `source_cols` (çoklu dosya): her kaynak kendi kolon şemasıyla."""
+    if source_cols:
+        feats = per_source(df, source_cols, lambda part, cols: feature_frame(part, cols, parsed))
+    else:
+        feats = feature_frame(df, df_cols, parsed)
+    for c in DERIVED_COLS:
+        if c in df.columns:
+            feats[c] = df[c].to_numpy(dtype=object)
+    return feats
+
+def save_features(feats: pd.DataFrame, path) -> int:
+    """Özellikleri Parquet'e yazar (türetilmiş kolonlar sözlük kodlu); yazılan satır sayısı."""
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+    out = feats.reset_index(drop=True)
+    for c in DERIVED_COLS:
+        if c in out.columns:
+            out[c] = out[c].astype("category")
+    table = pa.Table.from_pandas(out, preserve_index=False)
+    info = {"fingerprint": features_fingerprint(), "version": FEATURES_VERSION, "rows": len(out)}
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           FEATURES_META_KEY: json.dumps(info).encode("utf-8")})
+    pq.write_table(table, path, compression="zstd")
+    return len(out)
+
+def features_info(path) -> dict:
+    """Dosyanın özellik üst verisi (parmak izi, sürüm, satır); özellik dosyası değilse ValueError."""
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+    meta = pq.read_schema(path).metadata or {}
+    if FEATURES_META_KEY not in meta:
+        raise ValueError(f"{path}: özellik dosyası değil (--features ile üretilmemiş)")
+    return json.loads(meta[FEATURES_META_KEY])
+
+def load_features(path, check: bool=True) -> pd.DataFrame:
+    """Özellik dosyasını okur; `check` ise parmak izi güncel kurallarla eşleşmeli (yoksa StaleFeatures)."""
+    info = features_info(path)
+    if check and info.get("fingerprint") != features_fingerprint():
+        raise StaleFeatures(f"{path}: özellikler farklı metin kurallarıyla üretilmiş "
+                            f"({info.get('fingerprint')} ≠ {features_fingerprint()}); export'tan yeniden çıkarın")
+    import pyarrow.parquet as pq
+    df = pq.read_table(path).to_pandas()
+    out = {"Key": df["Key"].astype(object), "Summary": df["Summary"].astype(object)}
+    out.update({c: df[c].astype(t) for c, t in FEATURE_COLS.items()})
+    out.update({c: df[c].astype(object) for c in DERIVED_COLS if c in df.columns})
+    return pd.DataFrame(out)
+
+def load_many_features(sources) -> pd.DataFrame:
+    """[(etiket, yol)] özellik dosyalarını birleştirir; birden fazla dosyada Kaynak kolonu yoksa etiket yazılır."""
+    frames = []
+    for label, path in sources:
+        f = load_features(path)
+        if len(sources) > 1 and SOURCE_COL not in f.columns:
+            f[SOURCE_COL] = label
+        frames.append(f)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
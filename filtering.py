@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — prefix / otomasyon filtre indeksi
+# - Yüklenen dosya başına bir kez kurulur: _Prefix ve _Automation kategorik kodları +
+#   her kategori için satır konumu dizileri
+# - Filtre = konum dizilerinin birleşimi/kesişimi; çerçeve kopyası yok
+# - Örnekleme konumlar üzerinde yapılır; yalnızca seçilen satırlar çerçeveden alınır
+
+import numpy as np
+import pandas as pd
+
+AUTOMATION_FILTERS = {"Sadece Otomasyon": "Otomasyon", "Sadece Manuel": "Manuel"}
+
+def _group_positions(values: pd.Series):
+    """(kategoriler, kodlar, {kategori: artan konum dizisi})"""
+    cat = pd.Categorical(values)
+    codes = cat.codes.astype(np.int32)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(cat.categories)))
+    start = int((codes < 0).sum())   # NaN kodları (-1) başta
+    rows, lo = {}, start
+    for name, hi in zip(cat.categories, bounds + start):
+        rows[name] = order[lo:hi]
+        lo = hi
+    return list(cat.categories), codes, rows
+
+class FilterIndex:
+    """derive_columns uygulanmış bir çerçevenin prefix / otomasyon konum indeksi."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.n = len(df)
+        if "_Prefix" in df.columns:
+            self._prefixes, self._prefix_codes, self._prefix_rows = _group_positions(df["_Prefix"])
+        else:
+            self._prefixes, self._prefix_codes, self._prefix_rows = None, np.zeros(self.n, dtype=np.int32), {}
+        self._auto_names, self._auto_codes, self._auto_rows = _group_positions(df["_Automation"])
+
+    @property
+    def prefix_options(self):
+        """Boş olmayan prefix'ler (sıralı); _Prefix kolonu yoksa None."""
+        if self._prefixes is None:
+            return None
+        return sorted(p for p in self._prefixes if p)
+
+    def positions(self, prefixes=None, automation: str="Tümü") -> np.ndarray:
+        """filter_frame ile aynı satırların artan konumları."""
+        pos = None
+        if prefixes and self._prefixes is not None:
+            parts = [self._prefix_rows[p] for p in prefixes if p in self._prefix_rows]
+            pos = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+        cls = AUTOMATION_FILTERS.get(automation)
+        if cls is not None:
+            rows = self._auto_rows.get(cls, np.empty(0, dtype=np.intp))
+            pos = rows if pos is None else np.intersect1d(pos, rows, assume_unique=True)
+        return np.arange(self.n) if pos is None else pos
+
+    def codes(self, dim: str) -> np.ndarray:
+        """Katmanlı örnekleme için satır başına kategori kodu ('prefix' / 'automation')."""
+        return self._prefix_codes if dim == "prefix" else self._auto_codes
+
+    def automation_counts(self, pos: np.ndarray) -> dict:
+        counts = np.bincount(self._auto_codes[pos], minlength=len(self._auto_names))
+        return {name: int(c) for name, c in zip(self._auto_names, counts)}
+
+def sample_positions(pos: np.ndarray, n: int, random_state=None) -> np.ndarray:
+    """`df.iloc[pos].sample(n, random_state=...)` ile aynı konumlar (alt çerçeve kurmadan)."""
+    rs = np.random.RandomState(random_state) if random_state is not None else np.random
+    return pos[rs.choice(len(pos), size=n, replace=False)]
+
+def take(df: pd.DataFrame, pos: np.ndarray) -> pd.DataFrame:
+    """Konumlardaki satırlar; tüm satırlar sırasıyla seçiliyse çerçevenin kendisi."""
+    if len(pos) == len(df) and bool(np.all(pos[1:] > pos[:-1])):
+        return df
+    return df.iloc[pos]
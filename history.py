@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — trend geçmişi deposu (SQLite, yalnızca ekleme)
+# - Her çalıştırma (tüm dosya / akış) bir kayıt: Key başına skor (tablo, puan, Skor %) + özet küp
+#   (analytics.ScoreAnalytics hücreleri: prefix / otomasyon / tip / tablo / puan başına adet, kriter tam puanları)
+# - Çalıştırma tek işlemde yazılır (ayrı bağlantı): yarım kalan çalıştırma geçmişte görünmez
+# - Sorgular eski CSV'leri okumaz, indekslerden yanıtlanır: düşen Key'ler, tablo geçişleri (C → D),
+#   prefix başına ortalama Skor % değişimi ve çalıştırmalar boyunca trend
+# - run_key (içerik + filtre + kural seti) ile aynı çalıştırmanın ikinci kez kaydı önlenebilir (find_run)
+#
+# Kullanım:
+#   python history.py .trend_history.sqlite runs
+#   python history.py .trend_history.sqlite trend --prefix QB284050
+#   python history.py .trend_history.sqlite deltas                 # son iki çalıştırma, prefix başına
+#   python history.py .trend_history.sqlite dropped --min-drop 10  # Skor %'si en az 10 puan düşen Key'ler
+#   python history.py .trend_history.sqlite moves --from-table C --to-table D --keys
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from threading import Lock
+
+import pandas as pd
+
+from analytics import PASS_COLS, ScoreAnalytics, _dim_values, cell_percent
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".trend_history.sqlite")
+_PASS_SQL = [f"pass_{k + 1}" for k in range(len(PASS_COLS))]
+
+SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, label TEXT, run_key TEXT,
+        rules TEXT, rows INTEGER NOT NULL, keys INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS runs_key ON runs (run_key);
+    CREATE TABLE IF NOT EXISTS key_scores (
+        run_id INTEGER NOT NULL, issue_key TEXT NOT NULL, prefix TEXT, automation TEXT, source TEXT,
+        tablo TEXT NOT NULL, points INTEGER NOT NULL, pct REAL NOT NULL,
+        PRIMARY KEY (run_id, issue_key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS key_scores_prefix ON key_scores (run_id, prefix);
+    CREATE TABLE IF NOT EXISTS run_cells (
+        run_id INTEGER NOT NULL, source TEXT, prefix TEXT, automation TEXT, tip TEXT, tablo TEXT,
+        points INTEGER NOT NULL, pct REAL NOT NULL, n INTEGER NOT NULL,
+        {", ".join(f"{c} INTEGER NOT NULL" for c in _PASS_SQL)}
+    );
+    CREATE INDEX IF NOT EXISTS run_cells_run ON run_cells (run_id, prefix);
+"""
+
+def run_key(content_hash: str, prefixes=None, automation: str="Tümü", rules: str="") -> str:
+    """Çalıştırma anahtarı: aynı içerik + filtre + kural seti aynı anahtarı verir."""
+    parts = [content_hash, ",".join(sorted(prefixes or [])), automation, rules]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")   # okuyucular yazılan çalıştırmayı beklemez
+    conn.executescript(SCHEMA)
+    return conn
+
+class HistoryRun:
+    """Yazılmakta olan çalıştırma: add() parçaları ekler, commit() tek işlemde kalıcı yapar.
+    Key başına ilk görülen satır saklanır (özet küp tüm satırları sayar)."""
+
+    def __init__(self, path: str, label: str="", run_key: str=None, rules: str=None, created_at: str=None):
+        self._conn = _connect(path)
+        self.analytics = ScoreAnalytics()
+        self.rows = 0
+        self._closed = False
+        self._conn.execute("BEGIN")
+        cur = self._conn.execute(
+            "INSERT INTO runs (created_at, label, run_key, rules, rows, keys) VALUES (?, ?, ?, ?, 0, 0)",
+            (created_at or datetime.now().isoformat(timespec="seconds"), label, run_key, rules))
+        self.run_id = cur.lastrowid
+
+    def add(self, results: pd.DataFrame, source: pd.DataFrame):
+        """finalize_results uygulanmış sonuç parçası; `source` boyutların (_Prefix / _Automation / _Source)
+        okunduğu kaynak çerçeve."""
+        if len(results) == 0:
+            return
+        dims = _dim_values(source, results.index)
+        rows = [(self.run_id, k, p, a, s, t, int(pts), float(pct))
+                for k, p, a, s, t, pts, pct in zip(results["Key"].tolist(), dims["Prefix"], dims["Automation"],
+                                                   dims["Kaynak"], results["Tablo"].tolist(),
+                                                   results["Toplam Puan"].tolist(), results["Skor %"].tolist())
+                if k]
+        self._conn.executemany("INSERT OR IGNORE INTO key_scores VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.analytics.add_results(results, source)
+        self.rows += len(results)
+
+    def commit(self) -> int:
+        """Özet küpü yazar ve çalıştırmayı kalıcı yapar; çalıştırma kimliğini döner."""
+        cube = self.analytics.cube
+        pct = cell_percent(cube)
+        cells = zip(*(cube[c].tolist() for c in ["Kaynak", "Prefix", "Automation", "Tip", "Tablo", "Toplam Puan"]),
+                    pct.tolist(), cube["Adet"].tolist(), *(cube[c].tolist() for c in PASS_COLS))
+        self._conn.executemany(f"INSERT INTO run_cells VALUES ({', '.join('?' * (9 + len(PASS_COLS)))})",
+                               [(self.run_id, *c) for c in cells])
+        keys = self._conn.execute("SELECT COUNT(*) FROM key_scores WHERE run_id=?", (self.run_id,)).fetchone()[0]
+        self._conn.execute("UPDATE runs SET rows=?, keys=? WHERE run_id=?", (self.rows, keys, self.run_id))
+        self._conn.commit()
+        self._close()
+        return self.run_id
+
+    def abort(self):
+        if not self._closed:
+            self._conn.rollback()
+            self._close()
+
+    def _close(self):
+        self._closed = True
+        self._conn.close()
+
+    def __enter__(self): return self
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self.abort()
+        elif not self._closed:
+            self.commit()
+
+class HistoryStore:
+    """Çalıştırma geçmişi ve delta sorguları; çalıştırma kimliği verilmezse son iki çalıştırma karşılaştırılır."""
+
+    def __init__(self, path: str=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self._lock = Lock()
+        self._conn = _connect(path)
+
+    def _frame(self, sql: str, params=()) -> pd.DataFrame:
+        with self._lock:
+            cur = self._conn.execute(sql, params)
+            return pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+
+    def begin(self, label: str="", run_key: str=None, rules: str=None, created_at: str=None) -> HistoryRun:
+        return HistoryRun(self.path, label, run_key, rules, created_at)
+
+    def record(self, results: pd.DataFrame, source: pd.DataFrame, label: str="", run_key: str=None,
+               rules: str=None, created_at: str=None) -> int:
+        """Bellekteki sonuçları tek çalıştırma olarak ekler."""
+        run = self.begin(label, run_key, rules, created_at)
+        try:
+            run.add(results, source)
+        except BaseException:
+            run.abort()
+            raise
+        return run.commit()
+
+    def find_run(self, run_key: str):
+        """Aynı run_key ile kaydedilmiş son çalıştırma (yoksa None)."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(run_id) FROM runs WHERE run_key=?", (run_key,)).fetchone()
+        return row[0]
+
+    def runs(self) -> pd.DataFrame:
+        return self._frame("SELECT run_id, created_at, label, rows, keys FROM runs ORDER BY run_id")
+
+    def pair(self, before=None, after=None) -> tuple:
+        """(önceki, sonraki) çalıştırma kimlikleri; verilmeyenler için son iki çalıştırma. Yetersizse ValueError."""
+        ids = self.runs()["run_id"].tolist()
+        after = ids[-1] if after is None and ids else after
+        if before is None:
+            older = [i for i in ids if after is not None and i < after]
+            before = older[-1] if older else None
+        if before is None or after is None:
+            raise ValueError("Karşılaştırma için en az iki çalıştırma gerekli")
+        return int(before), int(after)
+
+    def prefix_trend(self, prefixes=None) -> pd.DataFrame:
+        """Çalıştırma × prefix: adet, ortalama puan, ortalama Skor % ve A/B/C/D (özet küpten)."""
+        where, params = "", ()
+        if prefixes:
+            where = f"WHERE c.prefix IN ({','.join('?' * len(prefixes))})"
+            params = tuple(prefixes)
+        return self._frame(f"""
+            SELECT r.run_id, r.created_at, c.prefix AS Prefix, SUM(c.n) AS Adet,
+                   ROUND(1.0 * SUM(c.points * c.n) / SUM(c.n), 1) AS Ortalama,
+                   ROUND(SUM(c.pct * c.n) / SUM(c.n), 1) AS "Skor %",
+                   {", ".join(f"SUM(CASE WHEN c.tablo='{t}' THEN c.n ELSE 0 END) AS {t}" for t in "ABCD")}
+            FROM run_cells c JOIN runs r ON r.run_id = c.run_id {where}
+            GROUP BY r.run_id, c.prefix ORDER BY r.run_id, c.prefix""", params)
+
+    def prefix_deltas(self, before=None, after=None) -> pd.DataFrame:
+        """Prefix başına iki çalıştırma arasında adet, ortalama Skor % ve değişimi (Δ)."""
+        before, after = self.pair(before, after)
+        per_run = self._frame("""
+            SELECT run_id, prefix AS Prefix, SUM(n) AS Adet, ROUND(SUM(pct * n) / SUM(n), 1) AS pct
+            FROM run_cells WHERE run_id IN (?, ?) GROUP BY run_id, prefix""", (before, after))
+        a = per_run[per_run["run_id"] == before].set_index("Prefix")
+        b = per_run[per_run["run_id"] == after].set_index("Prefix")
+        out = pd.DataFrame({"Adet (önce)": a["Adet"], "Adet (sonra)": b["Adet"],
+                            "Skor % (önce)": a["pct"], "Skor % (sonra)": b["pct"]})
+        out["Δ Skor %"] = (out["Skor % (sonra)"] - out["Skor % (önce)"]).round(1)
+        return out.sort_values("Δ Skor %", na_position="last").rename_axis("Prefix").reset_index()
+
+    def dropped_keys(self, before=None, after=None, min_drop: float=0.0, limit: int=None) -> pd.DataFrame:
+        """Skor %'si en az `min_drop` puandan fazla düşen Key'ler (en çok düşen önce)."""
+        before, after = self.pair(before, after)
+        sql = """
+            SELECT b.issue_key AS Key, b.prefix AS Prefix, a.tablo AS "Tablo (önce)", b.tablo AS "Tablo (sonra)",
+                   a.points AS "Puan (önce)", b.points AS "Puan (sonra)",
+                   a.pct AS "Skor % (önce)", b.pct AS "Skor % (sonra)", ROUND(b.pct - a.pct, 1) AS "Δ Skor %"
+            FROM key_scores b JOIN key_scores a ON a.run_id = ? AND a.issue_key = b.issue_key
+            WHERE b.run_id = ? AND a.pct - b.pct > ?
+            ORDER BY b.pct - a.pct, b.issue_key"""
+        params = (before, after, float(min_drop))
+        if limit:
+            sql += " LIMIT ?"
+            params += (int(limit),)
+        return self._frame(sql, params)
+
+    def table_moves(self, before=None, after=None, from_table: str=None, to_table: str=None,
+                    keys: bool=False) -> pd.DataFrame:
+        """Tablosu değişen Key'ler: prefix × (önce → sonra) adetleri; `keys` ise Key listesi."""
+        before, after = self.pair(before, after)
+        cond, params = ["b.run_id = ?", "a.tablo <> b.tablo"], [before, after]
+        if from_table:
+            cond.append("a.tablo = ?"); params.append(from_table)
+        if to_table:
+            cond.append("b.tablo = ?"); params.append(to_table)
+        join = "FROM key_scores b JOIN key_scores a ON a.run_id = ? AND a.issue_key = b.issue_key"
+        if keys:
+            return self._frame(f"""
+                SELECT b.issue_key AS Key, b.prefix AS Prefix, a.tablo AS "Önce", b.tablo AS "Sonra",
+                       a.points AS "Puan (önce)", b.points AS "Puan (sonra)"
+                {join} WHERE {" AND ".join(cond)} ORDER BY b.prefix, b.issue_key""", tuple(params))
+        return self._frame(f"""
+            SELECT b.prefix AS Prefix, a.tablo AS "Önce", b.tablo AS "Sonra", COUNT(*) AS Adet
+            {join} WHERE {" AND ".join(cond)}
+            GROUP BY b.prefix, a.tablo, b.tablo ORDER BY Adet DESC, b.prefix""", tuple(params))
+
+    def key_changes(self, before=None, after=None) -> dict:
+        """Eklenen / kaybolan / ortak Key sayıları."""
+        before, after = self.pair(before, after)
+        with self._lock:
+            common = self._conn.execute("""
+                SELECT COUNT(*) FROM key_scores b JOIN key_scores a ON a.run_id = ? AND a.issue_key = b.issue_key
+                WHERE b.run_id = ?""", (before, after)).fetchone()[0]
+            n = dict(self._conn.execute("SELECT run_id, keys FROM runs WHERE run_id IN (?, ?)", (before, after)))
+        return {"ortak": common, "yeni": n[after] - common, "kaybolan": n[before] - common}
+
+    def close(self):
+        self._conn.close()
+
+# ---------- Komut satırı ----------
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Trend geçmişi sorguları (batch.py --history ile kaydedilen çalıştırmalar).")
+    p.add_argument("path", help="Geçmiş deposu (SQLite)")
+    p.add_argument("query", choices=["runs", "trend", "deltas", "dropped", "moves"])
+    p.add_argument("--before", type=int, default=None, help="Önceki çalıştırma (varsayılan: sondan bir önceki)")
+    p.add_argument("--after", type=int, default=None, help="Sonraki çalıştırma (varsayılan: son)")
+    p.add_argument("--prefix", action="append", default=[], help="trend: prefix filtresi")
+    p.add_argument("--min-drop", type=float, default=0.0, help="dropped: en az bu kadar Skor % düşüşü")
+    p.add_argument("--limit", type=int, default=None, help="dropped: en fazla satır")
+    p.add_argument("--from-table", choices=list("ABCD"), default=None)
+    p.add_argument("--to-table", choices=list("ABCD"), default=None)
+    p.add_argument("--keys", action="store_true", help="moves: Key listesi")
+    return p
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if not os.path.exists(args.path):
+        print(f"❌ Geçmiş deposu yok: {args.path}", file=sys.stderr)
+        return 2
+    hist = HistoryStore(args.path)
+    try:
+        if args.query == "runs":
+            out = hist.runs()
+        elif args.query == "trend":
+            out = hist.prefix_trend(args.prefix)
+        elif args.query == "deltas":
+            out = hist.prefix_deltas(args.before, args.after)
+        elif args.query == "dropped":
+            out = hist.dropped_keys(args.before, args.after, args.min_drop, args.limit)
+        else:
+            out = hist.table_moves(args.before, args.after, args.from_table, args.to_table, args.keys)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        hist.close()
+    print(out.to_csv(index=False, sep=";"), end="")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
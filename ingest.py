@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — CSV okuma katmanı
+# - Ayraç baştan koklanır (exception'a dayalı yeniden okuma yok)
+# - Her farklı yükleme içerik hash'i başına BİR kez okunur; _KeyRaw / _Prefix /
+#   _Automation kolonları önbellekteki çerçeveye dahildir
+# - Önbellek giriş sayısı ve toplam bellek ile sınırlıdır (LRU tahliye)
+
+import hashlib
+import io
+from collections import OrderedDict
+from threading import Lock
+
+import pandas as pd
+
+from profiling import current as current_profiler
+from scoring import derive_columns
+
+DELIMITERS = [";", ",", "\t", "|"]
+SNIFF_BYTES = 64 * 1024
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def sniff_delimiter(head: bytes) -> str:
+    """Başlık satırında (tırnak dışı) en sık geçen ayracı döner; belirsizse `;`."""
+    text = head[:SNIFF_BYTES].decode("utf-8", errors="ignore").lstrip("\ufeff")
+    line = text.split("\n", 1)[0]
+    counts = {}
+    in_quotes = False
+    for ch in line:
+        if ch == '"': in_quotes = not in_quotes
+        elif not in_quotes and ch in DELIMITERS:
+            counts[ch] = counts.get(ch, 0) + 1
+    if not counts:
+        return ";"
+    best = max(DELIMITERS, key=lambda d: counts.get(d, 0))
+    return best if counts.get(best, 0) > counts.get(";", 0) else ";"
+
+def sniff_source(src) -> str:
+    """Dosya yolu veya dosya benzeri nesnenin başını okuyup ayracı koklar (konum korunur)."""
+    if hasattr(src, "read"):
+        pos = src.tell()
+        head = src.read(SNIFF_BYTES)
+        src.seek(pos)
+    else:
+        with open(src, "rb") as fh:
+            head = fh.read(SNIFF_BYTES)
+    return sniff_delimiter(head if isinstance(head, bytes) else head.encode("utf-8"))
+
+def read_export(src, sep: str=None) -> pd.DataFrame:
+    """Dosya yolu, bytes veya dosya benzeri nesneden export okur (ayraç verilmezse koklanır)."""
+    with current_profiler().stage("csv_read"):
+        if isinstance(src, (bytes, bytearray)):
+            return pd.read_csv(io.BytesIO(src), sep=sep or sniff_delimiter(bytes(src[:SNIFF_BYTES])))
+        return pd.read_csv(src, sep=sep or sniff_source(src))
+
+def load_export(src, sep: str=None) -> pd.DataFrame:
+    """read_export + türetilmiş kolonlar."""
+    return derive_columns(read_export(src, sep))
+
+# ---------- Hash anahtarlı, bellek sınırlı çerçeve önbelleği ----------
+class FrameCache:
+    """İçerik hash'i → DataFrame LRU önbelleği; giriş sayısı ve toplam bayt ile sınırlı."""
+
+    def __init__(self, max_entries: int=4, max_bytes: int=1 << 30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()   # hash -> (df, nbytes)
+        self._bytes = 0
+        self._lock = Lock()
+
+    def __len__(self): return len(self._items)
+
+    @property
+    def nbytes(self) -> int: return self._bytes
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None: return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, df: pd.DataFrame) -> pd.DataFrame:
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+            self._items[key] = (df, nbytes)
+            self._bytes += nbytes
+            # En eski girişleri tahliye et (en yeni giriş her zaman kalır)
+            while len(self._items) > 1 and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, freed) = self._items.popitem(last=False)
+                self._bytes -= freed
+        return df
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+FRAME_CACHE = FrameCache()
+
+def load_cached(data: bytes, cache: FrameCache=FRAME_CACHE):
+    """(hash, df) döner; aynı içerik tekrar yüklenirse okunmaz. Dönen df paylaşılır — yerinde değiştirmeyin."""
+    key = content_hash(data)
+    df = cache.get(key)
+    if df is None:
+        df = cache.put(key, load_export(data))
+    return key, df
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — arka plan işleri (okuma / skorlama)
+# - İş ayrı bir iş parçacığında koşar; script (Streamlit rerun'ı) yalnızca ilerlemeyi okur
+# - İlerleme: aşama, işlenen / toplam (bayt veya satır), satır sayısı, ETA
+# - İptal: iş bir sonraki ilerleme bildiriminde JobCancelled ile durur
+# - Kısmi sonuçlar iş nesnesinde kalır; devam ettirilen skorlama işi baştan başlamaz
+# - Streamlit'e bağımlı değildir (UI işi session_state'te tutar ve izler)
+
+import contextvars
+import io
+import itertools
+import threading
+import time
+
+from analytics import ScoreAnalytics, analyze_frame
+from ingest import FRAME_CACHE, content_hash, load_export
+from multifile import IO_WORKERS, load_many, sources_hash
+from scoring import merge_results, rules_fingerprint
+from streaming import stream_score
+
+JOB_PART_ROWS = 2_000
+_IDS = itertools.count(1)
+
+class JobCancelled(Exception):
+    """İş iptal edildi (veya başka bir iş lehine duraklatıldı)."""
+
+class Job:
+    """fn(job, *args, **kwargs)'ı arka planda çalıştırır; fn ilerlemeyi job.report(...) ile bildirir."""
+
+    def __init__(self, fn, *args, **kwargs):
+        self.id = next(_IDS)
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.partial = []        # iş fonksiyonunun biriktirdiği kısmi sonuçlar (devamda kullanılır)
+        self.result = None
+        self.error = None
+        self.stage = ""
+        self.done = 0
+        self.total = None
+        self.rows = None
+        self.paused = False      # True: başka iş lehine durduruldu (tekrar bağlanınca kendiliğinden devam)
+        self._cancel = threading.Event()
+        self._thread = None
+        self._started = None
+        self._stage_started = None
+        self._stage_done0 = 0
+
+    def start(self) -> "Job":
+        self._cancel.clear()
+        self.paused = False
+        self.error = None
+        self._started = time.perf_counter()
+        ctx = contextvars.copy_context()   # aktif profiler iş parçacığında da görünür
+        self._thread = threading.Thread(target=ctx.run, args=(self._run,), name=f"job-{self.id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.fn(self, *self.args, **self.kwargs)
+        except JobCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+
+    def report(self, stage: str, done: int, total: int=None, rows: int=None):
+        """İlerleme bildirimi; iptal istendiyse JobCancelled fırlatır."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        if stage != self.stage:
+            self.stage = stage
+            self._stage_started = time.perf_counter()
+            self._stage_done0 = done
+        self.done, self.total = done, total
+        if rows is not None:
+            self.rows = rows
+
+    def cancel(self):
+        self._cancel.set()
+
+    def pause(self):
+        self.paused = True
+        self._cancel.set()
+
+    def resume(self) -> "Job":
+        """Durdurulmuş işi yeniden başlatır (fn kısmi sonuçlardan devam edebilir)."""
+        if self.running:
+            return self
+        return self.start()
+
+    def wait(self, timeout: float=None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def finished(self) -> bool:
+        return self._thread is not None and not self._thread.is_alive()
+
+    @property
+    def stopped(self) -> bool:
+        """İptal/duraklatma ile bitti (sonuç yok)."""
+        return self.finished and self._cancel.is_set() and self.result is None and self.error is None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started if self._started is not None else 0.0
+
+    @property
+    def fraction(self) -> float:
+        if self.finished and not self.stopped:
+            return 1.0
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+    @property
+    def eta(self):
+        """Mevcut aşamanın kalan süre tahmini (sn); hız bilinmiyorsa None."""
+        if not self.total or self._stage_started is None:
+            return None
+        secs = time.perf_counter() - self._stage_started
+        progressed = self.done - self._stage_done0
+        if secs <= 0 or progressed <= 0:
+            return None
+        return (self.total - self.done) * secs / progressed
+
+    def describe(self, title: str="") -> str:
+        """Durum etiketi: 'başlık — aşama • satır • % • ETA'."""
+        parts = [p for p in (title, self.stage) if p]
+        if self.rows is not None:
+            parts.append(f"{self.rows:,} satır".replace(",", "."))
+        if self.total:
+            parts.append(f"%{self.fraction * 100:.0f}")
+        eta = self.eta
+        if eta is not None and not self.finished:
+            parts.append(f"kalan ~{eta:.0f} sn")
+        return " • ".join(parts)
+
+class _TrackedBytes(io.BytesIO):
+    """Okunan bayt konumunu bildiren BytesIO (pd.read_csv ilerlemesi ve iptali için)."""
+
+    def __init__(self, data: bytes, on_read):
+        super().__init__(data)
+        self._on_read = on_read
+
+    def read(self, size=-1):
+        out = super().read(size)
+        self._on_read(self.tell())
+        return out
+
+    def read1(self, size=-1):
+        out = super().read1(size)
+        self._on_read(self.tell())
+        return out
+
+    def readinto(self, b):
+        n = super().readinto(b)
+        self._on_read(self.tell())
+        return n
+
+# ---------- İş fonksiyonları ----------
+def ingest_job(job: Job, data: bytes):
+    """(hash, df) — ingest.load_cached ile aynı; okuma ilerlemesi bayt olarak bildirilir."""
+    key = content_hash(data)
+    df = FRAME_CACHE.get(key)
+    if df is None:
+        total = len(data)
+        job.report("CSV okunuyor", 0, total)
+        df = load_export(_TrackedBytes(data, lambda pos: job.report("CSV okunuyor", pos, total)))
+        df = FRAME_CACHE.put(key, df)
+    return key, df
+
+def ingest_many_job(job: Job, files, io_workers: int=IO_WORKERS):
+    """(hash, birleşik df, {kaynak: kolonlar}) — [(etiket, bytes)] dosyaları eşzamanlı okunur;
+    ilerleme tüm dosyalarda okunan toplam bayt."""
+    total = sum(len(data) for _, data in files)
+    read = {label: 0 for label, _ in files}
+    def tracked(label, data):
+        def on_read(pos):
+            read[label] = pos
+            job.report("CSV okunuyor", sum(read.values()), total)
+        return _TrackedBytes(data, on_read)
+    job.report("CSV okunuyor", 0, total, rows=0)
+    loaded = []
+    def on_loaded(label, df):
+        loaded.append(len(df))
+        job.report("CSV okunuyor", sum(read.values()), total, rows=sum(loaded))
+    df, source_cols = load_many([(label, tracked(label, data)) for label, data in files], io_workers, on_loaded)
+    return sources_hash(files), df, source_cols
+
+def score_job(job: Job, sample, df_cols, scorer, store=None, part_rows: int=JOB_PART_ROWS):
+    """(sonuçlar, depodan gelen satır) — örneklem parça parça skorlanır, biten parçalar job.partial'da kalır.
+    Sonuç tek seferde skorlanmış çerçeveyle aynıdır (merge_results)."""
+    n = len(sample)
+    done = sum(len(res) for res, _ in job.partial)
+    job.report("skorlanıyor", done, n, rows=done)
+    while done < n:
+        part = sample.iloc[done:done + part_rows]
+        if store is not None:
+            res, reused = store.score(part, df_cols, debug=False, scorer=scorer)
+        else:
+            res, reused = scorer(part, df_cols, debug=False), 0
+        job.partial.append((res, reused))
+        done += len(part)
+        job.report("skorlanıyor", done, n, rows=done)
+    return merge_results([res for res, _ in job.partial]), sum(r for _, r in job.partial)
+
+def analytics_job(job: Job, df, source_cols=None, parsed=None, pool=None, part_rows: int=JOB_PART_ROWS):
+    """Çerçevenin tüm satırları için ScoreAnalytics — parça başına küp job.partial'da kalır (devam baştan
+    başlamaz); sonuç parçaların birleşimidir. Skorlama sıkıştırılmış yapılır (açıklama metni üretilmez)."""
+    n = len(df)
+    done = sum(rows for rows, _ in job.partial)
+    job.report("analiz", done, n, rows=done)
+    while done < n:
+        part = df.iloc[done:done + part_rows]
+        job.partial.append((len(part), analyze_frame(part, parsed=parsed, source_cols=source_cols, pool=pool)))
+        done += len(part)
+        job.report("analiz", done, n, rows=done)
+    return ScoreAnalytics.merged(a for _, a in job.partial)
+
+def stream_job(job: Job, data, out_path, history=None, history_label: str="", run_key: str=None, **kwargs):
+    """stream_score'u bellekteki export(lar) üzerinde çalıştırır; ilerleme okunan bayt + skorlanan satır.
+    `data`: bytes ya da çoklu dosya için [(etiket, bytes)].
+    `history` (HistoryStore): skorlanan satırlar tek çalıştırma olarak eklenir; iptal / hata olursa hiçbiri
+    (job.history_run: kaydedilen çalıştırma kimliği)."""
+    run = history.begin(history_label, run_key, rules_fingerprint()) if history is not None else None
+    try:
+        stats = _stream(job, data, out_path, history=run, **kwargs)
+    except BaseException:
+        if run is not None: run.abort()
+        raise
+    if run is not None:
+        if stats.count:
+            job.history_run = run.commit()
+        else:
+            run.abort()
+    return stats
+
+def _stream(job: Job, data, out_path, **kwargs):
+    files = data if isinstance(data, list) else [(None, data)]
+    total = sum(len(d) for _, d in files)
+    srcs, offsets, off = [], [], 0
+    for _, d in files:
+        offsets.append(off)
+        off += len(d)
+    for (label, d), base in zip(files, offsets):
+        srcs.append((label, _TrackedBytes(d, lambda pos, base=base: job.report("skorlanıyor", base + pos, total))))
+    def read_bytes():
+        return sum(s.tell() for _, s in srcs)   # önceki dosyalar sonuna kadar okunmuştur: toplam = base + pos
+    src = srcs if isinstance(data, list) else srcs[0][1]
+    return stream_score(src, out_path, progress=lambda stats: job.report("skorlanıyor", read_bytes(), total,
+                                                                         rows=stats.count),
+                        **kwargs)
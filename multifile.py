@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — çoklu dosya / klasör / glob değerlendirme
+# - Girdi: dosya yolları, klasörler (içindeki *.csv) veya glob desenleri; sıralı, tekrarsız
+# - Dosyalar sınırlı bir iş parçacığı havuzunda eşzamanlı okunur (okuma + türetilmiş kolonlar)
+# - Birleşik çerçevede `_Source` kolonu; her dosyanın satırları KENDİ kolon şemasıyla skorlanır
+#   (Key / steps kolon adları dosyadan dosyaya değişebilir)
+# - Sonuçlarda Prefix'in yanında `Kaynak` boyutu; kaynak bazında özet
+
+import contextvars
+import glob
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ingest import content_hash, load_export
+from scoring import MAX_BY_TABLE, input_columns, merge_results, score_frame
+
+SOURCE_COL = "_Source"
+IO_WORKERS = 4
+
+def expand_inputs(items) -> list:
+    """Dosya / klasör / glob girdilerini dosya yollarına açar (girdi sırasıyla, her grup kendi içinde sıralı)."""
+    paths = []
+    for item in items:
+        item = str(item)
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, "*.csv"))))
+        elif glob.has_magic(item):
+            paths.extend(sorted(p for p in glob.glob(item, recursive=True) if os.path.isfile(p)))
+        else:
+            paths.append(item)
+    return list(dict.fromkeys(paths))
+
+def source_labels(paths) -> list:
+    """Kaynak etiketleri: dosya adı; aynı ad birden fazla kez geçiyorsa verilen yol."""
+    names = [os.path.basename(str(p)) for p in paths]
+    dup = {n for n in names if names.count(n) > 1}
+    return [str(p) if n in dup else n for p, n in zip(paths, names)]
+
+def sources_hash(files) -> str:
+    """[(etiket, bytes)] yüklemesinin içerik anahtarı (etiketler ve sıra dahil)."""
+    h = hashlib.sha256()
+    for label, data in files:
+        h.update(f"{label}\x1f{content_hash(data)}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+def read_sources(sources, io_workers: int=IO_WORKERS, on_loaded=None) -> list:
+    """[(etiket, kaynak)] → [(etiket, df)] aynı sırada. Kaynak: yol, bytes veya dosya benzeri.
+    `on_loaded(etiket, df)` her dosya bitince çağrılır (fırlattığı hata kalan okumaları iptal eder)."""
+    sources = list(sources)
+    ex = ThreadPoolExecutor(max(1, min(io_workers, len(sources))), thread_name_prefix="ingest")
+    try:
+        futures = [ex.submit(contextvars.copy_context().run, load_export, src) for _, src in sources]
+        frames = []
+        for (label, _), fut in zip(sources, futures):
+            frames.append((label, fut.result()))
+            if on_loaded: on_loaded(label, frames[-1][1])
+    except BaseException:
+        ex.shutdown(wait=False, cancel_futures=True)
+        raise
+    ex.shutdown()
+    return frames
+
+def combine(frames) -> tuple:
+    """[(etiket, df)] → (birleşik df, {etiket: kolonlar}). İndeks 0..N-1.
+    Skorlama girdisi kolonları nesne tipine çevrilir: başka dosyada olmayan sayısal bir kolon
+    birleştirmede float'a dönüp metni değişmesin ('3' → '3.0')."""
+    source_cols = {label: list(df.columns) for label, df in frames}
+    parts = []
+    for label, df in frames:
+        obj = {c: object for c in input_columns(df.columns)}
+        parts.append((df.astype(obj) if obj else df).assign(**{SOURCE_COL: label}))
+    combined = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[SOURCE_COL])
+    return combined, source_cols
+
+def load_many(sources, io_workers: int=IO_WORKERS, on_loaded=None) -> tuple:
+    return combine(read_sources(sources, io_workers, on_loaded))
+
+def split_sources(df: pd.DataFrame, source_cols: dict):
+    """(kaynağın satırları — yalnızca kendi kolonlarıyla, kolonlar) çiftleri; boş kaynaklar atlanır."""
+    labels = df[SOURCE_COL].to_numpy()
+    for label, cols in source_cols.items():
+        mask = labels == label
+        if mask.any():
+            yield df.loc[mask, cols], cols
+
+def per_source(df: pd.DataFrame, source_cols: dict, fn):
+    """fn(parça, kolonlar) her kaynağa kendi şemasıyla uygulanır; Series/DataFrame çıktıları df satır sırasıyla birleşir.
+    source_cols boşsa (tek dosya) fn(df, df.columns)."""
+    if not source_cols:
+        return fn(df, df.columns)
+    outs = [fn(part, cols) for part, cols in split_sources(df, source_cols)]
+    if not outs:
+        return fn(df, df.columns)
+    return (pd.concat(outs) if len(outs) > 1 else outs[0]).loc[df.index]
+
+def score_sources(df: pd.DataFrame, source_cols: dict, scorer=score_frame, debug: bool=False, pool=None):
+    """Çok kaynaklı çerçeveyi kaynak başına skorlar; kolon sırası tek seferde skorlanmış gibi.
+    `pool` (ScoringPool) verilirse tüm kaynakların bölümleri havuza birlikte gönderilir."""
+    if len(df) == 0 or not source_cols:
+        return pool.score(df, df.columns, debug) if pool is not None else scorer(df, df.columns, debug=debug)
+    groups = list(split_sources(df, source_cols))
+    parts = pool.score_groups(groups, debug) if pool is not None else [scorer(p, c, debug=debug) for p, c in groups]
+    return merge_results(parts, debug).loc[df.index]
+
+def source_summary(results: pd.DataFrame) -> pd.DataFrame:
+    """finalize_results uygulanmış sonuçlardan Kaynak başına adet, ortalama/min/max puan, ort. Skor % ve A/B/C/D."""
+    if "Kaynak" not in results.columns or len(results) == 0:
+        return pd.DataFrame(columns=["Kaynak", "Adet", "Ortalama", "Min", "Max", "Skor %", *MAX_BY_TABLE])
+    g = results.groupby("Kaynak", sort=False)
+    out = pd.DataFrame({
+        "Adet": g.size(),
+        "Ortalama": g["Toplam Puan"].mean().round(1),
+        "Min": g["Toplam Puan"].min().astype(np.int64),
+        "Max": g["Toplam Puan"].max().astype(np.int64),
+        "Skor %": g["Skor %"].mean().round(1),
+    })
+    dist = pd.crosstab(results["Kaynak"], results["Tablo"]).reindex(columns=list(MAX_BY_TABLE), fill_value=0)
+    return out.join(dist).fillna(0).rename_axis("Kaynak").reset_index()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — çok çekirdekli skorlama
+# - Çerçeve satır bölümlerine ayrılır, bölümler süreç havuzunda score_frame ile skorlanır
+# - Sonuçlar özgün sırayla birleştirilir; seri skorlama ile birebir aynıdır
+# - İşçiler yalnızca scoring.py'yi yükler (Streamlit import edilmez)
+# - analyze_groups: bölümler işçide skorlanıp özetlenir, sürece yalnızca küçük analiz küpleri döner
+
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from analytics import SOURCE_DIM_COLS, ScoreAnalytics
+from scoring import input_columns, merge_results, score_compact, score_frame
+
+DEFAULT_PARTITION_ROWS = 5_000
+
+def resolve_workers(workers) -> int:
+    """0 / None → işlemci sayısı."""
+    return max(1, int(workers or 0) or os.cpu_count() or 1)
+
+def _score_partition(args):
+    part, cols, debug = args
+    return score_frame(part, cols, debug=debug)
+
+def _analyze_partition(args):
+    part, cols = args
+    return ScoreAnalytics().add_compact(score_compact(part, cols), part).cube
+
+def _partitions(df: pd.DataFrame, rows: int):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+class ScoringPool:
+    """Tekrar kullanılabilir skorlama havuzu (akış modunda her parça için yeniden kurulmaz)."""
+
+    def __init__(self, workers=None, partition_rows: int=DEFAULT_PARTITION_ROWS, start_method: str="spawn"):
+        self.workers = resolve_workers(workers)
+        self.partition_rows = max(1, partition_rows)
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=mp.get_context(start_method))
+
+    def score(self, df: pd.DataFrame, df_cols=None, debug: bool=False) -> pd.DataFrame:
+        cols = input_columns(df.columns if df_cols is None else df_cols)
+        slim = df[[c for c in cols if c in df.columns]]
+        # Az satırda bölümleri işçi sayısına yay; çok satırda partition_rows'u aşma
+        rows = min(self.partition_rows, max(1, -(-len(slim) // self.workers)))
+        jobs = ((part, cols, debug) for part in _partitions(slim, rows))
+        return merge_results(list(self._executor.map(_score_partition, jobs)), debug)
+
+    def score_groups(self, groups, debug: bool=False) -> list:
+        """[(df, kolonlar)] → grup başına sonuç; tüm grupların bölümleri havuza birlikte verilir
+        (çok sayıda küçük dosyada da tüm işçiler dolu kalır)."""
+        total = sum(len(df) for df, _ in groups)
+        rows = min(self.partition_rows, max(1, -(-total // self.workers)))
+        jobs, owners = [], []
+        for g, (df, df_cols) in enumerate(groups):
+            cols = input_columns(df_cols)
+            slim = df[[c for c in cols if c in df.columns]]
+            for part in _partitions(slim, rows):
+                jobs.append((part, cols, debug))
+                owners.append(g)
+        outs = list(self._executor.map(_score_partition, jobs))
+        return [merge_results([o for o, w in zip(outs, owners) if w == g], debug) for g in range(len(groups))]
+
+    def analyze_groups(self, groups, source) -> ScoreAnalytics:
+        """[(df, kolonlar)] → tüm satırların birleşik ScoreAnalytics'i (analytics.analyze_frame).
+        Boyut kolonları (_Prefix / _Automation / _Source) `source`tan bölümlere eklenir."""
+        total = sum(len(df) for df, _ in groups)
+        rows = min(self.partition_rows, max(1, -(-total // self.workers)))
+        dims = [c for c in SOURCE_DIM_COLS if c in source.columns]
+        jobs = []
+        for df, df_cols in groups:
+            cols = input_columns(df_cols)
+            slim = source.loc[df.index, [c for c in cols if c in source.columns] + dims]
+            jobs.extend((part, cols) for part in _partitions(slim, rows))
+        return ScoreAnalytics.merged(self._executor.map(_analyze_partition, jobs))
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+def score_parallel(df: pd.DataFrame, df_cols=None, debug: bool=False, workers=None,
+                   partition_rows: int=DEFAULT_PARTITION_ROWS) -> pd.DataFrame:
+    """score_frame'in süreç havuzlu karşılığı; tek işçide seri çalışır."""
+    if resolve_workers(workers) == 1 or len(df) <= partition_rows:
+        return score_frame(df, df_cols, debug=debug)
+    with ScoringPool(workers, partition_rows) as pool:
+        return pool.score(df, df_cols, debug=debug)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — aşama bazlı profil (isteğe bağlı)
+# - Aşama süreleri (CSV okuma, türetme, örnekleme, steps çözme, sinyal tarama,
+#   7 kriter, kart çizimi) ve sayaçlar (regex değerlendirmesi, JSON fallback)
+# - Kapalıyken (varsayılan) stage() paylaşılan nullcontext, count() boş işlem döner
+# - Etkin profil bağlam değişkenindedir (Streamlit oturum thread'leri birbirini görmez):
+#   `with profiling(Profiler()) as prof: ...`
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+class Profiler:
+    """Aşama süreleri (toplam sn + çağrı sayısı) ve adlandırılmış sayaçlar."""
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}        # ad -> [saniye, çağrı]; ilk görülme sırası korunur
+        self.counters = Counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            st = self.stages.setdefault(name, [0.0, 0])
+            st[0] += time.perf_counter() - t0
+            st[1] += 1
+
+    def count(self, name: str, n: int=1):
+        self.counters[name] += n
+
+    def to_dict(self) -> dict:
+        return {
+            "stages": [{"stage": k, "seconds": round(s, 6), "calls": c} for k, (s, c) in self.stages.items()],
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+class _NullProfiler:
+    """Kapalı profil: hiçbir şey ölçmez, ayırma yapmaz."""
+    enabled = False
+    _ctx = nullcontext()
+
+    def stage(self, name: str): return self._ctx
+    def count(self, name: str, n: int=1): pass
+
+NULL_PROFILER = _NullProfiler()
+_ACTIVE = ContextVar("profiler", default=NULL_PROFILER)
+
+def current():
+    """Etkin profil (profiling() dışında NULL_PROFILER)."""
+    return _ACTIVE.get()
+
+@contextmanager
+def profiling(profiler=None):
+    """`profiler` (None → yeni Profiler) blok süresince etkin olur; çıkışta önceki geri yüklenir."""
+    prof = profiler if profiler is not None else Profiler()
+    token = _ACTIVE.set(prof)
+    try:
+        yield prof
+    finally:
+        _ACTIVE.reset(token)
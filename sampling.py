@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — örnekleme modları
+# - Katmanlı: _Prefix / _Automation / tahmini Tablo katmanlarına kota dağıtımı
+#   (her dolu katmana en az 1, kalan oransal — en büyük kalan yöntemi)
+# - Rezervuar: parça parça (akış) girdiden tek geçişte K satır; dosya belleğe alınmaz
+# - İkisi de `random_state` (fix_seed + reroll) ile tekrarlanabilir; None → np.random
+
+import numpy as np
+import pandas as pd
+
+STRATA_DIMS = ["prefix", "automation", "table"]
+
+def _rng(random_state):
+    return np.random.RandomState(random_state) if random_state is not None else np.random
+
+def category_codes(values) -> np.ndarray:
+    """Değerlerin kategorik kodları (ör. predict_tables çıktısı → katman kodu)."""
+    return pd.Categorical(values).codes.astype(np.int32)
+
+def allocate_quotas(sizes, n: int) -> np.ndarray:
+    """Katman boyutlarına göre toplamı min(n, Σsizes) olan kotalar."""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    if n >= sizes.sum():
+        return sizes.copy()
+    base = np.zeros_like(sizes)
+    if n >= np.count_nonzero(sizes):
+        base = np.minimum(sizes, 1)
+    cap = sizes - base
+    remaining = n - int(base.sum())
+    if remaining <= 0 or cap.sum() == 0:
+        return base
+    ideal = remaining * cap / cap.sum()
+    quota = np.floor(ideal).astype(np.int64)
+    short = remaining - int(quota.sum())
+    if short:
+        # En büyük kesirli kalan önce; eşitlikte katman sırası (kararlı)
+        order = np.argsort(-(ideal - quota), kind="stable")
+        quota[order[:short]] += 1
+    return base + quota
+
+def stratified_positions(strata, pos: np.ndarray, n: int, random_state=None) -> np.ndarray:
+    """`pos` konumları arasından katmanlı n konum (artan sırada).
+    `strata`: tüm çerçeve uzunluğunda kod dizileri listesi (ör. FilterIndex.codes(...))."""
+    pos = np.asarray(pos)
+    if not strata:
+        keys = np.zeros(len(pos), dtype=np.int64)
+    else:
+        _, keys = np.unique(np.stack([np.asarray(c)[pos] for c in strata], axis=1), axis=0, return_inverse=True)
+        keys = keys.reshape(-1)
+    order = np.argsort(keys, kind="stable")
+    sizes = np.bincount(keys, minlength=int(keys.max()) + 1 if len(keys) else 0)
+    quotas = allocate_quotas(sizes, n)
+    rs = _rng(random_state)
+    picked, lo = [], 0
+    for size, q in zip(sizes, quotas):
+        members = pos[order[lo:lo + size]]
+        lo += size
+        if q:
+            picked.append(members if q == size else rs.choice(members, size=q, replace=False))
+    return np.sort(np.concatenate(picked)) if picked else np.empty(0, dtype=np.intp)
+
+class ReservoirSampler:
+    """Parça parça beslenen çerçevelerden eşit olasılıklı K satır (Algoritma R, parça başına vektörel)."""
+
+    def __init__(self, k: int, random_state=None):
+        self.k = k
+        self.seen = 0
+        self._rs = _rng(random_state)
+        self._slots = []    # (etiket, satır dict)
+
+    def update(self, chunk: pd.DataFrame):
+        m = len(chunk)
+        if m == 0 or self.k <= 0:
+            self.seen += m
+            return
+        # j. öğe (0 tabanlı genel sıra) için r ~ U[0, j]; r < k ise r. yuva değişir
+        j = np.arange(self.seen, self.seen + m)
+        r = np.floor(self._rs.random_sample(m) * (j + 1)).astype(np.int64)
+        fill = max(0, min(m, self.k - self.seen))
+        accept = np.flatnonzero(r < self.k)
+        accept = accept[accept >= fill]
+        take = np.concatenate([np.arange(fill), accept])
+        if len(take):
+            rows = chunk.iloc[take]
+            for t, label, row in zip(take, rows.index, rows.to_dict("records")):
+                if t < fill:
+                    self._slots.append((label, row))
+                else:
+                    self._slots[r[t]] = (label, row)
+        self.seen += m
+
+    def sample(self) -> pd.DataFrame:
+        return pd.DataFrame([row for _, row in self._slots], index=[label for label, _ in self._slots])
+
+def reservoir_sample(chunks, k: int, random_state=None) -> pd.DataFrame:
+    sampler = ReservoirSampler(k, random_state)
+    for chunk in chunks:
+        sampler.update(chunk)
+    return sampler.sample()
@@ -0,0 +1,1128 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — skorlama çekirdeği
+# - Streamlit'e bağımlı değildir; UI (streamlit_app.py) ve komut satırı (batch.py) ortak kullanır
+# - Tablo (A/B/C/D) İHTİYAÇ analizi, 7 kriter puanlaması, Expected yazım cezası
+# - Prefix / Otomasyon türetme ve sonuç kolonlarının tamamlanması
+# - Skorlama iki aşamalı: metin hattı → satır özellikleri → özelliklerden puanlama (kalıcı depo: features.py)
+
+import numpy as np
+import pandas as pd
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from decoding import STEP_FIELDS, decode_cell, decode_many, extract_blocks, normalize_steps
+from profiling import current as current_profiler
+from signals import (
+    DATA_SIGNAL_LABELS, PATTERNS_PER_SEGMENT, PRE_SIGNAL_LABELS, RowSignals, rule_patterns, scan_row, scan_data, scan_precond, scan_test_type, segment_bits,
+)
+
+# ---------- Yardımcılar ----------
+def _text(x): return str(x or "")
+def _cell(x) -> str:
+    try:
+        if pd.isna(x): return ""
+    except Exception:
+        pass
+    return str(x or "")
+def _is_blank_after_strip(val: str) -> bool:
+    return len((val or "").strip()) == 0
+def _normalize_newlines(s: str) -> str:
+    return (s or "").replace("\r\n","\n").replace("\r","\n")
+_BR_RX = re.compile(r'<br\s*/?>', re.I)
+_BLOCK_TAG_RX = re.compile(r'</?(p|div|li|tr|td|th|ul|ol|span|b|strong)>', re.I)
+_TAG_RX = re.compile(r'<[^>]+>')
+def _cleanup_html(s: str) -> str:
+    s = _normalize_newlines(s or "")
+    if "<" not in s: return s   # etiket yoksa üç desen de eşleşmez
+    s = _BR_RX.sub('\n', s)
+    s = _BLOCK_TAG_RX.sub('\n', s)
+    s = _TAG_RX.sub(' ', s)
+    return s
+_MEANINGLESS = frozenset({"", "-", "—", "none", "n/a", "na", "null", "yok"})
+_PUNCT_ONLY_RX = re.compile(r'[\s\[\]\{\}\(\)\.,;:\-_/\\]*')
+def _is_meaningless(val: str) -> bool:
+    # Boşluk sadeleştirme sonucu değiştirmez: kümedeki değerlerde iç boşluk yok, noktalama sınıfı \s içerir
+    v = (val or '').strip()
+    if len(v) <= 4 and v.lower() in _MEANINGLESS: return True
+    if _PUNCT_ONLY_RX.fullmatch(v): return True
+    return False
+def pick_first_existing(colnames, df_cols):
+    for name in colnames:
+        if name in df_cols: return name
+    return None
+
+# ✅ Key prefix çıkarıcı ( '-' öncesi )
+def _key_prefix(val: str) -> str:
+    v = _text(val)
+    m = re.match(r'^\s*([^\-\s]+)', v)
+    return m.group(1) if m else ""
+
+# ✅ Automated alanını yorumlayan yardımcı
+AUTOMATED_VALUES = {
+    "yes", "true", "1", "android-automated", "ios-automated",
+    "automated", "auto", "automation", "android_automated", "ios_automated"
+}
+def _detect_automation(val: str) -> str:
+    """CSV'deki 'Automated' alanından 'Otomasyon' / 'Manuel' üretir."""
+    v = (str(val or "")).strip().lower()
+    return "Otomasyon" if v in AUTOMATED_VALUES else "Manuel"
+
+# ---- Steps JSON parse & field extract ----
+STEPS_COLS = ['Custom field (Manual Test Steps)', 'Manual Test Steps', 'Steps', 'Custom Steps']
+
+def parse_steps(steps_cell):
+    """Return list of steps with normalized fields dicts, else []."""
+    return normalize_steps(decode_cell(steps_cell))
+
+def reference_parse_steps(steps_cell):
+    """Önceki (yalnızca stdlib, önce-dene-sonra-aç) çözüm — doğrulama içindir."""
+    steps = []
+    raw = steps_cell if isinstance(steps_cell, str) else ""
+    if not raw.strip():
+        return steps
+    txt = raw.strip()
+    prof = current_profiler()
+    prof.count("json:decode")
+    try:
+        data = json.loads(txt)
+        if isinstance(data, list):
+            steps = data
+        else:
+            steps = []
+    except Exception:
+        prof.count("json:fallback")
+        try:
+            if txt.startswith('"') and txt.endswith('"'):
+                txt2 = txt[1:-1].replace('""','"')
+                data = json.loads(txt2)
+                if isinstance(data, list):
+                    steps = data
+        except Exception:
+            steps = []
+    norm = []
+    for s in steps:
+        fields = s.get("fields", {}) if isinstance(s, dict) else {}
+        if not isinstance(fields, dict): fields = {}
+        f2 = {}
+        for k in ["Action","Data","Expected Result","Expected","Attachments","Step","Adım"]:
+            v = fields.get(k, "")
+            if isinstance(v, str):
+                f2[k] = v
+        norm.append({"fields": f2})
+    return norm
+
+def get_action_blocks(steps_list):
+    out = []
+    for s in steps_list:
+        v = s.get("fields",{}).get("Action","")
+        if isinstance(v,str) and v.strip():
+            out.append(v.strip())
+    if not out:
+        for s in steps_list:
+            f = s.get("fields",{})
+            for alt in ("Adım","Step"):
+                v = f.get(alt,"")
+                if isinstance(v,str) and v.strip(): out.append(v.strip())
+    return out
+
+def get_data_blocks(steps_list):
+    out = []
+    for s in steps_list:
+        v = s.get("fields",{}).get("Data","")
+        if isinstance(v,str) and v.strip():
+            out.append(v.strip())
+    return out
+
+def get_expected_blocks(steps_list):
+    out = []
+    for s in steps_list:
+        f = s.get("fields",{})
+        v = f.get("Expected Result", f.get("Expected",""))
+        if isinstance(v,str) and v.strip():
+            out.append(v.strip())
+    return out
+
+def has_data_written_from_steps(steps_list) -> bool:
+    return any(not _is_meaningless(x) for x in get_data_blocks(steps_list))
+
+def has_expected_present_from_steps(steps_list) -> bool:
+    return any(not _is_meaningless(x) for x in get_expected_blocks(steps_list))
+
+# ---- Parse-once steps: satır başına tek çözümleme ----
+class ParsedSteps(NamedTuple):
+    actions: list
+    data: list
+    expected: list
+    data_written: bool
+    expected_present: bool
+
+_NO_STEPS = ParsedSteps([], [], [], False, False)
+
+def _parsed_from_steps(steps: list) -> ParsedSteps:
+    """Ham adım listesinden bloklar + anlamlılık bayrakları (yalnızca kuralların okuduğu alanlar)."""
+    if not steps:
+        return _NO_STEPS
+    actions, data, expected = extract_blocks(steps)
+    return ParsedSteps(
+        actions, data, expected,
+        any(not _is_meaningless(x) for x in data),
+        any(not _is_meaningless(x) for x in expected),
+    )
+
+def parse_row_steps(steps_cell) -> ParsedSteps:
+    """Steps hücresini bir kez çözer; blokları ve anlamlılık bayraklarını birlikte döner."""
+    return _parsed_from_steps(decode_cell(steps_cell))
+
+def parse_steps_column(values) -> list:
+    """Kolon değerlerini ParsedSteps listesine çevirir; benzersiz hücreler toplu ve bir kez çözülür."""
+    values = [v if isinstance(v, str) else "" for v in values]
+    memo = {c: _parsed_from_steps(steps) for c, steps in decode_many(values).items()}
+    return [memo[v] for v in values]
+
+def verify_steps_cell(steps_cell) -> list:
+    """Hızlı çözüm katmanını referansla karşılaştırır; farklı alanlar (boşsa birebir)."""
+    ref = reference_parse_steps(steps_cell)
+    diffs = [] if parse_steps(steps_cell) == ref else ["steps_json"]
+    got = parse_row_steps(steps_cell)
+    if (got.actions, got.data, got.expected) != (get_action_blocks(ref), get_data_blocks(ref), get_expected_blocks(ref)):
+        diffs.append("steps_blocks")
+    return diffs
+
+def parse_steps_frame(df: pd.DataFrame) -> pd.Series:
+    """Tüm çerçevenin ParsedSteps serisi (indeks korunur) — dosya başına bir kez kurulup önbelleğe alınır."""
+    steps_col_name = pick_first_existing(STEPS_COLS, df.columns)
+    values = df[steps_col_name].tolist() if steps_col_name else [None] * len(df)
+    return pd.Series(parse_steps_column(values), index=df.index, dtype=object)
+
+# ---- PRECONDITION (CSV doluluğu) ----
+PRECOND_EXACT_COLS = [
+    "Custom field (Tests association with a Pre-Condition)",
+    "Custom field (Pre-Conditions association with a Test)",
+]
+def precondition_provided_from_csv(row, df_cols) -> bool:
+    for col in PRECOND_EXACT_COLS:
+        if col in df_cols:
+            if not _is_blank_after_strip(_cell(row.get(col))):
+                return True
+    return False
+def get_pre_assoc_text(row, df_cols) -> str:
+    texts = []
+    for col in PRECOND_EXACT_COLS:
+        if col in df_cols:
+            texts.append(_text(row.get(col)))
+    return "\n".join(texts)
+
+# ---- İçerik sinyalleri (ihtiyaç analizi) ----
+# Desenler signals.py'de bir kez derlenir; parça bazlı tarama önbelleklidir.
+def scan_precond_signals(text: str):
+    return scan_precond([text or ""])
+
+def scan_data_signals_from_text(text: str):
+    return scan_data([text or ""])
+
+# Data ihtiyacı: güçlü ikili (sinyal + yanındakilerden biri) ya da en az DATA_MIN_SIGNALS sinyal
+DATA_STRONG_COMBOS = [("JSON/HTTP", ("HTTP path", "UI input")), ("SQL", ("ID field",))]
+DATA_MIN_SIGNALS = 2
+PRE_MIN_SIGNALS = 1
+
+def _data_decision(ds):
+    strong_combo = any(a in ds and any(b in ds for b in bs) for a, bs in DATA_STRONG_COMBOS)
+    needed = strong_combo or len(ds) >= DATA_MIN_SIGNALS
+    return needed, ds, strong_combo
+
+def decide_data_needed(summary: str, action_texts: list, expected_texts: list):
+    return _data_decision(scan_data([summary] + action_texts + expected_texts))
+
+def decide_precond_needed(summary: str, action_texts: list, pre_assoc_text: str):
+    ps = scan_precond([summary] + action_texts + [pre_assoc_text or ""])
+    return len(ps) >= PRE_MIN_SIGNALS, ps
+
+# ---- TABLO KARARI (ihtiyaç + override) ----
+# Tablo → (kriter başı puan, aktif kriterler)
+TABLE_RULES = {
+    "A": (20, (1, 2, 5, 6, 7)),
+    "B": (17, (1, 2, 4, 5, 6, 7)),
+    "C": (17, (1, 2, 3, 5, 6, 7)),
+    "D": (14, (1, 2, 3, 4, 5, 6, 7)),
+}
+def _decision(table: str):
+    base, active = TABLE_RULES[table]
+    return (table, base, list(active))
+
+def choose_table(summary: str, action_texts: list, expected_texts: list, pre_assoc_text: str,
+                 *, data_written: bool, pre_written_csv: bool, debug: bool=False,
+                 signals: RowSignals=None):
+    if signals is not None:  # scan_row ile önceden taranmış sinyaller
+        data_needed, data_sigs, data_strong = _data_decision(signals.data_sigs)
+        pre_needed,  pre_sigs              = len(signals.pre_sigs) >= PRE_MIN_SIGNALS, signals.pre_sigs
+    else:
+        data_needed, data_sigs, data_strong = decide_data_needed(summary, action_texts, expected_texts)
+        pre_needed,  pre_sigs              = decide_precond_needed(summary, action_texts, pre_assoc_text)
+
+    if data_written and pre_written_csv:
+        decision = _decision("D")
+    else:
+        if data_needed and pre_needed:
+            decision = _decision("D")
+        elif data_needed:
+            decision = _decision("C")
+        elif pre_needed:
+            decision = _decision("B")
+        else:
+            decision = _decision("A")
+
+    if debug:
+        return (*decision, data_sigs, pre_sigs, data_needed, pre_needed, data_strong)
+    return decision
+
+# ✏️ ---- EXPECTED YAZIM KALİTESİ CEZASI ----
+_EXPECT_PAST_WORDS = (
+    r"(oldu|olmadı|gerçekleşti|gerçekleşmedi|yapıldı|yapılmadı|edildi|edilmedi|"
+    r"sağlandı|sağlanmadı|tamamlandı|tamamlanmadı|görüldü|görülmedi|döndü|"
+    r"başarılı oldu|başarısız oldu|hata verdi|gösterildi|gösterilmedi)"
+)
+_EXPECT_PAST_REGEXES = [
+    re.compile(rf"\b{_EXPECT_PAST_WORDS}\b", re.I),
+    re.compile(r"\b\w+(ildi|ıldı|uldu|üldü|ndi|ndı|ndu|ndü)\b", re.I),
+    re.compile(r"\b\w+(medi|madı)\b", re.I),
+]
+# Sayım için grupsuz kopyalar (findall grup metni üretmez). re.I kalır: küçültülmüş metinde de
+# 'i' ~ 'ı' eşleşmesi sayıma dahildir. Her isabet d/t + ünlü ile biten bir kelimede biter;
+# _EXPECT_STYLE_HINT tek aramayla isabetsiz metni eler.
+_EXPECT_COUNT_REGEXES = [re.compile(rx.pattern.replace("(", "(?:"), re.I) for rx in _EXPECT_PAST_REGEXES]
+_EXPECT_STYLE_HINT = re.compile(r"[dt][iıuü]\b", re.I)
+
+@lru_cache(maxsize=1 << 16)
+def expected_style_hits(text: str) -> int:
+    """Geçmiş zaman isabet sayısı; aynı metin (satırın birleşik Expected'ı) bir kez temizlenip taranır."""
+    t = _cleanup_html(text or "").lower()
+    if _EXPECT_STYLE_HINT.search(t) is None:
+        return 0
+    return sum(len(rx.findall(t)) for rx in _EXPECT_COUNT_REGEXES)
+
+def reference_expected_style_hits(text: str) -> int:
+    """Önceki (her desenle ayrı findall) sayım — doğrulama içindir."""
+    t = _cleanup_html(text or "").lower()
+    hits = 0
+    for rx in _EXPECT_PAST_REGEXES:
+        hits += len(rx.findall(t))
+    return hits
+def penalty_for_hits(hits: int) -> int:
+    if hits <= 0: return 0
+    if hits == 1: return 1
+    if hits == 2: return 2
+    if hits == 3: return 3
+    if hits <= 5: return 4
+    return 5
+def expected_style_penalty(blocks: list[str]) -> tuple[int, int]:
+    txt = " . ".join(blocks or [])
+    hits = expected_style_hits(txt)
+    if hits <= 0: return 0, 0
+    return hits, penalty_for_hits(hits)
+
+# ---- Stepler kuralı ----
+PASSIVE_PATTERNS = re.compile(
+    r'\b(yapıldı|edildi|gerçekleştirildi|sağlandı|tamamlandı|kontrol edildi|yapılır|edilir|gerçekleştirilir|sağlanır|tamamlanır|kontrol edilir)\b',
+    re.I
+)
+_LIST_ITEM_RX = re.compile(r'(^|\n)\s*(\d+[\).\-\:]|\-|\*|\•)\s+\S+')
+_JOINER_RX = re.compile(r'(?:,|\bve\b|\bsonra\b|\bardından\b)', re.I)
+# Tek blokta çok adım: en az bu kadar dolu satır / ';' / bağlaç
+SUBSTEP_MIN_LINES = 3
+SUBSTEP_MIN_SEMICOLONS = 2
+SUBSTEP_MIN_JOINERS = 3
+def _at_least(it, n: int) -> bool:
+    """Yineleyicide en az n öğe var mı (n'e ulaşınca durur)."""
+    for i, _ in enumerate(it, 1):
+        if i >= n: return True
+    return False
+
+@lru_cache(maxsize=1 << 16)
+def block_has_many_substeps(text: str) -> bool:
+    t = _cleanup_html(text or "")
+    if _LIST_ITEM_RX.search(t): return True
+    if _at_least((ln for ln in t.split('\n') if ln.strip()), SUBSTEP_MIN_LINES): return True
+    if t.count(';') >= SUBSTEP_MIN_SEMICOLONS: return True
+    if _at_least(_JOINER_RX.finditer(t), SUBSTEP_MIN_JOINERS): return True
+    return False
+
+def reference_block_has_many_substeps(text: str) -> bool:
+    """Önceki (derlenmemiş desenli, tam sayımlı) kural — doğrulama içindir. Desenler ve eşikler
+    derlenmiş yoldakilerle aynıdır: karşılaştırma yalnızca değerlendirme biçimini sınar."""
+    t = _cleanup_html(text or "")
+    if re.search(_LIST_ITEM_RX.pattern, t): return True
+    lines = [ln.strip() for ln in re.split(r'(?:\n)+', t) if ln.strip()]
+    if len(lines) >= SUBSTEP_MIN_LINES: return True
+    if t.count(';') >= SUBSTEP_MIN_SEMICOLONS: return True
+    joiners = re.findall(_JOINER_RX.pattern, t, _JOINER_RX.flags)
+    if len(joiners) >= SUBSTEP_MIN_JOINERS: return True
+    return False
+
+def verify_text_rules(action_texts: list, expected_texts: list) -> list:
+    """Derlenmiş Expected yazım / tek blok kuralları ile referansı karşılaştırır; farklı alanlar (boşsa birebir)."""
+    diffs = []
+    txt = " . ".join(expected_texts or [])
+    if expected_style_hits(txt) != reference_expected_style_hits(txt):
+        diffs.append("exp_hits")
+    if len(action_texts) == 1 and (block_has_many_substeps(action_texts[0] or "")
+                                   != reference_block_has_many_substeps(action_texts[0] or "")):
+        diffs.append("substeps")
+    return diffs
+
+# ---- Test Tipi (Backend/UI) Heuristics ----
+def detect_test_type(summary: str, labels_text: str, action_texts: list, expected_texts: list) -> str:
+    return scan_test_type([summary or "", labels_text or ""] + action_texts + expected_texts, labels_text)
+
+# ---------- Skorlama ----------
+CLIENT_KEYWORDS = ["android","ios","web","mac","windows","chrome","safari","firefox","edge"]
+_EMPTY_PRIORITY = ["", "null", "none", "nan"]
+TITLE_MIN_LEN = 10
+TITLE_WEAK_PHRASES = ["test edilir", "kontrol edilir"]
+TITLE_WEAK_DEDUCTION = 3
+
+def score_one(row, df_cols, debug=False):
+    key = _text(row.get('Issue key') or row.get('Issue Key') or row.get('Key') or row.get('IssueKey'))
+    summary = _text(row.get('Summary') or row.get('Issue Summary') or row.get('Title'))
+    priority = _text(row.get('Priority'))
+
+    steps_col_name = pick_first_existing(STEPS_COLS, df_cols)
+    ps = parse_row_steps(row.get(steps_col_name)) if steps_col_name else _NO_STEPS
+
+    action_blocks = ps.actions
+    expected_blocks = ps.expected
+    data_blocks = ps.data
+
+    data_present_for_scoring = ps.data_written
+    precond_provided_csv     = precondition_provided_from_csv(row, df_cols)
+    expected_present         = ps.expected_present
+    pre_assoc_text           = get_pre_assoc_text(row, df_cols)
+
+    label_cols = [c for c in df_cols if c.lower().startswith("labels")]
+    labels_text = " ".join([_text(row.get(c)) for c in label_cols])
+    signals = scan_row(summary, action_blocks, expected_blocks, pre_assoc_text, labels_text)
+    test_type = signals.test_type
+
+    if debug:
+        table, base, active, data_sigs, pre_sigs, data_needed, pre_needed, data_strong = choose_table(
+            summary, action_blocks, expected_blocks, pre_assoc_text,
+            data_written=data_present_for_scoring,
+            pre_written_csv=precond_provided_csv,
+            debug=True, signals=signals
+        )
+    else:
+        table, base, active = choose_table(
+            summary, action_blocks, expected_blocks, pre_assoc_text,
+            data_written=data_present_for_scoring,
+            pre_written_csv=precond_provided_csv,
+            debug=False, signals=signals
+        )
+        data_sigs = pre_sigs = []
+        data_needed = pre_needed = None
+        data_strong = None
+
+    pts, notes, total = {}, [], 0
+    exp_style = None
+
+    # 1) Başlık
+    if 1 in active:
+        if not summary or len(summary) < TITLE_MIN_LEN:
+            pts['Başlık'] = 0; notes.append("❌ Başlık çok kısa")
+        elif any(w in summary.lower() for w in TITLE_WEAK_PHRASES):
+            pts['Başlık'] = max(base-TITLE_WEAK_DEDUCTION, 1); notes.append(f"🔸 Başlık zayıf ifade ({pts['Başlık']})"); total += pts['Başlık']
+        else:
+            pts['Başlık'] = base; notes.append("✅ Başlık anlaşılır"); total += base
+
+    # 2) Öncelik
+    if 2 in active:
+        if priority.strip().lower() in _EMPTY_PRIORITY:
+            pts['Öncelik'] = 0; notes.append("❌ Öncelik eksik")
+        else:
+            pts['Öncelik'] = base; notes.append("✅ Öncelik var"); total += base
+
+    # 3) Data
+    if 3 in active:
+        if data_present_for_scoring:
+            pts['Data'] = base; notes.append("✅ Data mevcut (steps JSON)")
+            total += base
+        else:
+            pts['Data'] = 0; notes.append("❌ Data bulunamadı")
+
+    # 4) Ön Koşul (YALNIZCA CSV)
+    if 4 in active:
+        if precond_provided_csv:
+            pts['Ön Koşul'] = base; notes.append("✅ Pre-Condition association var (CSV)")
+            total += base
+        else:
+            pts['Ön Koşul'] = 0; notes.append("❌ Pre-Condition association eksik (CSV)")
+
+    # 5) Stepler
+    if 5 in active:
+        n_blocks = len(action_blocks)
+        if n_blocks == 0:
+            pts['Stepler'] = 0; notes.append("❌ Stepler boş")
+        elif n_blocks >= 2:
+            pts['Stepler'] = base; notes.append(f"✅ Stepler ayrı ve düzgün ({n_blocks} adım)"); total += base
+        else:
+            t = (action_blocks[0] or "")
+            if block_has_many_substeps(t) or PASSIVE_PATTERNS.search(t):
+                pts['Stepler'] = 1; notes.append("❌ Tek blokta çok adım veya edilgen ifade (1 puan)"); total += 1
+            else:
+                pts['Stepler'] = base; notes.append("✅ Tek step ama net/tek eylem"); total += base
+
+    # 6) Client
+    if 6 in active:
+        ck = CLIENT_KEYWORDS
+        all_text = " ".join([summary] + action_blocks)
+        if any(c in all_text.lower() for c in ck) or any(c in labels_text.lower() for c in ck):
+            pts['Client'] = base; notes.append("✅ Client bilgisi var"); total += base
+        else:
+            pts['Client'] = 0; notes.append("❌ Client bilgisi eksik")
+
+    # 7) Expected (+ yazım cezası)
+    if 7 in active:
+        if expected_present:
+            pts['Expected'] = base
+            hits, pen = exp_style = expected_style_penalty(expected_blocks)
+            if pen > 0:
+                pts['Expected'] = max(0, pts['Expected'] - pen)
+                notes.append(f"✏️ Expected yazımı (geçmiş zaman) -{pen} (isabet: {hits})")
+            else:
+                notes.append("✅ Expected mevcut (en az bir adım)")
+            total += pts['Expected']
+        else:
+            pts['Expected'] = 0; notes.append("❌ Expected result eksik")
+
+    result = {
+        "Key": key, "Summary": summary, "Tablo": table, "Toplam Puan": total,
+        **pts, "Açıklama": " | ".join(notes),
+        "_type": test_type
+    }
+    if debug:
+        hits_dbg, pen_dbg = exp_style or expected_style_penalty(expected_blocks)
+        result.update({
+            "_data_sigs": ", ".join(sorted(data_sigs)) or "-",
+            "_pre_sigs":  ", ".join(sorted(pre_sigs)) or "-",
+            "_data_needed": data_needed,
+            "_pre_needed":  pre_needed,
+            "_data_strong": data_strong,
+            "_data_written": data_present_for_scoring,
+            "_pre_written_csv": precond_provided_csv,
+            "_exp_hits": hits_dbg,
+            "_exp_penalty": pen_dbg,
+            "_actions_join": " ⏵ ".join(action_blocks)[:1200],
+            "_expected_join": " ⏵ ".join(expected_blocks)[:1200],
+            "_data_join": " ⏵ ".join(data_blocks)[:1200],
+        })
+    return result
+
+# ---------- Tablo maksimumları & sonuç kolonları ----------
+MAX_BY_TABLE = {"A": 100, "B": 102, "C": 102, "D": 98}
+CRITERIA = ['Başlık', 'Öncelik', 'Data', 'Ön Koşul', 'Stepler', 'Client', 'Expected']
+KEY_COLS = ['Issue key', 'Issue Key', 'Key', 'IssueKey']
+SHOW_COLS = ["Prefix", "Key", "Summary", "Tablo", "Toplam Puan", "Skor %", "Automation", "Açıklama", "_type"]
+DEBUG_COLS = ["_data_needed", "_pre_needed", "_data_strong", "_data_written", "_pre_written_csv",
+              "_data_sigs", "_pre_sigs", "_exp_hits", "_exp_penalty"]
+
+# Kural seti sürümü: puanlamayı aşağıdaki desen / liste / eşikler dışında (kod akışıyla)
+# değiştiren bir düzenlemede artırın
+RULES_VERSION = 1
+PENALTY_PROBE_HITS = 16   # penalty_for_hits basamakları bu isabet sayısına kadar parmak izine girer
+
+def _text_rule_parts() -> list:
+    """Metin hattının (steps çözümü, sinyaller, kriter metin kuralları) okuduğu desen, kelime listesi
+    ve eşikler — iki parmak izinin ortak listesi; score_one'ın okuduğu yeni bir kural buraya eklenir."""
+    parts = [repr(STEPS_COLS), repr(PRECOND_EXACT_COLS), repr(KEY_COLS), repr(STEP_FIELDS),
+             _BR_RX.pattern, _BLOCK_TAG_RX.pattern, _TAG_RX.pattern,
+             repr(sorted(_MEANINGLESS)), _PUNCT_ONLY_RX.pattern,
+             repr(TITLE_MIN_LEN), repr(TITLE_WEAK_PHRASES), repr(_EMPTY_PRIORITY), repr(CLIENT_KEYWORDS),
+             PASSIVE_PATTERNS.pattern, _LIST_ITEM_RX.pattern, _JOINER_RX.pattern,
+             repr((SUBSTEP_MIN_LINES, SUBSTEP_MIN_SEMICOLONS, SUBSTEP_MIN_JOINERS))]
+    parts += [rx.pattern for rx in _EXPECT_PAST_REGEXES]
+    return parts + rule_patterns() + DATA_SIGNAL_LABELS + PRE_SIGNAL_LABELS
+
+def rules_fingerprint() -> str:
+    """Kural setinin parmak izi; saklanan skorlar bu değişince geçersiz olur.
+    Metin kurallarının tamamı + tablo kararı, kriter puanları, ceza basamakları ve not metinleri."""
+    parts = [f"v{RULES_VERSION}"] + _text_rule_parts()
+    parts += [repr(sorted(TABLE_RULES.items())), repr(sorted(MAX_BY_TABLE.items())),
+              repr(DATA_STRONG_COMBOS), repr((DATA_MIN_SIGNALS, PRE_MIN_SIGNALS, TITLE_WEAK_DEDUCTION)),
+              repr([penalty_for_hits(h) for h in range(PENALTY_PROBE_HITS)]), repr(NOTE_TEXTS)]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+def features_fingerprint() -> str:
+    """Özellik çıkarımının (yalnızca metin kuralları) parmak izi. Tablo puanları, aktif kriterler ve
+    ceza basamakları dahil değildir: bunlar değişince saklanan özellikler geçerli kalır."""
+    parts = [f"f{FEATURES_VERSION}", repr(FEATURE_COLS)] + _text_rule_parts()
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+def result_columns(debug: bool=False, sources: bool=False) -> list:
+    """Gösterim/çıktı kolonları; `sources`: çoklu dosya çalıştırmasında Prefix'in yanında Kaynak."""
+    cols = ["Kaynak"] + SHOW_COLS if sources else SHOW_COLS
+    return cols + (DEBUG_COLS if debug else [])
+
+# ---------- Türetilmiş kolonlar & filtreler ----------
+def find_automation_column(df_cols):
+    for c in df_cols:
+        cl = str(c).strip().lower()
+        if cl == "automated" or "automated" in cl:
+            return c
+    return None
+
+def derive_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """_KeyRaw / _Prefix / _Automation yardımcı kolonlarını ekler (yerinde).
+    _key_prefix / _detect_automation ile aynı sonucu kolon işlemleriyle üretir."""
+    with current_profiler().stage("derive"):
+        return _derive_columns(df)
+
+def _derive_columns(df: pd.DataFrame) -> pd.DataFrame:
+    key_col_name = pick_first_existing(KEY_COLS, df.columns)
+    if key_col_name:
+        df['_KeyRaw'] = df[key_col_name].astype(str)
+        df['_Prefix'] = df['_KeyRaw'].fillna("nan").str.extract(r'^\s*([^\-\s]+)', expand=False).fillna("")
+    auto_col = find_automation_column(df.columns)
+    if auto_col:
+        v = pd.Series([str(x or "") for x in df[auto_col].tolist()], index=df.index, dtype=object)
+        is_auto = v.str.strip().str.lower().isin(AUTOMATED_VALUES)
+        df["_Automation"] = np.where(is_auto, "Otomasyon", "Manuel")
+    else:
+        df["_Automation"] = "Manuel"
+    return df
+
+def filter_frame(df: pd.DataFrame, prefixes=None, automation: str="Tümü") -> pd.DataFrame:
+    """Prefix listesi ve Çalıştırma tipi ('Tümü' / 'Sadece Otomasyon' / 'Sadece Manuel') filtresi."""
+    if prefixes and '_Prefix' in df.columns:
+        df = df[df['_Prefix'].isin(prefixes)]
+    if automation == "Sadece Otomasyon":
+        df = df[df["_Automation"] == "Otomasyon"]
+    elif automation == "Sadece Manuel":
+        df = df[df["_Automation"] == "Manuel"]
+    return df
+
+# ---------- Toplu skorlama (kolon bazlı) ----------
+# score_one ile birebir aynı sonucu üretir; şema (kolon adları) bir kez çözülür,
+# kriterler satır satır değil kolon işlemleriyle hesaplanır.
+_CLIENT_RX = "|".join(CLIENT_KEYWORDS)
+
+def _column_values(df: pd.DataFrame, name) -> list:
+    """row.get(name) karşılığı: kolon yoksa None listesi."""
+    if name is not None and name in df.columns:
+        return df[name].tolist()
+    return [None] * len(df)
+
+def _first_truthy_text(df: pd.DataFrame, names) -> list:
+    """_text(row.get(a) or row.get(b) or ...) karşılığı."""
+    cols = [_column_values(df, n) for n in names]
+    return [_text(next((v for v in vals if v), None)) for vals in zip(*cols)]
+
+def _result_column_order(tables, debug: bool) -> list:
+    # dict listesinden DataFrame kurulurken oluşan kolon sırası (ilk görülme sırası)
+    order = []
+    for t in pd.unique(pd.Series(tables)):
+        keys = ["Key", "Summary", "Tablo", "Toplam Puan"]
+        keys += [c for i, c in enumerate(CRITERIA, 1) if i in TABLE_RULES[t][1]]
+        keys += ["Açıklama", "_type"]
+        if debug:
+            keys += ["_data_sigs", "_pre_sigs", "_data_needed", "_pre_needed", "_data_strong",
+                     "_data_written", "_pre_written_csv", "_exp_hits", "_exp_penalty",
+                     "_actions_join", "_expected_join", "_data_join"]
+        order += [k for k in keys if k not in order]
+    return order
+
+# ---------- Sıkıştırılmış sonuç gösterimi ----------
+# Satır başına: 7 kriter puanı (int8), 7 not kodu (uint8), tablo & test tipi kodu (int8),
+# adım sayısı ve Expected isabeti (int16). Türkçe notlar yalnızca gösterim/dışa aktarmada açılır.
+TABLES = ["A", "B", "C", "D"]
+TABLE_CODES = {t: i for i, t in enumerate(TABLES)}
+TABLE_BASE = np.array([TABLE_RULES[t][0] for t in TABLES], dtype=np.int16)
+TABLE_ACTIVE = np.array([[k in TABLE_RULES[t][1] for k in range(1, 8)] for t in TABLES], dtype=bool)
+TEST_TYPES = ["Backend", "UI", "—"]
+TYPE_CODES = {t: i for i, t in enumerate(TEST_TYPES)}
+
+# Kriter başına not kodu → metin ({pts}, {n}, {pen}, {hits} yer tutucuları satırdan doldurulur)
+NOTE_TEXTS = [
+    ["❌ Başlık çok kısa", "🔸 Başlık zayıf ifade ({pts})", "✅ Başlık anlaşılır"],
+    ["❌ Öncelik eksik", "✅ Öncelik var"],
+    ["❌ Data bulunamadı", "✅ Data mevcut (steps JSON)"],
+    ["❌ Pre-Condition association eksik (CSV)", "✅ Pre-Condition association var (CSV)"],
+    ["❌ Stepler boş", "✅ Stepler ayrı ve düzgün ({n} adım)", "❌ Tek blokta çok adım veya edilgen ifade (1 puan)",
+     "✅ Tek step ama net/tek eylem"],
+    ["❌ Client bilgisi eksik", "✅ Client bilgisi var"],
+    ["❌ Expected result eksik", "✏️ Expected yazımı (geçmiş zaman) -{pen} (isabet: {hits})",
+     "✅ Expected mevcut (en az bir adım)"],
+]
+
+class CompactResults:
+    """Skor sonuçlarının tipli, kolon dizili gösterimi; to_frame() score_frame çıktısının aynısını üretir."""
+    __slots__ = ("index", "keys", "summaries", "tables", "points", "notes", "types", "n_blocks", "exp_hits")
+
+    def __init__(self, index, keys, summaries, tables, points, notes, types, n_blocks, exp_hits):
+        self.index = index
+        self.keys = keys            # list[str]
+        self.summaries = summaries  # list[str]
+        self.tables = tables        # int8, TABLES kodu
+        self.points = points        # int8 (n, 7)
+        self.notes = notes          # uint8 (n, 7), NOTE_TEXTS kodu
+        self.types = types          # int8, TEST_TYPES kodu
+        self.n_blocks = n_blocks    # int16
+        self.exp_hits = exp_hits    # int16
+
+    @classmethod
+    def empty(cls):
+        z = np.zeros(0, dtype=np.int8)
+        return cls(pd.RangeIndex(0), [], [], z, np.zeros((0, 7), np.int8), np.zeros((0, 7), np.uint8),
+                   z, np.zeros(0, np.int16), np.zeros(0, np.int16))
+
+    def __len__(self): return len(self.tables)
+
+    @property
+    def active(self) -> np.ndarray:
+        return TABLE_ACTIVE[self.tables]
+
+    @property
+    def total(self) -> np.ndarray:
+        return np.where(self.active, self.points, 0).sum(axis=1, dtype=np.int64)
+
+    @property
+    def table_labels(self) -> list:
+        return [TABLES[c] for c in self.tables]
+
+    @property
+    def type_labels(self) -> list:
+        return [TEST_TYPES[c] for c in self.types]
+
+    @property
+    def nbytes(self) -> int:
+        """Dizilerin + Key/Summary referanslarının baytı (metinler kaynak çerçeveyle paylaşılır)."""
+        arrays = (self.tables, self.points, self.notes, self.types, self.n_blocks, self.exp_hits)
+        return sum(a.nbytes for a in arrays) + 16 * len(self)
+
+    def criterion_notes(self, k: int) -> list:
+        """k. kriterin (0 tabanlı) not metinleri."""
+        texts, codes = NOTE_TEXTS[k], self.notes[:, k]
+        if k == 0:
+            return [texts[c].format(pts=p) if c == 1 else texts[c] for c, p in zip(codes, self.points[:, 0])]
+        if k == 4:
+            return [texts[c].format(n=b) if c == 1 else texts[c] for c, b in zip(codes, self.n_blocks)]
+        if k == 6:
+            return [texts[c].format(pen=penalty_for_hits(h), hits=h) if c == 1 else texts[c]
+                    for c, h in zip(codes, self.exp_hits)]
+        return [texts[c] for c in codes]
+
+    def explanations(self) -> list:
+        """'Açıklama' kolonu: aktif kriterlerin notları ' | ' ile."""
+        notes = [self.criterion_notes(k) for k in range(7)]
+        active = self.active
+        return [" | ".join(notes[k][i] for k in range(7) if active[i, k]) for i in range(len(self))]
+
+    def to_frame(self, extra: dict=None) -> pd.DataFrame:
+        """score_frame çıktısı (extra: debug kolonları)."""
+        active = self.active
+        tables = self.table_labels
+        out = {"Key": self.keys, "Summary": self.summaries, "Tablo": tables, "Toplam Puan": self.total.tolist(),
+               "Açıklama": self.explanations(), "_type": self.type_labels}
+        for k, name in enumerate(CRITERIA):
+            if active[:, k].all():
+                out[name] = self.points[:, k].astype(np.int64).tolist()
+            elif active[:, k].any():
+                out[name] = np.where(active[:, k], self.points[:, k], np.nan).tolist()
+        if extra:
+            out.update(extra)
+        return pd.DataFrame({c: out[c] for c in _result_column_order(tables, bool(extra))}, index=self.index)
+
+    def take(self, positions) -> "CompactResults":
+        pos = np.asarray(positions, dtype=np.intp)
+        return CompactResults(self.index[pos], [self.keys[i] for i in pos], [self.summaries[i] for i in pos],
+                              self.tables[pos], self.points[pos], self.notes[pos], self.types[pos],
+                              self.n_blocks[pos], self.exp_hits[pos])
+
+    @classmethod
+    def concat(cls, parts) -> "CompactResults":
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        return cls(parts[0].index.append([p.index for p in parts[1:]]),
+                   [k for p in parts for k in p.keys], [s for p in parts for s in p.summaries],
+                   *(np.concatenate([getattr(p, a) for p in parts])
+                     for a in ("tables", "points", "notes", "types", "n_blocks", "exp_hits")))
+
+def _frame_texts(df: pd.DataFrame, cols, parsed=None) -> dict:
+    """Şemayı bir kez çözer; score_one'ın satır başına okuduğu metinleri kolon kolon üretir.
+    `parsed`: önceden kurulmuş ParsedSteps serisi (parse_steps_frame) — verilirse steps yeniden çözülmez."""
+    n = len(df)
+    steps_col_name = pick_first_existing(STEPS_COLS, cols)
+    pre_cols = [c for c in PRECOND_EXACT_COLS if c in cols]
+    label_cols = [c for c in cols if c.lower().startswith("labels")]
+    pre_values = [_column_values(df, c) for c in pre_cols]
+    label_values = [_column_values(df, c) for c in label_cols]
+    return {
+        "keys": _first_truthy_text(df, KEY_COLS),
+        "summaries": _first_truthy_text(df, ['Summary', 'Issue Summary', 'Title']),
+        "priorities": [_text(v) for v in _column_values(df, 'Priority')],
+        "steps": (parsed.loc[df.index].tolist() if parsed is not None
+                  else parse_steps_column(_column_values(df, steps_col_name)) if steps_col_name
+                  else [_NO_STEPS] * n),
+        "pre_values": pre_values,
+        "pre_texts": ["\n".join(_text(v) for v in vals) for vals in zip(*pre_values)] if pre_values else [""] * n,
+        "labels_texts": [" ".join(_text(v) for v in vals) for vals in zip(*label_values)] if label_values else [""] * n,
+    }
+
+def row_texts(df: pd.DataFrame, df_cols=None):
+    """(key, summary, action_blocks, expected_blocks, pre_assoc_text, labels_text) üretir."""
+    ft = _frame_texts(df, df.columns if df_cols is None else df_cols)
+    for i, ps in enumerate(ft["steps"]):
+        yield (ft["keys"][i], ft["summaries"][i], ps.actions, ps.expected,
+               ft["pre_texts"][i], ft["labels_texts"][i])
+
+def _precond_filled(ft: dict, idx) -> pd.Series:
+    """Ön koşul doluluğu (yalnızca CSV) — kolon işlemi."""
+    precond = pd.Series(False, index=idx)
+    for vals in ft["pre_values"]:
+        precond |= pd.Series([_cell(v) for v in vals], index=idx, dtype=object).str.strip().str.len() > 0
+    return precond
+
+def predict_tables(df: pd.DataFrame, df_cols=None, parsed=None) -> pd.Series:
+    """Yalnızca tablo kararı (A/B/C/D) — kriter puanlaması yapmadan; katmanlı örnekleme içindir."""
+    cols = df.columns if df_cols is None else df_cols
+    ft = _frame_texts(df, cols, parsed)
+    precond = _precond_filled(ft, df.index).to_numpy(dtype=bool)
+    tables = []
+    for i, ps in enumerate(ft["steps"]):
+        sig = scan_row(ft["summaries"][i], ps.actions, ps.expected, ft["pre_texts"][i], ft["labels_texts"][i])
+        tables.append(choose_table(ft["summaries"][i], ps.actions, ps.expected, ft["pre_texts"][i],
+                                   data_written=ps.data_written, pre_written_csv=bool(precond[i]),
+                                   signals=sig)[0])
+    return pd.Series(tables, index=df.index, dtype=object)
+
+# ---------- Satır özellikleri ----------
+# Metin hattının (steps çözümü, sinyal taraması, kriter metin kuralları) satır başına çıktısı.
+# Yalnızca desenlere / anahtar kelimelere bağlıdır; tablo kararı, kriter puanları ve ceza basamakları
+# score_features'ta uygulanır — bu kurallar değişince metinler yeniden taranmaz (features.py).
+FEATURE_COLS = {
+    "title_short": "bool", "title_weak": "bool", "priority_set": "bool",
+    "data_written": "bool", "expected_present": "bool", "precond": "bool",
+    "data_bits": "uint8", "pre_bits": "uint8", "test_type": "int8",
+    "n_blocks": "int16", "single_bad": "bool", "client": "bool", "exp_hits": "int16",
+}
+# Özellik tanımı sürümü: çıkarımı desenler dışında değiştiren bir düzenlemede artırın
+FEATURES_VERSION = 1
+
+def _signal_mask(labels, names) -> int:
+    return sum(1 << names.index(l) for l in labels)
+
+_DATA_BY_MASK = [[l for i, l in enumerate(DATA_SIGNAL_LABELS) if m >> i & 1] for m in range(1 << len(DATA_SIGNAL_LABELS))]
+_PRE_BY_MASK = [[l for i, l in enumerate(PRE_SIGNAL_LABELS) if m >> i & 1] for m in range(1 << len(PRE_SIGNAL_LABELS))]
+
+def _extract_features(df: pd.DataFrame, cols, parsed) -> tuple:
+    """Metin hattı → (özellik dict'i: Key/Summary listeleri + FEATURE_COLS dizileri, ParsedSteps listesi)."""
+    n = len(df)
+    idx = df.index
+    prof = current_profiler()
+
+    with prof.stage("parse_steps"):
+        ft = _frame_texts(df, cols, parsed)
+    summaries, steps, labels_texts = ft["summaries"], ft["steps"], ft["labels_texts"]
+    actions = [ps.actions for ps in steps]
+    expecteds = [ps.expected for ps in steps]
+
+    if prof.enabled: cache0 = segment_bits.cache_info()
+    with prof.stage("signals"):
+        sigs = [scan_row(summaries[i], actions[i], expecteds[i], ft["pre_texts"][i], labels_texts[i]) for i in range(n)]
+    if prof.enabled:
+        cache1 = segment_bits.cache_info()
+        prof.count("signals:segment_scans", cache1.misses - cache0.misses)
+        prof.count("signals:cache_hits", cache1.hits - cache0.hits)
+        prof.count("regex:signals", (cache1.misses - cache0.misses) * PATTERNS_PER_SEGMENT)
+
+    feat = {
+        "keys": ft["keys"], "summaries": summaries,
+        "data_written": np.array([ps.data_written for ps in steps], dtype=bool),
+        "expected_present": np.array([ps.expected_present for ps in steps], dtype=bool),
+        "precond": _precond_filled(ft, idx).to_numpy(dtype=bool),
+        "data_bits": np.array([_signal_mask(sig.data_sigs, DATA_SIGNAL_LABELS) for sig in sigs], dtype=np.uint8),
+        "pre_bits": np.array([_signal_mask(sig.pre_sigs, PRE_SIGNAL_LABELS) for sig in sigs], dtype=np.uint8),
+        "test_type": np.array([TYPE_CODES[sig.test_type] for sig in sigs], dtype=np.int8),
+    }
+
+    # 1) Başlık: kısa / zayıf ifade
+    with prof.stage("criterion:Başlık"):
+        summ = pd.Series(summaries, index=idx, dtype=object)
+        summ_low = summ.str.lower()
+        feat["title_short"] = (summ.str.len() < TITLE_MIN_LEN).to_numpy(dtype=bool)
+        weak = pd.Series(False, index=idx)
+        for w in TITLE_WEAK_PHRASES:
+            weak |= summ_low.str.contains(w, regex=False)
+        feat["title_weak"] = weak.to_numpy(dtype=bool)
+
+    # 2) Öncelik
+    with prof.stage("criterion:Öncelik"):
+        feat["priority_set"] = ~pd.Series(ft["priorities"], index=idx, dtype=object) \
+            .str.strip().str.lower().isin(_EMPTY_PRIORITY).to_numpy(dtype=bool)
+
+    # 5) Stepler: blok sayısı, tek blokta çok adım / edilgen ifade
+    if prof.enabled: steps0, style0 = block_has_many_substeps.cache_info(), expected_style_hits.cache_info()
+    with prof.stage("criterion:Stepler"):
+        n_blocks = np.array([len(a) for a in actions], dtype=np.int16)
+        feat["n_blocks"] = n_blocks
+        feat["single_bad"] = np.array([n_blocks[i] == 1 and bool(block_has_many_substeps(actions[i][0] or "")
+                                                                 or PASSIVE_PATTERNS.search(actions[i][0] or ""))
+                                       for i in range(n)], dtype=bool)
+
+    # 6) Client anahtar kelimesi
+    with prof.stage("criterion:Client"):
+        all_text = pd.Series([" ".join([summaries[i]] + actions[i]) for i in range(n)], index=idx, dtype=object)
+        lab = pd.Series(labels_texts, index=idx, dtype=object)
+        feat["client"] = (all_text.str.lower().str.contains(_CLIENT_RX, regex=True)
+                          | lab.str.lower().str.contains(_CLIENT_RX, regex=True)).to_numpy(dtype=bool)
+
+    # 7) Expected yazımı: geçmiş zaman isabetleri (Expected varsa)
+    with prof.stage("criterion:Expected"):
+        ep = feat["expected_present"]
+        feat["exp_hits"] = np.array([expected_style_hits(" . ".join(expecteds[i])) if ep[i] else 0
+                                     for i in range(n)], dtype=np.int16)
+
+    if prof.enabled:
+        # Yalnızca önbellekte olmayan metinler taranır
+        steps1, style1 = block_has_many_substeps.cache_info(), expected_style_hits.cache_info()
+        prof.count("regex:expected_style", style1.misses - style0.misses)
+        prof.count("regex:steps_single_block", steps1.misses - steps0.misses)
+        prof.count("text_rules:cache_hits", (style1.hits - style0.hits) + (steps1.hits - steps0.hits))
+    return feat, steps
+
+def _feature_decisions(feat: dict, debug: bool=False):
+    """choose_table kararları; aynı (sinyal, Data yazılı, ön koşul) birleşimi için bir kez çağrılır.
+    → (satır başına birleşim konumu, birleşim başına karar listesi)"""
+    combo = (feat["data_bits"].astype(np.int32) | feat["pre_bits"].astype(np.int32) << 8
+             | feat["data_written"].astype(np.int32) << 16 | feat["precond"].astype(np.int32) << 17)
+    uniq, inverse = np.unique(combo, return_inverse=True)
+    decisions = []
+    for c in uniq.tolist():
+        sig = RowSignals(_DATA_BY_MASK[c & 0xFF], _PRE_BY_MASK[c >> 8 & 0xFF], "")
+        decisions.append(choose_table("", [], [], "", data_written=bool(c >> 16 & 1),
+                                      pre_written_csv=bool(c >> 17 & 1), debug=debug, signals=sig))
+    return inverse.reshape(-1), decisions
+
+def score_features(feat: dict, index=None) -> "CompactResults":
+    """Özelliklerden skorlama (metin taranmaz); score_frame ile birebir aynı puan ve notlar.
+    `feat`: Key/Summary listeleri ("keys", "summaries") + FEATURE_COLS dizileri."""
+    n = len(feat["keys"])
+    if n == 0:
+        return CompactResults.empty()
+    idx = pd.RangeIndex(n) if index is None else index
+    prof = current_profiler()
+
+    with prof.stage("choose_table"):
+        inverse, decisions = _feature_decisions(feat)
+        codes = np.array([TABLE_CODES[d[0]] for d in decisions], dtype=np.int8)[inverse]
+    base = TABLE_BASE[codes]
+    pts = np.zeros((n, 7), dtype=np.int8)
+    note = np.zeros((n, 7), dtype=np.uint8)
+
+    with prof.stage("criteria"):
+        # 1) Başlık — 0: kısa, 1: zayıf ifade, 2: anlaşılır
+        short, weak = feat["title_short"], feat["title_weak"]
+        pts[:, 0] = np.where(short, 0, np.where(weak, np.maximum(base - TITLE_WEAK_DEDUCTION, 1), base))
+        note[:, 0] = np.where(short, 0, np.where(weak, 1, 2))
+
+        # 2) Öncelik — 0: eksik, 1: var
+        pr = feat["priority_set"]
+        pts[:, 1] = np.where(pr, base, 0)
+        note[:, 1] = pr
+
+        # 3) Data — 0: yok, 1: var
+        dw = feat["data_written"]
+        pts[:, 2] = np.where(dw, base, 0)
+        note[:, 2] = dw
+
+        # 4) Ön Koşul (YALNIZCA CSV) — 0: eksik, 1: var
+        pc = feat["precond"]
+        pts[:, 3] = np.where(pc, base, 0)
+        note[:, 3] = pc
+
+        # 5) Stepler — 0: boş, 1: ayrı ve düzgün, 2: tek blokta çok adım/edilgen, 3: tek ama net
+        n_blocks = feat["n_blocks"]
+        conds = [n_blocks == 0, n_blocks >= 2, feat["single_bad"]]
+        pts[:, 4] = np.select(conds, [0, base, 1], default=base)
+        note[:, 4] = np.select(conds, [0, 1, 2], default=3)
+
+        # 6) Client — 0: eksik, 1: var
+        client = feat["client"]
+        pts[:, 5] = np.where(client, base, 0)
+        note[:, 5] = client
+
+        # 7) Expected (+ yazım cezası) — 0: eksik, 1: yazım cezası, 2: mevcut
+        ep, hits = feat["expected_present"], feat["exp_hits"]
+        ladder = np.array([penalty_for_hits(h) for h in range(int(hits.max()) + 1)], dtype=np.int8)
+        pen = np.where(ep, ladder[hits], 0)
+        pts[:, 6] = np.where(ep, np.maximum(0, base - pen), 0)
+        note[:, 6] = np.where(~ep, 0, np.where(pen > 0, 1, 2))
+
+    return CompactResults(idx, feat["keys"], feat["summaries"], codes, pts, note, feat["test_type"],
+                          n_blocks, np.where(ep, hits, 0).astype(np.int16))
+
+def feature_debug_columns(feat: dict) -> dict:
+    """Özelliklerden debug kolonları. Steps metinleri saklanmadığından *_join kolonları boştur
+    (dışa aktarılan DEBUG_COLS'ta yer almazlar). Expected anlamsızsa isabet zaten 0'dır."""
+    inverse, decisions = _feature_decisions(feat, debug=True)
+    dec = [decisions[i] for i in inverse]
+    hits = feat["exp_hits"].tolist()
+    return {
+        "_data_sigs": [", ".join(sorted(d[3])) or "-" for d in dec],
+        "_pre_sigs": [", ".join(sorted(d[4])) or "-" for d in dec],
+        "_data_needed": [d[5] for d in dec],
+        "_pre_needed": [d[6] for d in dec],
+        "_data_strong": [d[7] for d in dec],
+        "_data_written": feat["data_written"].tolist(),
+        "_pre_written_csv": feat["precond"].tolist(),
+        "_exp_hits": hits,
+        "_exp_penalty": [penalty_for_hits(h) for h in hits],
+        "_actions_join": [""] * len(hits), "_expected_join": [""] * len(hits), "_data_join": [""] * len(hits),
+    }
+
+def _score_columns(df: pd.DataFrame, cols, parsed, debug: bool):
+    """Kolon bazlı skorlama çekirdeği → CompactResults (debug ise + debug kolonları sözlüğü)."""
+    feat, steps = _extract_features(df, cols, parsed)
+    compact = score_features(feat, df.index)
+    if not debug:
+        return compact
+    inverse, decisions = _feature_decisions(feat, debug=True)
+    return compact, _debug_columns(steps, [decisions[i] for i in inverse], feat["precond"])
+
+def _debug_columns(steps: list, decisions: list, precond) -> dict:
+    """choose_table(debug=True) kararlarından debug kolonları (score_one debug alanlarının aynısı)."""
+    exp_style = [expected_style_penalty(ps.expected) for ps in steps]
+    return {
+        "_data_sigs": [", ".join(sorted(d[3])) or "-" for d in decisions],
+        "_pre_sigs": [", ".join(sorted(d[4])) or "-" for d in decisions],
+        "_data_needed": [d[5] for d in decisions],
+        "_pre_needed": [d[6] for d in decisions],
+        "_data_strong": [d[7] for d in decisions],
+        "_data_written": [ps.data_written for ps in steps],
+        "_pre_written_csv": [bool(v) for v in precond],
+        "_exp_hits": [h for h, _ in exp_style],
+        "_exp_penalty": [p for _, p in exp_style],
+        "_actions_join": [" ⏵ ".join(ps.actions)[:1200] for ps in steps],
+        "_expected_join": [" ⏵ ".join(ps.expected)[:1200] for ps in steps],
+        "_data_join": [" ⏵ ".join(ps.data)[:1200] for ps in steps],
+    }
+
+DEBUG_DETAIL_COLS = DEBUG_COLS + ["_actions_join", "_expected_join", "_data_join"]
+
+def debug_frame(df: pd.DataFrame, df_cols=None, parsed=None) -> pd.DataFrame:
+    """Yalnızca debug kolonları (df indeksiyle); score_frame(debug=True) içindeki değerlerin aynısı.
+    Puanlama yapılmaz — istenen satırlar için sinyal/karar açıklamalarını sonradan üretmek içindir."""
+    if len(df) == 0:
+        return pd.DataFrame(columns=DEBUG_DETAIL_COLS)
+    cols = df.columns if df_cols is None else df_cols
+    ft = _frame_texts(df, cols, parsed)
+    precond = _precond_filled(ft, df.index).to_numpy(dtype=bool)
+    decisions = []
+    for i, ps in enumerate(ft["steps"]):
+        sig = scan_row(ft["summaries"][i], ps.actions, ps.expected, ft["pre_texts"][i], ft["labels_texts"][i])
+        decisions.append(choose_table(ft["summaries"][i], ps.actions, ps.expected, ft["pre_texts"][i],
+                                      data_written=ps.data_written, pre_written_csv=bool(precond[i]),
+                                      debug=True, signals=sig))
+    cols_out = _debug_columns(ft["steps"], decisions, precond)
+    return pd.DataFrame({c: cols_out[c] for c in DEBUG_DETAIL_COLS}, index=df.index)
+
+def feature_frame(df: pd.DataFrame, df_cols=None, parsed=None) -> pd.DataFrame:
+    """Satır özellikleri (df indeksiyle): Key, Summary + FEATURE_COLS tipli kolonları."""
+    if len(df) == 0:
+        return pd.DataFrame({"Key": pd.Series(dtype=object), "Summary": pd.Series(dtype=object),
+                             **{c: pd.Series(dtype=t) for c, t in FEATURE_COLS.items()}})
+    feat, _ = _extract_features(df, df.columns if df_cols is None else df_cols, parsed)
+    return pd.DataFrame({"Key": pd.Series(feat["keys"], index=df.index, dtype=object),
+                         "Summary": pd.Series(feat["summaries"], index=df.index, dtype=object),
+                         **{c: feat[c] for c in FEATURE_COLS}}, index=df.index)
+
+def _feature_dict(frame: pd.DataFrame) -> dict:
+    return {"keys": frame["Key"].tolist(), "summaries": frame["Summary"].tolist(),
+            **{c: frame[c].to_numpy(dtype=t) for c, t in FEATURE_COLS.items()}}
+
+def score_feature_frame(frame: pd.DataFrame, debug: bool=False) -> pd.DataFrame:
+    """feature_frame çıktısından skorlama; score_frame ile aynı kolonlar ve değerler, indeks korunur."""
+    if len(frame) == 0:
+        return pd.DataFrame(columns=["Key", "Summary", "Tablo", "Toplam Puan", "Açıklama", "_type"])
+    feat = _feature_dict(frame)
+    return score_features(feat, frame.index).to_frame(feature_debug_columns(feat) if debug else None)
+
+def score_features_compact(frame: pd.DataFrame) -> "CompactResults":
+    """feature_frame çıktısından CompactResults (açıklama metinleri üretilmeden; özet / kural denemesi için)."""
+    return score_features(_feature_dict(frame), frame.index) if len(frame) else CompactResults.empty()
+
+def feature_tables(frame: pd.DataFrame) -> pd.Series:
+    """Özelliklerden yalnızca tablo kararı (predict_tables karşılığı)."""
+    if len(frame) == 0:
+        return pd.Series([], index=frame.index, dtype=object)
+    inverse, decisions = _feature_decisions(_feature_dict(frame))
+    return pd.Series([decisions[i][0] for i in inverse], index=frame.index, dtype=object)
+
+def score_compact(df: pd.DataFrame, df_cols=None, parsed=None) -> "CompactResults":
+    """score_frame'in sıkıştırılmış karşılığı (debug kolonsuz); metinler yalnızca to_frame()'de açılır."""
+    if len(df) == 0:
+        return CompactResults.empty()
+    return _score_columns(df, df.columns if df_cols is None else df_cols, parsed, debug=False)
+
+def score_frame(df: pd.DataFrame, df_cols=None, debug: bool=False, parsed=None) -> pd.DataFrame:
+    """Tüm satırları kolon bazlı skorlar; score_one ile birebir aynı sonuç, indeks korunur.
+    `parsed`: df'yi kapsayan ParsedSteps serisi (önbellekten)."""
+    if len(df) == 0:
+        return pd.DataFrame(columns=["Key", "Summary", "Tablo", "Toplam Puan", "Açıklama", "_type"])
+    out = _score_columns(df, df.columns if df_cols is None else df_cols, parsed, debug)
+    if not debug:
+        return out.to_frame()
+    compact, extra = out
+    return compact.to_frame(extra)
+
+def input_columns(df_cols) -> list:
+    """score_one'ın okuduğu kolonlar (şema çözümü bu alt kümede de aynı sonucu verir)."""
+    wanted = set(KEY_COLS + ['Summary', 'Issue Summary', 'Title', 'Priority'] + STEPS_COLS + PRECOND_EXACT_COLS)
+    return [c for c in df_cols if c in wanted or c.lower().startswith("labels")]
+
+def merge_results(parts, debug: bool=False) -> pd.DataFrame:
+    """Parça sonuçlarını sırayla birleştirir; kolon sırası tek seferde skorlanmış gibi olur."""
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return pd.DataFrame(columns=["Key", "Summary", "Tablo", "Toplam Puan", "Açıklama", "_type"])
+    merged = pd.concat(parts) if len(parts) > 1 else parts[0]
+    return merged[_result_column_order(merged["Tablo"].tolist(), debug)]
+
+def result_records(results: pd.DataFrame) -> list:
+    """Sonuç çerçevesini satır dict'lerine çevirir (score_one çıktısı biçiminde: pasif kriter anahtarı yok)."""
+    records = []
+    for rec in results.to_dict("records"):
+        for c in CRITERIA:
+            if c in rec:
+                v = rec[c]
+                if v is None or v != v: del rec[c]
+                else: rec[c] = int(v)
+        records.append(rec)
+    return records
+
+def results_from_records(records: list, index, debug: bool=False) -> pd.DataFrame:
+    """result_records'un tersi; score_frame ile aynı kolon sırası ve tipleri."""
+    if not records:
+        return pd.DataFrame(columns=["Key", "Summary", "Tablo", "Toplam Puan", "Açıklama", "_type"])
+    order = _result_column_order([r["Tablo"] for r in records], debug)
+    return pd.DataFrame({c: [r.get(c, np.nan) for r in records] for c in order}, index=index)
+
+def score_frame_rowwise(df: pd.DataFrame, df_cols=None, debug: bool=False) -> pd.DataFrame:
+    """Referans yol: her satırı score_one ile skorlar (score_frame doğrulaması için)."""
+    cols = df.columns if df_cols is None else df_cols
+    if len(df) == 0:
+        return pd.DataFrame(columns=["Key", "Summary", "Tablo", "Toplam Puan", "Açıklama", "_type"])
+    return df.apply(lambda r: score_one(r, cols, debug=debug), axis=1, result_type='expand')
+
+def finalize_results(results: pd.DataFrame, source: pd.DataFrame) -> pd.DataFrame:
+    """Maks Puan, Skor %, Prefix ve Automation (çoklu dosyada Kaynak) kolonlarını ekler (yerinde)."""
+    results["Maks Puan"] = results["Tablo"].map(MAX_BY_TABLE).fillna(100)
+    results["Skor %"] = (results["Toplam Puan"] / results["Maks Puan"]).clip(0, 1) * 100
+    results["Skor %"] = results["Skor %"].round(1)
+    results["Prefix"] = results["Key"].str.extract(r'^([^\-\s]+)')
+    results["Automation"] = source.loc[results.index, "_Automation"].values
+    if "_Source" in source.columns:
+        results["Kaynak"] = source.loc[results.index, "_Source"].values
+    return results
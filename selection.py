@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — en düşük / en yüksek K seçimi
+# - Sıralama: (Toplam Puan, Skor %, Key) artan → en düşük; (-Toplam, -Skor %, Key) → en yüksek;
+#   tam eşitlikte geliş sırası (kararlı sort_values(...).head(K) ile aynı sonuç)
+# - Tam çerçeve veya parça parça (akış) beslenir; bellekte yalnızca 2×K satır kalır
+# - Her parçada adaylar np.partition eşiğiyle O(n) ön seçilir, sınırlı yığınlara girer
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+ORDER = ["Toplam Puan", "Skor %", "Key"]
+
+class _Rev:
+    """heapq (min-heap) üzerinde 'en büyüğü at' için ters sıralı sarmalayıcı."""
+    __slots__ = ("key", "label", "row")
+    def __init__(self, key, label, row): self.key, self.label, self.row = key, label, row
+    def __lt__(self, other): return self.key > other.key
+
+def _candidates(values: np.ndarray, k: int) -> np.ndarray:
+    """K. en küçük değere eşit/küçük tüm konumlar (eşitlikler dahil, konum sırasıyla)."""
+    if len(values) <= k:
+        return np.arange(len(values))
+    thr = np.partition(values, k - 1)[k - 1]
+    return np.flatnonzero(values <= thr)
+
+class ExtremeK:
+    """Skor sonuçlarından en düşük ve en yüksek K satırı tek geçişte tutar."""
+
+    def __init__(self, k: int=5):
+        self.k = k
+        self._seq = 0
+        self._bottom = []
+        self._top = []
+
+    def _push(self, heap, item):
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item.key < heap[0].key:
+            heapq.heapreplace(heap, item)
+
+    def update(self, results: pd.DataFrame):
+        """Bir sonuç parçasını ekler (en az ORDER kolonları; Skor % finalize_results'tan)."""
+        n = len(results)
+        if n and self.k > 0:
+            pts = results["Toplam Puan"].to_numpy(dtype=float)
+            for heap, sign in ((self._bottom, 1), (self._top, -1)):
+                cand = _candidates(sign * pts, self.k)
+                sub = results.iloc[cand]
+                if len(sub) > self.k:   # eşitlik kümesi büyükse kalan anahtarlarla kırp
+                    sub = sub.assign(_pos=cand).sort_values(
+                        ORDER, ascending=[sign > 0, sign > 0, True], kind="stable").head(self.k)
+                    cand = sub.pop("_pos").to_numpy()
+                for pos, label, row in zip(cand, sub.index, sub.to_dict("records")):
+                    key = (sign * row["Toplam Puan"], sign * row["Skor %"], row["Key"], self._seq + int(pos))
+                    self._push(heap, _Rev(key, label, row))
+        self._seq += n
+
+    def _frame(self, heap) -> pd.DataFrame:
+        items = sorted(heap, key=lambda it: it.key)
+        return pd.DataFrame([it.row for it in items], index=[it.label for it in items])
+
+    def bottom(self) -> pd.DataFrame:
+        return self._frame(self._bottom)
+
+    def top(self) -> pd.DataFrame:
+        return self._frame(self._top)
+
+def extremes(results: pd.DataFrame, k: int=5):
+    """(en düşük K, en yüksek K) — sort_values(ORDER).head(K) eşdeğeri, tam sıralama olmadan."""
+    sel = ExtremeK(k)
+    sel.update(results)
+    return sel.bottom(), sel.top()
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — yerel HTTP/JSON skorlama servisi (CI / pipeline entegrasyonu)
+# - Süreç bir kez başlar: kurallar (derlenmiş desenler, sinyal tarayıcı, metin kuralı önbellekleri) bellekte
+#   sıcak kalır; Streamlit import edilmez, istek başına script başlatma maliyeti yok
+# - Girdi score_one'ın okuduğu kolon şeması: case başına {"Issue key": ..., "Summary": ...,
+#   "Custom field (Manual Test Steps)": "[...]", ...}; tek case, liste ya da {"cases": [...]}
+# - İstekler içeride mikro toplulara birleştirilir (en fazla --max-batch case / --max-wait-ms bekleme);
+#   aynı kolon şemalı büyük gruplar tek kolon bazlı çağrıyla, küçükler score_one ile skorlanır (sonuç aynı)
+# - Yanıt: case başına Tablo, Toplam / Maks Puan, Skor %, kriter puanları ve notları, Açıklama, Tip
+# - Yalnızca standart kütüphane (http.server); varsayılan adres 127.0.0.1
+#
+# Kullanım:
+#   python service.py --port 8765
+#   curl -s localhost:8765/score -d '{"Issue key": "QB-1", "Summary": "Login ekranı", "Priority": "High"}'
+#   curl -s localhost:8765/health      # kural parmak izi, toplu ayarları
+#   curl -s localhost:8765/stats       # istek / case sayısı, gecikme yüzdelikleri (ms)
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from scoring import CRITERIA, MAX_BY_TABLE, rules_fingerprint, score_compact, score_one
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 0.0   # 0: bekleme yok; skorlama sürerken kuyruğa düşen istekler zaten birlikte alınır
+MAX_BODY_BYTES = 64 << 20
+LATENCY_WINDOW = 10_000   # /stats yüzdelikleri son bu kadar istekten
+ROWWISE_MAX = 256         # bu kadar case'e kadar score_one (kolon yolunun çağrı başına ~5-10 ms sabit maliyeti var)
+
+WARMUP_CASE = {
+    "Issue key": "WARM-1", "Summary": "Kullanıcı giriş ekranında doğrulama", "Priority": "High",
+    "Labels": "web",
+    "Custom field (Manual Test Steps)": json.dumps([{"fields": {
+        "Action": "Kullanıcı adı ve şifre girilir, ardından giriş butonuna tıklanır",
+        "Data": "user=test", "Expected Result": "Ana sayfa açılmalı"}}], ensure_ascii=False),
+    "Custom field (Tests association with a Pre-Condition)": "PRE-1",
+}
+
+def _case_frame(cases: list, cols: tuple) -> pd.DataFrame:
+    """Aynı kolon şemalı case'ler → nesne tipli çerçeve (değerler JSON'daki gibi; tip çıkarımı yok).
+    Satır sayısı kolonlardan bağımsız: kolonsuz case'ler ({}) de birer satırdır."""
+    index = pd.RangeIndex(len(cases))
+    return pd.DataFrame({c: pd.Series([case.get(c) for case in cases], index=index, dtype=object) for c in cols},
+                        index=index)
+
+def _response(key, summary, table: str, total: int, pts: dict, notes: dict, tip: str) -> dict:
+    max_pts = MAX_BY_TABLE[table]
+    return {
+        "Key": key, "Summary": summary, "Tablo": table,
+        "Toplam Puan": int(total), "Maks Puan": max_pts,
+        "Skor %": float(np.round(np.clip(total / max_pts, 0, 1) * 100, 1)),   # finalize_results ile aynı
+        "Kriterler": pts, "Notlar": notes, "Açıklama": " | ".join(notes.values()), "_type": tip,
+    }
+
+def _row_result(case: dict) -> dict:
+    """Tek case → score_one (çerçeve kurulmaz; score_one satırı yalnızca .get ile okur)."""
+    res = score_one(case, tuple(case))
+    ks = [c for c in CRITERIA if c in res]
+    notes = res["Açıklama"].split(" | ") if ks else []   # not şablonlarında " | " geçmez; aktif kriter sırasıyla
+    return _response(res["Key"], res["Summary"], res["Tablo"], res["Toplam Puan"],
+                     {c: int(res[c]) for c in ks}, dict(zip(ks, notes)), res["_type"])
+
+def _case_results(compact) -> list:
+    """CompactResults → case başına yanıt sözlükleri (yalnızca tablonun aktif kriterleri)."""
+    notes = [compact.criterion_notes(k) for k in range(len(CRITERIA))]
+    active, total = compact.active, compact.total
+    out = []
+    for i, (table, tip) in enumerate(zip(compact.table_labels, compact.type_labels)):
+        ks = [k for k in range(len(CRITERIA)) if active[i, k]]
+        out.append(_response(compact.keys[i], compact.summaries[i], table, total[i],
+                             {CRITERIA[k]: int(compact.points[i, k]) for k in ks},
+                             {CRITERIA[k]: notes[k][i] for k in ks}, tip))
+    return out
+
+def score_cases(cases: list) -> list:
+    """Case sözlüklerini skorlar (girdi sırasıyla); her kolon şeması kendi grubunda tek çağrıyla
+    (küçük gruplar satır bazlı). Sonuç case tek başına score_one ile skorlanmış gibidir."""
+    groups = {}
+    for i, case in enumerate(cases):
+        groups.setdefault(tuple(case), []).append(i)
+    out = [None] * len(cases)
+    for cols, idx in groups.items():
+        if len(idx) <= ROWWISE_MAX:
+            for i in idx:
+                out[i] = _row_result(cases[i])
+            continue
+        results = _case_results(score_compact(_case_frame([cases[i] for i in idx], cols)))
+        if len(results) != len(idx):
+            raise RuntimeError(f"Kolon bazlı skorlama {len(idx)} case için {len(results)} sonuç döndü")
+        for i, res in zip(idx, results):
+            out[i] = res
+    return out
+
+def validate_cases(payload) -> list:
+    """İstek gövdesi → case listesi; geçersizse ValueError."""
+    cases = payload.get("cases") if isinstance(payload, dict) and "cases" in payload else payload
+    if isinstance(cases, dict):
+        cases = [cases]
+    if not isinstance(cases, list):
+        raise ValueError("Gövde bir case nesnesi, case listesi ya da {\"cases\": [...]} olmalı")
+    for i, case in enumerate(cases):
+        if not isinstance(case, dict):
+            raise ValueError(f"{i}. case bir JSON nesnesi değil")
+        if not all(isinstance(k, str) for k in case):
+            raise ValueError(f"{i}. case kolon adları metin olmalı")
+    return cases
+
+class MicroBatcher:
+    """Eşzamanlı isteklerin case'lerini tek skorlama iş parçacığında toplu işler.
+    Skorlama sürerken kuyruğa düşen istekler bir sonraki toplulukta birlikte alınır; `max_wait` > 0 ise ilk
+    istekten sonra en fazla o kadar (ya da `max_batch` case dolana kadar) diğerleri de beklenir."""
+
+    def __init__(self, max_batch: int=DEFAULT_MAX_BATCH, max_wait: float=DEFAULT_MAX_WAIT_MS / 1000):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="scoring-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, cases: list) -> Future:
+        fut = Future()
+        self._queue.put((cases, fut))
+        return fut
+
+    def score(self, cases: list, timeout: float=None) -> list:
+        return self.submit(cases).result(timeout)
+
+    def _collect(self) -> list:
+        items = [self._queue.get()]
+        n = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while n < self.max_batch:
+            left = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=left) if left > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            n += len(item[0])
+        return items
+
+    def _loop(self):
+        while True:
+            items = self._collect()
+            cases = [c for batch, _ in items for c in batch]
+            try:
+                results = score_cases(cases)
+            except Exception as e:
+                if len(items) == 1:
+                    items[0][1].set_exception(e)
+                    continue
+                # Topluluktaki hatalı istek diğerlerini düşürmesin: istekler tek tek yeniden denenir
+                for batch, fut in items:
+                    try:
+                        fut.set_result(score_cases(batch))
+                    except Exception as one:
+                        fut.set_exception(one)
+                continue
+            self.batches += 1
+            pos = 0
+            for batch, fut in items:
+                fut.set_result(results[pos:pos + len(batch)])
+                pos += len(batch)
+
+class ServiceStats:
+    """İstek / case sayaçları ve son LATENCY_WINDOW isteğin gecikmesi (case başına ms dahil)."""
+
+    def __init__(self):
+        self.requests = 0
+        self.cases = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._req_ms = deque(maxlen=LATENCY_WINDOW)
+        self._case_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, n_cases: int, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            self.requests += 1
+            self.cases += n_cases
+            self._req_ms.append(ms)
+            self._case_ms.append(ms / max(1, n_cases))
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            req, per_case = np.array(self._req_ms), np.array(self._case_ms)
+            out = {"requests": self.requests, "cases": self.cases, "errors": self.errors}
+        for name, arr in (("request_ms", req), ("case_ms", per_case)):
+            out[name] = ({f"p{q}": round(float(np.percentile(arr, q)), 3) for q in (50, 90, 99)}
+                         if len(arr) else {})
+        return out
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    server_version = "TestCaseEvaluator/1"
+    protocol_version = "HTTP/1.1"   # keep-alive: CI istemcisi bağlantıyı yeniden kullanabilir
+    disable_nagle_algorithm = True  # başlık + gövde ayrı yazılıyor; Nagle/gecikmeli ACK yanıtı ~40 ms bekletirdi
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "rules": self.server.rules, "max_batch": self.server.batcher.max_batch,
+                             "max_wait_ms": self.server.batcher.max_wait * 1000})
+        elif self.path == "/stats":
+            self._send(200, {**self.server.stats.to_dict(), "batches": self.server.batcher.batches})
+        else:
+            self._send(404, {"error": f"Bilinmeyen yol: {self.path}"})
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/score":
+            self._send(404, {"error": f"Bilinmeyen yol: {self.path}"})
+            return
+        t0 = time.perf_counter()
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.server.stats.error()
+            self.close_connection = True
+            self._send(413, {"error": f"Gövde çok büyük (en fazla {MAX_BODY_BYTES} bayt)"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+            cases = validate_cases(payload)
+        except ValueError as e:   # JSONDecodeError da ValueError
+            self.server.stats.error()
+            self._send(400, {"error": str(e)})
+            return
+        try:
+            results = self.server.batcher.score(cases) if cases else []
+        except Exception as e:
+            self.server.stats.error()
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self.server.stats.record(len(cases), time.perf_counter() - t0)
+        single = isinstance(payload, dict) and "cases" not in payload
+        self._send(200, results[0] if single else {"results": results, "rules": self.server.rules})
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, max_batch: int=DEFAULT_MAX_BATCH, max_wait_ms: float=DEFAULT_MAX_WAIT_MS,
+                 verbose: bool=False):
+        super().__init__(address, ScoringHandler)
+        self.verbose = verbose
+        self.rules = rules_fingerprint()
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(max_batch, max_wait_ms / 1000)
+        warm_up()
+
+def warm_up(rounds: int=3):
+    """İlk isteğin tembel başlatma maliyetlerini (desen derleme, numpy/pandas yolları) önceden öder."""
+    cases = [WARMUP_CASE, {**WARMUP_CASE, "Issue key": "WARM-2", "Priority": ""}]
+    for _ in range(rounds):
+        score_cases(cases)                                      # satır bazlı yol
+        score_cases(cases * (ROWWISE_MAX // 2 + 1))             # kolon bazlı yol
+
+def serve(host: str="127.0.0.1", port: int=DEFAULT_PORT, **kwargs) -> ScoringServer:
+    """Sunucuyu kurar (port 0 → boş port, server.server_address'ten okunur); serve_forever çağırana ait."""
+    return ScoringServer((host, port), **kwargs)
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Test case skorlama için yerel HTTP/JSON servisi.")
+    p.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan yalnızca yerel)")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="Toplu skorlamada en fazla case")
+    p.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                   help="Topluluk için diğer istekleri bekleme süresi (ms; 0: yalnızca kuyrukta bekleyenler)")
+    p.add_argument("--verbose", action="store_true", help="İstekleri logla")
+    return p
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    server = serve(args.host, args.port, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms,
+                   verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"🚀 Skorlama servisi http://{host}:{port} (kurallar {server.rules})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
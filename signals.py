@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — derlenmiş sinyal tarayıcı
+# - Data / Precondition / Test tipi sinyallerinin TÜM desenleri bir kez derlenir
+# - Her metin parçası (summary, action, expected, pre, labels) tek geçişte taranır,
+#   sonuç bit maskesi olarak önbelleğe alınır; satır sinyalleri maskelerin OR'udur
+# - scoring.py'deki eski (satır metnini birleştirip her deseni ayrı arayan)
+#   davranışla birebir aynıdır; reference_* fonksiyonları doğrulama içindir
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+_I = re.IGNORECASE
+
+def _ordered(rx_a, rx_b):
+    """`A.*B` (aynı satırda A'dan sonra B) — geri izlemesiz eşdeğeri."""
+    def test(t: str) -> bool:
+        pos = 0
+        while True:
+            a = rx_a.search(t, pos)
+            if not a: return False
+            b = rx_b.search(t, a.end())
+            if not b: return False
+            nl = t.find("\n", a.end(), b.start())
+            if nl == -1: return True
+            pos = nl + 1
+    test.patterns = (rx_a.pattern, rx_b.pattern)
+    return test
+
+def _search(rx):
+    test = lambda t: rx.search(t) is not None
+    test.patterns = (rx.pattern,)
+    return test
+
+# (ad, test) — listedeki sıra bit sırasıdır
+_SIGNAL_DEFS = [
+    # Precondition (re.I)
+    ("pre:phrase",  _search(re.compile(r'\b(pre[- ]?condition|ön\s*koşul|ön\s*şart)\b', _I))),
+    ("pre:must",    _ordered(re.compile(r'\b(gerek(ir|li)|zorunlu|olmalı|required|must|should)\b', _I),
+                             re.compile(r'\b(login|auth|role|permission|config|seed|setup)\b', _I))),
+    ("pre:login",   _search(re.compile(r'\b(logged in|login|giriş yap(mış|ın)|authenticated|auth|session)\b', _I))),
+    ("pre:sub",     _ordered(re.compile(r'\b(subscription|abonelik)\b', _I),
+                             re.compile(r'\b(aktif|var|existing)\b', _I))),
+    ("pre:user",    _search(re.compile(r'\bexisting user|mevcut kullanıcı|mevcut hesap\b', _I))),
+    ("pre:env",     _search(re.compile(r'\b(seed|setup|config(ure)?|feature flag|whitelist|allowlist|role|permission|yetki)\b', _I))),
+    # Data (re.I)
+    ("data:json",   _search(re.compile(r'\b(json|payload|body|request|response|headers|content-type)\b', _I))),
+    ("data:method", _search(re.compile(r'\b(post|put|patch|get|delete)\b', _I))),
+    ("data:path",   _search(re.compile(r'\b(/[\w\-/]+)\b', _I))),
+    ("data:sql",    _search(re.compile(r'\bselect|insert|update|delete\b', _I))),
+    ("data:ui",     _search(re.compile(r'\b(tıklanır|buton|button|ekran|modal|form|textfield|input|dropdown|seçilir|yazılır|girilir)\b', _I))),
+    ("data:ph",     _search(re.compile(r'\bplaceholder\b', _I))),
+    ("data:id",     _search(re.compile(r'\b(msisdn|token|iban|imei|email|username|password|user[_\\-]?id|subscriber)\b', _I))),
+    # Test tipi (bayraksız)
+    ("be:backend",  _search(re.compile(r'\bbackend\b'))),
+    ("be:api",      _search(re.compile(r'\bapi\b'))),
+    ("be:json",     _search(re.compile(r'\b(json|payload|request|response|headers)\b'))),
+    ("be:method",   _search(re.compile(r'\b(get|post|put|patch|delete)\b'))),
+    ("be:path",     _search(re.compile(r'/[\w\-/]+'))),
+    ("be:sql",      _search(re.compile(r'\bselect|insert|update|delete\b'))),
+    ("ui:ui",       _search(re.compile(r'\bui\b'))),
+    ("ui:button",   _search(re.compile(r'\bbuton|button|tıklanır|ekran|modal|form\b'))),
+    ("ui:input",    _search(re.compile(r'\btextfield|input|dropdown|seçilir|yazılır|girilir\b'))),
+    ("ui:client",   _search(re.compile(r'\bandroid|ios|web|chrome|safari|firefox|edge\b'))),
+    # "ön" + boşluk parça sınırını aşabilir (ön\s*koşul) → birleşik metinde yeniden denenir
+    ("hint:on",     lambda t: "ön" in t),
+]
+
+def rule_patterns() -> list:
+    """Kural parmak izi için sinyal adları + desen kaynakları (sıra dahil)."""
+    return [f"{name}:{'|'.join(getattr(test, 'patterns', ()))}" for name, test in _SIGNAL_DEFS]
+
+_BIT = {name: 1 << i for i, (name, _) in enumerate(_SIGNAL_DEFS)}
+# Önbellek ıskası başına en az bu kadar regex değerlendirilir (profil sayacı için)
+PATTERNS_PER_SEGMENT = sum(len(getattr(test, "patterns", ())) for _, test in _SIGNAL_DEFS)
+
+_PRE_NAMES = [("pre:phrase", "Precondition ifadesi"), ("pre:must", "Zorunluluk ifadesi"),
+              ("pre:login", "Login/Auth"), ("pre:sub", "Abonelik aktif"),
+              ("pre:user", "Mevcut kullanıcı/hesap"), ("pre:env", "Ortam/Ayar/Yetki")]
+_DATA_NAMES = [("data:json", "JSON/HTTP"), ("data:sql", "SQL"), ("data:ui", "UI input"),
+               ("data:ph", "Placeholder"), ("data:id", "ID field")]
+# Sinyal etiketleri (data_signals / precond_signals çıktı sırası) — özellik bit maskeleri bu sırayla
+DATA_SIGNAL_LABELS = ["JSON/HTTP", "HTTP path", "SQL", "UI input", "Placeholder", "ID field"]
+PRE_SIGNAL_LABELS = [label for _, label in _PRE_NAMES]
+_BACKEND_BITS = [_BIT[n] for n in ("be:backend", "be:api", "be:json", "be:method", "be:path", "be:sql")]
+_UI_BITS = [_BIT[n] for n in ("ui:ui", "ui:button", "ui:input", "ui:client")]
+_PRE_PHRASE_RX = re.compile(r'\b(pre[- ]?condition|ön\s*koşul|ön\s*şart)\b', _I)
+
+@lru_cache(maxsize=1 << 16)
+def segment_bits(segment: str) -> int:
+    """Tek metin parçasının (küçük harfe çevrilmiş) sinyal bit maskesi."""
+    t = (segment or "").lower()
+    bits = 0
+    for name, test in _SIGNAL_DEFS:
+        if test(t): bits |= _BIT[name]
+    return bits
+
+def _segments_bits(segments) -> int:
+    bits = 0
+    for seg in segments:
+        bits |= segment_bits(seg)
+    return bits
+
+def _pre_phrase_across(segments, bits: int) -> bool:
+    # "ön" bir parçanın sonunda, "koşul/şart" sonrakinin başındaysa eşleşme sınırı aşar
+    if bits & _BIT["pre:phrase"]: return True
+    if not bits & _BIT["hint:on"]: return False
+    return _PRE_PHRASE_RX.search(" \n ".join(segments).lower()) is not None
+
+def data_signals(bits: int) -> list:
+    s = [label for name, label in _DATA_NAMES if bits & _BIT[name]]
+    if bits & _BIT["data:method"] and bits & _BIT["data:path"]:
+        s.insert(1, "HTTP path")
+    return s
+
+def precond_signals(bits: int, phrase: bool) -> list:
+    return [label for name, label in _PRE_NAMES
+            if (phrase if name == "pre:phrase" else bits & _BIT[name])]
+
+def test_type(bits: int, labels_text: str) -> str:
+    backend_hits = sum(1 for b in _BACKEND_BITS if bits & b)
+    ui_hits = sum(1 for b in _UI_BITS if bits & b)
+    if backend_hits > ui_hits and backend_hits >= 1: return "Backend"
+    if ui_hits > backend_hits and ui_hits >= 1: return "UI"
+    if "backend" in (labels_text or "").lower(): return "Backend"
+    return "—"
+
+# ---- Parça listesi bazlı API ----
+def scan_data(segments) -> list:
+    return data_signals(_segments_bits(segments))
+
+def scan_precond(segments) -> list:
+    bits = _segments_bits(segments)
+    return precond_signals(bits, _pre_phrase_across(segments, bits))
+
+def scan_test_type(segments, labels_text: str) -> str:
+    return test_type(_segments_bits(segments), labels_text)
+
+class RowSignals(NamedTuple):
+    data_sigs: list
+    pre_sigs: list
+    test_type: str
+
+def scan_row(summary: str, action_texts: list, expected_texts: list,
+             pre_assoc_text: str, labels_text: str) -> RowSignals:
+    """Bir satırın data, precondition ve test tipi sinyallerini tek seferde üretir."""
+    s_bits = segment_bits(summary)
+    a_bits = _segments_bits(action_texts)
+    e_bits = _segments_bits(expected_texts)
+    p_bits = segment_bits(pre_assoc_text or "")
+    l_bits = segment_bits(labels_text or "")
+
+    pre_bits = s_bits | a_bits | p_bits
+    phrase = _pre_phrase_across([summary] + action_texts + [pre_assoc_text or ""], pre_bits)
+    return RowSignals(
+        data_signals(s_bits | a_bits | e_bits),
+        precond_signals(pre_bits, phrase),
+        test_type(s_bits | l_bits | a_bits | e_bits, labels_text),
+    )
+
+# ---------- Referans (eski) uygulama — regresyon doğrulaması ----------
+def _match(pattern, text): return re.search(pattern, text or "", re.IGNORECASE)
+
+def reference_precond_signals(text: str):
+    t = (text or "").lower()
+    s = []
+    if _match(r'\b(pre[- ]?condition|ön\s*koşul|ön\s*şart)\b', t): s.append("Precondition ifadesi")
+    if _match(r'\b(gerek(ir|li)|zorunlu|olmalı|required|must|should)\b.*\b(login|auth|role|permission|config|seed|setup)\b', t): s.append("Zorunluluk ifadesi")
+    if _match(r'\b(logged in|login|giriş yap(mış|ın)|authenticated|auth|session)\b', t): s.append("Login/Auth")
+    if _match(r'\b(subscription|abonelik)\b.*\b(aktif|var|existing)\b', t): s.append("Abonelik aktif")
+    if _match(r'\bexisting user|mevcut kullanıcı|mevcut hesap\b', t): s.append("Mevcut kullanıcı/hesap")
+    if _match(r'\b(seed|setup|config(ure)?|feature flag|whitelist|allowlist|role|permission|yetki)\b', t): s.append("Ortam/Ayar/Yetki")
+    return list(set(s))
+
+def reference_data_signals(text: str):
+    t = (text or "").lower()
+    s = []
+    if _match(r'\b(json|payload|body|request|response|headers|content-type)\b', t): s.append("JSON/HTTP")
+    if _match(r'\b(post|put|patch|get|delete)\b', t) and _match(r'\b(/[\w\-/]+)\b', t): s.append("HTTP path")
+    if _match(r'\bselect|insert|update|delete\b', t): s.append("SQL")
+    if _match(r'\b(tıklanır|buton|button|ekran|modal|form|textfield|input|dropdown|seçilir|yazılır|girilir)\b', t): s.append("UI input")
+    if _match(r'\bplaceholder\b', t): s.append("Placeholder")
+    if _match(r'\b(msisdn|token|iban|imei|email|username|password|user[_\\-]?id|subscriber)\b', t): s.append("ID field")
+    return list(set(s))
+
+def reference_test_type(summary: str, labels_text: str, action_texts: list, expected_texts: list) -> str:
+    s_all = " \n ".join([summary or "", labels_text or ""] + action_texts + expected_texts).lower()
+    backend_hits = 0
+    ui_hits = 0
+    for pat in [r'\bbackend\b', r'\bapi\b', r'\b(json|payload|request|response|headers)\b',
+                r'\b(get|post|put|patch|delete)\b', r'/[\w\-/]+', r'\bselect|insert|update|delete\b']:
+        if re.search(pat, s_all): backend_hits += 1
+    for pat in [r'\bui\b', r'\bbuton|button|tıklanır|ekran|modal|form\b',
+                r'\btextfield|input|dropdown|seçilir|yazılır|girilir\b',
+                r'\bandroid|ios|web|chrome|safari|firefox|edge\b']:
+        if re.search(pat, s_all): ui_hits += 1
+    if backend_hits > ui_hits and backend_hits >= 1: return "Backend"
+    if ui_hits > backend_hits and ui_hits >= 1: return "UI"
+    if "backend" in (labels_text or "").lower(): return "Backend"
+    return "—"
+
+def verify_row(summary: str, action_texts: list, expected_texts: list,
+               pre_assoc_text: str, labels_text: str) -> list:
+    """Derlenmiş tarayıcı ile referansı karşılaştırır; farklı olan alanların listesi (boşsa birebir)."""
+    got = scan_row(summary, action_texts, expected_texts, pre_assoc_text, labels_text)
+    diffs = []
+    ref_data = reference_data_signals(" \n ".join([summary] + action_texts + expected_texts))
+    ref_pre = reference_precond_signals(" \n ".join([summary] + action_texts + [pre_assoc_text or ""]))
+    if set(got.data_sigs) != set(ref_data): diffs.append("data_sigs")
+    if set(got.pre_sigs) != set(ref_pre): diffs.append("pre_sigs")
+    if got.test_type != reference_test_type(summary, labels_text, action_texts, expected_texts):
+        diffs.append("test_type")
+    return diffs
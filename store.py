@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — artımlı skor deposu (SQLite)
+# - Her satır, score_one'ın okuduğu alanların (Key, Summary, Priority, steps JSON,
+#   precondition ve Labels kolonları) içerik hash'i ile saklanır
+# - Yalnızca yeni/değişmiş satırlar skorlanır, diğerleri depodan okunur
+# - Kural seti parmak izi (rules_fingerprint) değişince depo otomatik boşaltılır
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from threading import Lock
+
+import pandas as pd
+
+from scoring import input_columns, result_records, results_from_records, rules_fingerprint, score_frame
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".score_store.sqlite")
+_SQL_BATCH = 500   # SQLite parametre sınırının altında kal
+
+def _is_missing(v) -> bool:
+    return v is None or (isinstance(v, float) and v != v) or v is pd.NA
+
+def row_hashes(df: pd.DataFrame, df_cols=None) -> list:
+    """Satır başına içerik hash'i (kolon adları dahil; eksik değer ile 'nan' metni ayrışır)."""
+    cols = input_columns(df.columns if df_cols is None else df_cols)
+    schema = "\x1e".join(str(c) for c in cols).encode("utf-8")
+    values = [df[c].tolist() if c in df.columns else [None] * len(df) for c in cols]
+    out = []
+    for row in zip(*values) if values else [()] * len(df):
+        h = hashlib.blake2b(schema, digest_size=16)
+        h.update("\x1f".join("\x00" if _is_missing(v) else str(v) for v in row).encode("utf-8", "surrogatepass"))
+        out.append(h.hexdigest())
+    return out
+
+class ScoreStore:
+    """row_hash → skor sonucu deposu; skorlama modu (debug) ayrı tutulur."""
+
+    def __init__(self, path: str=DEFAULT_STORE_PATH):
+        self.path = path
+        self.fingerprint = rules_fingerprint()
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS scores (
+                row_hash TEXT NOT NULL, debug INTEGER NOT NULL, issue_key TEXT,
+                result TEXT NOT NULL, scored_at TEXT NOT NULL,
+                PRIMARY KEY (row_hash, debug)
+            );
+            CREATE INDEX IF NOT EXISTS scores_key ON scores (issue_key);
+        """)
+        self._check_rules()
+
+    def _check_rules(self):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE name='rules'").fetchone()
+            if row is None or row[0] != self.fingerprint:
+                self._conn.execute("DELETE FROM scores")
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('rules', ?)", (self.fingerprint,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def lookup(self, hashes, debug: bool=False) -> dict:
+        hashes = list(hashes)
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), _SQL_BATCH):
+                part = hashes[i:i + _SQL_BATCH]
+                q = f"SELECT row_hash, result FROM scores WHERE debug=? AND row_hash IN ({','.join('?' * len(part))})"
+                found.update(self._conn.execute(q, [int(debug), *part]).fetchall())
+        return found
+
+    def save(self, hashes, records, debug: bool=False):
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(h, int(debug), r.get("Key"), json.dumps(r, ensure_ascii=False), now) for h, r in zip(hashes, records)]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)", rows)
+
+    def score(self, df: pd.DataFrame, df_cols=None, debug: bool=False, scorer=score_frame):
+        """(sonuçlar, depodan gelen satır sayısı) döner; sonuçlar scorer(df) ile birebir aynıdır."""
+        cols = df.columns if df_cols is None else df_cols
+        hashes = row_hashes(df, cols)
+        found = self.lookup(set(hashes), debug)
+        missing = [h not in found for h in hashes]
+        fresh = []
+        if any(missing):
+            fresh = result_records(scorer(df[missing], cols, debug=debug))
+            self.save([h for h, m in zip(hashes, missing) if m], fresh, debug)
+        it = iter(fresh)
+        records = [next(it) if m else json.loads(found[h]) for h, m in zip(hashes, missing)]
+        return results_from_records(records, df.index, debug), len(hashes) - sum(missing)
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — akış (chunk) modu
+# - Export parça parça okunur, her parça mevcut kurallarla (score_frame) skorlanır
+# - Bellekte yalnızca koşan özetler tutulur: A/B/C/D dağılımı, ortalama/min/max,
+#   prefix & otomasyon sayaçları, sınırlı en düşük/en yüksek K yığınları,
+#   birleştirilebilir analiz küpü (histogram, yüzdelik, kriter geçme oranı, kırılımlar — analytics.py)
+# - Detay sonuçlar parça parça diske yazılır (csv / csv.gz / parquet / arrow)
+# - Çoklu dosya: [(etiket, kaynak)] listesi sırayla akıtılır; sonuçlarda Kaynak kolonu
+# - İstenirse parçalar trend geçmişine (history.HistoryRun) Key başına skor olarak eklenir
+
+from collections import Counter
+
+import pandas as pd
+
+from analytics import ScoreAnalytics
+from export import ResultWriter
+from ingest import sniff_source
+from parallel import ScoringPool, resolve_workers
+from selection import ExtremeK
+from scoring import KEY_COLS, derive_columns, filter_frame, score_frame, finalize_results
+
+DEFAULT_CHUNKSIZE = 50_000
+
+def iter_export_chunks(src, chunksize: int=DEFAULT_CHUNKSIZE, sep: str=None):
+    """Export'u `chunksize` satırlık, türetilmiş kolonları eklenmiş parçalar halinde okur."""
+    with pd.read_csv(src, sep=sep or sniff_source(src), chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield derive_columns(chunk)
+
+def iter_source_chunks(sources, chunksize: int=DEFAULT_CHUNKSIZE, sep: str=None):
+    """[(etiket, kaynak)] dosyalarını sırayla parça parça okur; parçalar `_Source` kolonludur
+    ve yalnızca kendi dosyasının kolonlarını taşır (şema dosya başına çözülür)."""
+    for label, src in sources:
+        for chunk in iter_export_chunks(src, chunksize, sep):
+            chunk["_Source"] = label
+            yield chunk
+
+def scan_prefixes(src, chunksize: int=DEFAULT_CHUNKSIZE, sep: str=None) -> list:
+    """Yalnızca Key kolonunu okuyarak (prefix filtresi seçenekleri için) boş olmayan prefix'leri döner.
+    `src` [(etiket, kaynak)] listesi de olabilir (tüm dosyaların birleşimi)."""
+    prefixes = set()
+    for _, one in (src if isinstance(src, list) else [(None, src)]):
+        with pd.read_csv(one, sep=sep or sniff_source(one), chunksize=chunksize,
+                         usecols=lambda c: c in KEY_COLS) as reader:
+            for chunk in reader:
+                chunk = derive_columns(chunk)
+                if '_Prefix' in chunk.columns:
+                    prefixes.update(chunk['_Prefix'].tolist())
+    return sorted(p for p in prefixes if p)
+
+class RunningStats:
+    """Parça parça beslenen skor sonuçlarının özetini tutar."""
+
+    def __init__(self, k: int=5):
+        self.k = k
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.dist = Counter()
+        self.prefix_counts = Counter()
+        self.automation_counts = Counter()
+        self.source_counts = Counter()     # çoklu dosyada Kaynak başına skorlanan satır
+        self.source_rows = 0
+        self.reused = 0     # skor deposundan okunan satırlar
+        self.analytics = ScoreAnalytics()
+        self._extremes = ExtremeK(k)
+
+    def update(self, results: pd.DataFrame, source: pd.DataFrame=None):
+        """finalize_results uygulanmış bir sonuç parçasını ekler; `source` filtre sonrası kaynak parça."""
+        n = len(results)
+        if source is not None:
+            self.source_rows += len(source)
+            self.automation_counts.update(source["_Automation"].tolist())
+        if n == 0:
+            return
+        pts = results["Toplam Puan"]
+        self.count += n
+        self.total += int(pts.sum())
+        lo, hi = int(pts.min()), int(pts.max())
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+        self.dist.update(results["Tablo"].tolist())
+        self.prefix_counts.update(results["Prefix"].fillna("").tolist())
+        if "Kaynak" in results.columns:
+            self.source_counts.update(results["Kaynak"].tolist())
+        self._extremes.update(results)
+        if source is not None:
+            self.analytics.add_results(results, source)
+
+    @property
+    def avg(self) -> float:
+        return round(self.total / self.count, 1) if self.count else 0
+
+    def distribution(self) -> pd.Series:
+        return pd.Series({t: int(self.dist.get(t, 0)) for t in ["A", "B", "C", "D"]}, name="count")
+
+    def bottom(self) -> pd.DataFrame:
+        return self._extremes.bottom()
+
+    def top(self) -> pd.DataFrame:
+        return self._extremes.top()
+
+def stream_score(src, out_path=None, *, chunksize: int=DEFAULT_CHUNKSIZE, debug: bool=False,
+                 prefixes=None, automation: str="Tümü", k: int=5, sep: str=None,
+                 workers: int=1, store=None, out_format: str=None, progress=None, history=None) -> RunningStats:
+    """Export'u parça parça skorlar; sonuç kolonlarını `out_path`'e ekleyerek yazar (None ise yazmaz).
+    `src`: dosya yolu / dosya benzeri ya da çoklu dosya için [(etiket, kaynak)] listesi.
+    `out_format`: export.EXPORT_FORMATS'tan biri (None → uzantıdan, varsayılan csv).
+    `workers` != 1 ise her parça süreç havuzunda skorlanır (0 → tüm çekirdekler).
+    `store` (ScoreStore) verilirse yalnızca yeni/değişmiş satırlar skorlanır.
+    `progress(stats)` her parçadan sonra çağrılır (fırlattığı hata akışı durdurur).
+    `history` (history.HistoryRun) verilirse skorlanan parçalar çalıştırmaya eklenir (commit çağırana ait)."""
+    stats = RunningStats(k)
+    multi = isinstance(src, list)
+    writer = ResultWriter(out_path, out_format, debug, sources=multi) if out_path is not None else None
+    pool = ScoringPool(workers) if resolve_workers(workers) > 1 else None
+    chunks = iter_source_chunks(src, chunksize, sep) if multi else iter_export_chunks(src, chunksize, sep)
+    try:
+        for chunk in chunks:
+            chunk = filter_frame(chunk, prefixes, automation)
+            if len(chunk) == 0:
+                stats.update(chunk.iloc[0:0], chunk)
+                if progress: progress(stats)
+                continue
+            scorer = pool.score if pool else score_frame
+            if store is not None:
+                scored, reused = store.score(chunk, debug=debug, scorer=scorer)
+                stats.reused += reused
+            else:
+                scored = scorer(chunk, debug=debug)
+            results = finalize_results(scored, chunk)
+            if writer is not None:
+                writer.write(results)
+            if history is not None:
+                history.add(results, chunk)
+            stats.update(results, chunk)
+            if progress: progress(stats)
+    finally:
+        if pool: pool.close()
+        if writer is not None: writer.close()
+    return stats
@@ -6,14 +6,40 @@
 # - Automated alanına göre Otomasyon/Manuel ayrımı + filtre
 # - KPI, dağılım grafiği, detay kartları, CSV indirme
 # - ✅ En düşük 5 ve en yüksek 5 case detayları
+# - Detay kartları sayfalı (Key arama, case'e atlama)
 # - ✅ Hata yakalama & görünür durum mesajları
+# - Okuma & skorlama arka plan işinde: ilerleme / ETA, iptal, rerun'da kaldığı yerden devam
+# - Birden fazla CSV: tek raporda birleşir, Prefix'in yanında Kaynak (dosya) kolonu
+# - Skor analizi: histogram, yüzdelikler, kriter geçme oranları, Prefix / tip / otomasyon kırılımları;
+#   istenirse tüm popülasyon için (dosya başına bir kez hesaplanan küp, filtreler küpte uygulanır)
+# - Trend geçmişi: tüm dosya / akış çalıştırmaları yerel SQLite'a eklenir; prefix trendi, düşen Key'ler, tablo geçişleri
+# - Skorlama kuralları: scoring.py (UI'sız toplu çalıştırma: batch.py)
 
 import streamlit as st
 import pandas as pd
-import json
-import re
+import io
+import os
+import tempfile
 from datetime import datetime
 
+from scoring import (
+    MAX_BY_TABLE, score_frame, finalize_results, result_columns, parse_steps_frame, predict_tables, rules_fingerprint,
+)
+from analytics import DIM_LABELS, ScoreAnalytics
+from explain import LazyDebug
+from export import EXPORT_FORMATS, MIME_TYPES, convert_csv, write_results
+from filtering import FilterIndex, sample_positions, take
+from history import HistoryStore, run_key
+from ingest import content_hash
+from jobs import JOB_PART_ROWS, Job, analytics_job, ingest_job, ingest_many_job, score_job, stream_job
+from multifile import per_source, score_sources, source_labels, source_summary, sources_hash
+from parallel import DEFAULT_PARTITION_ROWS, ScoringPool
+from profiling import NULL_PROFILER, Profiler, current as current_profiler, profiling
+from sampling import category_codes, stratified_positions
+from selection import extremes
+from store import ScoreStore
+from streaming import scan_prefixes
+
 # ---------- Sayfa & Stil ----------
 st.set_page_config(page_title="Test Case SLA", layout="wide")
 
@@ -115,7 +141,27 @@ with st.expander("📌 Kurallar", expanded=False):
 
 # ---------- Sidebar ----------
 st.sidebar.header("⚙️ Ayarlar")
-sample_size = st.sidebar.slider("Kaç test case değerlendirilsin?", 1, 300, 5, help="Örnekleme sayısı")
+sample_size = st.sidebar.slider("Kaç test case değerlendirilsin?", 1, 5000, 5,
+                                help="Örnekleme sayısı (detay kartları sayfalı gösterilir)")
+score_all = st.sidebar.toggle("📚 Tüm dosyayı skorla (örnekleme yok)", value=False)
+population = st.sidebar.toggle("📊 Popülasyon analizi (tüm satırlar)", value=False,
+                               help="Skor analizi örneklem yerine dosyanın tüm satırlarından: dosya başına bir kez arka planda hesaplanır, filtre değişince yeniden taranmaz.")
+workers = st.sidebar.number_input("🧵 Paralel süreç sayısı", min_value=1, max_value=os.cpu_count() or 1, value=1,
+                                  help="Tüm dosya / akış modunda skorlama bu kadar süreçle yapılır (1: seri).")
+use_store = st.sidebar.toggle("💾 Artımlı skorlama (skor deposu)", value=False,
+                              help="Skorlar uygulama yanındaki SQLite deposunda saklanır; yalnızca yeni/değişen satırlar yeniden skorlanır. Kurallar değişince depo kendiliğinden boşalır.")
+record_history = st.sidebar.toggle("🗂 Trend geçmişi", value=False,
+                                   help="Tüm dosya / akış modundaki çalıştırmalar (Key başına skor + özet) yerel geçmiş deposuna eklenir; aynı dosya + filtre + kural seti bir kez. Önceki çalıştırmalarla karşılaştırma geçmişteki indekslerden yapılır.")
+stream_mode = st.sidebar.toggle("🌊 Akış modu (büyük dosya, düşük bellek)", value=False,
+                                help="CSV parça parça okunup tamamı skorlanır; yalnızca özet ve en düşük/yüksek 5 bellekte tutulur.")
+sample_mode = st.sidebar.selectbox("🎯 Örnekleme modu", ["Rastgele", "Katmanlı"], index=0,
+                                   help="Katmanlı: seçilen katmanların her birinden en az 1 case, kalan kota katman büyüklüğüyle orantılı.")
+STRATA_LABELS = {"Prefix": "prefix", "Çalıştırma tipi": "automation", "Tablo (tahmini)": "table"}
+strata_dims = []
+if sample_mode == "Katmanlı":
+    strata_dims = [STRATA_LABELS[x] for x in st.sidebar.multiselect(
+        "Katmanlar", list(STRATA_LABELS), default=["Prefix", "Çalıştırma tipi"],
+        help="Tablo (tahmini): skorlamadan önce yalnızca tablo kararı hesaplanır (dosya başına bir kez).")]
 fix_seed = st.sidebar.toggle("🔒 Fix seed (deterministik örnekleme)", value=False)
 show_debug = st.sidebar.toggle("🛠 Debug (sinyaller & kararlar)", value=False)
 if "reroll" not in st.session_state:
@@ -123,402 +169,105 @@ if "reroll" not in st.session_state:
 if st.sidebar.button("🎲 Yeniden örnekle"):
     st.session_state.reroll += 1
 
-uploaded = st.file_uploader("📤 CSV yükle (`;` ayraçlı)", type="csv")
-
-# ---------- Yardımcılar ----------
-def _text(x): return str(x or "")
-def _cell(x) -> str:
-    try:
-        if pd.isna(x): return ""
-    except Exception:
-        pass
-    return str(x or "")
-def _is_blank_after_strip(val: str) -> bool:
-    return len((val or "").strip()) == 0
-def _normalize_newlines(s: str) -> str:
-    return (s or "").replace("\r\n","\n").replace("\r","\n")
-def _cleanup_html(s: str) -> str:
-    s = _normalize_newlines(s or "")
-    s = re.sub(r'<br\s*/?>', '\n', s, flags=re.I)
-    s = re.sub(r'</?(p|div|li|tr|td|th|ul|ol|span|b|strong)>', '\n', s, flags=re.I)
-    s = re.sub(r'<[^>]+>', ' ', s)
-    return s
-def _is_meaningless(val: str) -> bool:
-    meaningless = {"", "-", "—", "none", "n/a", "na", "null", "yok"}
-    v = re.sub(r'\s+', ' ', (val or '')).strip().lower()
-    if v in meaningless: return True
-    if re.fullmatch(r'[\s\[\]\{\}\(\)\.,;:\-_/\\]*', v or ""): return True
-    return False
-def pick_first_existing(colnames, df_cols):
-    for name in colnames:
-        if name in df_cols: return name
-    return None
-
-# ✅ Key prefix çıkarıcı ( '-' öncesi )
-def _key_prefix(val: str) -> str:
-    v = _text(val)
-    m = re.match(r'^\s*([^\-\s]+)', v)
-    return m.group(1) if m else ""
-
-# ✅ Automated alanını yorumlayan yardımcı
-def _detect_automation(val: str) -> str:
-    """CSV'deki 'Automated' alanından 'Otomasyon' / 'Manuel' üretir."""
-    v = (str(val or "")).strip().lower()
-    automated_set = {
-        "yes", "true", "1", "android-automated", "ios-automated",
-        "automated", "auto", "automation", "android_automated", "ios_automated"
-    }
-    return "Otomasyon" if v in automated_set else "Manuel"
-
-# ---- Steps JSON parse & field extract ----
-def parse_steps(steps_cell):
-    """Return list of steps with normalized fields dicts, else []."""
-    steps = []
-    raw = steps_cell if isinstance(steps_cell, str) else ""
-    if not raw.strip():
-        return steps
-    txt = raw.strip()
-    try:
-        data = json.loads(txt)
-        if isinstance(data, list):
-            steps = data
-        else:
-            steps = []
-    except Exception:
-        try:
-            if txt.startswith('"') and txt.endswith('"'):
-                txt2 = txt[1:-1].replace('""','"')
-                data = json.loads(txt2)
-                if isinstance(data, list):
-                    steps = data
-        except Exception:
-            steps = []
-    norm = []
-    for s in steps:
-        fields = s.get("fields", {}) if isinstance(s, dict) else {}
-        if not isinstance(fields, dict): fields = {}
-        f2 = {}
-        for k in ["Action","Data","Expected Result","Expected","Attachments","Step","Adım"]:
-            v = fields.get(k, "")
-            if isinstance(v, str):
-                f2[k] = v
-        norm.append({"fields": f2})
-    return norm
-
-def get_action_blocks(steps_list):
-    out = []
-    for s in steps_list:
-        v = s.get("fields",{}).get("Action","")
-        if isinstance(v,str) and v.strip():
-            out.append(v.strip())
-    if not out:
-        for s in steps_list:
-            f = s.get("fields",{})
-            for alt in ("Adım","Step"):
-                v = f.get(alt,"")
-                if isinstance(v,str) and v.strip(): out.append(v.strip())
-    return out
-
-def get_data_blocks(steps_list):
-    out = []
-    for s in steps_list:
-        v = s.get("fields",{}).get("Data","")
-        if isinstance(v,str) and v.strip():
-            out.append(v.strip())
-    return out
-
-def get_expected_blocks(steps_list):
-    out = []
-    for s in steps_list:
-        f = s.get("fields",{})
-        v = f.get("Expected Result", f.get("Expected",""))
-        if isinstance(v,str) and v.strip():
-            out.append(v.strip())
-    return out
-
-def has_data_written_from_steps(steps_list) -> bool:
-    return any(not _is_meaningless(x) for x in get_data_blocks(steps_list))
-
-def has_expected_present_from_steps(steps_list) -> bool:
-    return any(not _is_meaningless(x) for x in get_expected_blocks(steps_list))
-
-# ---- PRECONDITION (CSV doluluğu) ----
-PRECOND_EXACT_COLS = [
-    "Custom field (Tests association with a Pre-Condition)",
-    "Custom field (Pre-Conditions association with a Test)",
-]
-def precondition_provided_from_csv(row, df_cols) -> bool:
-    for col in PRECOND_EXACT_COLS:
-        if col in df_cols:
-            if not _is_blank_after_strip(_cell(row.get(col))):
-                return True
-    return False
-def get_pre_assoc_text(row, df_cols) -> str:
-    texts = []
-    for col in PRECOND_EXACT_COLS:
-        if col in df_cols:
-            texts.append(_text(row.get(col)))
-    return "\n".join(texts)
-
-# ---- İçerik sinyalleri (ihtiyaç analizi) ----
-def _match(pattern, text): return re.search(pattern, text or "", re.IGNORECASE)
-
-def scan_precond_signals(text: str):
-    t = (text or "").lower()
-    s = []
-    if _match(r'\b(pre[- ]?condition|ön\s*koşul|ön\s*şart)\b', t): s.append("Precondition ifadesi")
-    if _match(r'\b(gerek(ir|li)|zorunlu|olmalı|required|must|should)\b.*\b(login|auth|role|permission|config|seed|setup)\b', t): s.append("Zorunluluk ifadesi")
-    if _match(r'\b(logged in|login|giriş yap(mış|ın)|authenticated|auth|session)\b', t): s.append("Login/Auth")
-    if _match(r'\b(subscription|abonelik)\b.*\b(aktif|var|existing)\b', t): s.append("Abonelik aktif")
-    if _match(r'\bexisting user|mevcut kullanıcı|mevcut hesap\b', t): s.append("Mevcut kullanıcı/hesap")
-    if _match(r'\b(seed|setup|config(ure)?|feature flag|whitelist|allowlist|role|permission|yetki)\b', t): s.append("Ortam/Ayar/Yetki")
-    return list(set(s))
-
-def scan_data_signals_from_text(text: str):
-    t = (text or "").lower()
-    s = []
-    if _match(r'\b(json|payload|body|request|response|headers|content-type)\b', t): s.append("JSON/HTTP")
-    if _match(r'\b(post|put|patch|get|delete)\b', t) and _match(r'\b(/[\w\-/]+)\b', t): s.append("HTTP path")
-    if _match(r'\bselect|insert|update|delete\b', t): s.append("SQL")
-    if _match(r'\b(tıklanır|buton|button|ekran|modal|form|textfield|input|dropdown|seçilir|yazılır|girilir)\b', t): s.append("UI input")
-    if _match(r'\bplaceholder\b', t): s.append("Placeholder")
-    if _match(r'\b(msisdn|token|iban|imei|email|username|password|user[_\\-]?id|subscriber)\b', t): s.append("ID field")
-    return list(set(s))
-
-def decide_data_needed(summary: str, action_texts: list, expected_texts: list):
-    combined = " \n ".join([summary] + action_texts + expected_texts)
-    ds = scan_data_signals_from_text(combined)
-    strong_combo = ("JSON/HTTP" in ds and ("HTTP path" in ds or "UI input" in ds)) or ("SQL" in ds and "ID field" in ds)
-    needed = strong_combo or len(ds) >= 2
-    return needed, ds, strong_combo
-
-def decide_precond_needed(summary: str, action_texts: list, pre_assoc_text: str):
-    combined = " \n ".join([summary] + action_texts + [pre_assoc_text or ""])
-    ps = scan_precond_signals(combined)
-    needed = len(ps) >= 1
-    return needed, ps
-
-# ---- TABLO KARARI (ihtiyaç + override) ----
-def choose_table(summary: str, action_texts: list, expected_texts: list, pre_assoc_text: str,
-                 *, data_written: bool, pre_written_csv: bool, debug: bool=False):
-    data_needed, data_sigs, data_strong = decide_data_needed(summary, action_texts, expected_texts)
-    pre_needed,  pre_sigs              = decide_precond_needed(summary, action_texts, pre_assoc_text)
-
-    if data_written and pre_written_csv:
-        decision = ("D", 14, [1,2,3,4,5,6,7])
-    else:
-        if data_needed and pre_needed:
-            decision = ("D", 14, [1,2,3,4,5,6,7])
-        elif data_needed:
-            decision = ("C", 17, [1,2,3,5,6,7])
-        elif pre_needed:
-            decision = ("B", 17, [1,2,4,5,6,7])
-        else:
-            decision = ("A", 20, [1,2,5,6,7])
-
-    if debug:
-        return (*decision, data_sigs, pre_sigs, data_needed, pre_needed, data_strong)
-    return decision
-
-# ✏️ ---- EXPECTED YAZIM KALİTESİ CEZASI ----
-_EXPECT_PAST_WORDS = (
-    r"(oldu|olmadı|gerçekleşti|gerçekleşmedi|yapıldı|yapılmadı|edildi|edilmedi|"
-    r"sağlandı|sağlanmadı|tamamlandı|tamamlanmadı|görüldü|görülmedi|döndü|"
-    r"başarılı oldu|başarısız oldu|hata verdi|gösterildi|gösterilmedi)"
-)
-_EXPECT_PAST_REGEXES = [
-    re.compile(rf"\b{_EXPECT_PAST_WORDS}\b", re.I),
-    re.compile(r"\b\w+(ildi|ıldı|uldu|üldü|ndi|ndı|ndu|ndü)\b", re.I),
-    re.compile(r"\b\w+(medi|madı)\b", re.I),
-]
-def expected_style_hits(text: str) -> int:
-    t = _cleanup_html(text or "").lower()
-    hits = 0
-    for rx in _EXPECT_PAST_REGEXES:
-        hits += len(rx.findall(t))
-    return hits
-def expected_style_penalty(blocks: list[str]) -> tuple[int, int]:
-    txt = " . ".join(blocks or [])
-    hits = expected_style_hits(txt)
-    if hits <= 0: return 0, 0
-    if hits == 1: pen = 1
-    elif hits == 2: pen = 2
-    elif hits == 3: pen = 3
-    elif hits <= 5: pen = 4
-    else: pen = 5
-    return hits, pen
-
-# ---- Stepler kuralı ----
-PASSIVE_PATTERNS = re.compile(
-    r'\b(yapıldı|edildi|gerçekleştirildi|sağlandı|tamamlandı|kontrol edildi|yapılır|edilir|gerçekleştirilir|sağlanır|tamamlanır|kontrol edilir)\b',
-    re.I
-)
-def block_has_many_substeps(text: str) -> bool:
-    t = _cleanup_html(text or "")
-    if re.search(r'(^|\n)\s*(\d+[\).\-\:]|\-|\*|\•)\s+\S+', t): return True
-    lines = [ln.strip() for ln in re.split(r'(?:\n)+', t) if ln.strip()]
-    if len(lines) >= 3: return True
-    if t.count(';') >= 2: return True
-    joiners = re.findall(r'(?:,|\bve\b|\bsonra\b|\bardından\b)', t, re.I)
-    if len(joiners) >= 3: return True
-    return False
-
-# ---- Test Tipi (Backend/UI) Heuristics ----
-def detect_test_type(summary: str, labels_text: str, action_texts: list, expected_texts: list) -> str:
-    s_all = " \n ".join([summary or "", labels_text or ""] + action_texts + expected_texts).lower()
-    backend_hits = 0
-    ui_hits = 0
-    for pat in [r'\bbackend\b', r'\bapi\b', r'\b(json|payload|request|response|headers)\b',
-                r'\b(get|post|put|patch|delete)\b', r'/[\w\-/]+', r'\bselect|insert|update|delete\b']:
-        if re.search(pat, s_all): backend_hits += 1
-    for pat in [r'\bui\b', r'\bbuton|button|tıklanır|ekran|modal|form\b',
-                r'\btextfield|input|dropdown|seçilir|yazılır|girilir\b',
-                r'\bandroid|ios|web|chrome|safari|firefox|edge\b']:
-        if re.search(pat, s_all): ui_hits += 1
-    if backend_hits > ui_hits and backend_hits >= 1: return "Backend"
-    if ui_hits > backend_hits and ui_hits >= 1: return "UI"
-    if "backend" in (labels_text or "").lower(): return "Backend"
-    return "—"
-
-# ---------- Skorlama ----------
-def score_one(row, df_cols, debug=False):
-    key = _text(row.get('Issue key') or row.get('Issue Key') or row.get('Key') or row.get('IssueKey'))
-    summary = _text(row.get('Summary') or row.get('Issue Summary') or row.get('Title'))
-    priority = _text(row.get('Priority'))
-
-    steps_col_name = pick_first_existing(
-        ['Custom field (Manual Test Steps)', 'Manual Test Steps', 'Steps', 'Custom Steps'],
-        df_cols
-    )
-    steps_list = parse_steps(row.get(steps_col_name)) if steps_col_name else []
-
-    action_blocks = get_action_blocks(steps_list)
-    expected_blocks = get_expected_blocks(steps_list)
-    data_blocks = get_data_blocks(steps_list)
-
-    data_present_for_scoring = has_data_written_from_steps(steps_list)
-    precond_provided_csv     = precondition_provided_from_csv(row, df_cols)
-    expected_present         = has_expected_present_from_steps(steps_list)
-    pre_assoc_text           = get_pre_assoc_text(row, df_cols)
-
-    if debug:
-        table, base, active, data_sigs, pre_sigs, data_needed, pre_needed, data_strong = choose_table(
-            summary, action_blocks, expected_blocks, pre_assoc_text,
-            data_written=data_present_for_scoring,
-            pre_written_csv=precond_provided_csv,
-            debug=True
-        )
-    else:
-        table, base, active = choose_table(
-            summary, action_blocks, expected_blocks, pre_assoc_text,
-            data_written=data_present_for_scoring,
-            pre_written_csv=precond_provided_csv,
-            debug=False
-        )
-        data_sigs = pre_sigs = []
-        data_needed = pre_needed = None
-        data_strong = None
-
-    label_cols = [c for c in df_cols if c.lower().startswith("labels")]
-    labels_text = " ".join([_text(row.get(c)) for c in label_cols])
-    test_type = detect_test_type(summary, labels_text, action_blocks, expected_blocks)
-
-    pts, notes, total = {}, [], 0
-
-    # 1) Başlık
-    if 1 in active:
-        if not summary or len(summary) < 10:
-            pts['Başlık'] = 0; notes.append("❌ Başlık çok kısa")
-        elif any(w in summary.lower() for w in ["test edilir", "kontrol edilir"]):
-            pts['Başlık'] = max(base-3, 1); notes.append(f"🔸 Başlık zayıf ifade ({pts['Başlık']})"); total += pts['Başlık']
-        else:
-            pts['Başlık'] = base; notes.append("✅ Başlık anlaşılır"); total += base
-
-    # 2) Öncelik
-    if 2 in active:
-        if priority.strip().lower() in ["", "null", "none", "nan"]:
-            pts['Öncelik'] = 0; notes.append("❌ Öncelik eksik")
-        else:
-            pts['Öncelik'] = base; notes.append("✅ Öncelik var"); total += base
-
-    # 3) Data
-    if 3 in active:
-        if data_present_for_scoring:
-            pts['Data'] = base; notes.append("✅ Data mevcut (steps JSON)")
-            total += base
-        else:
-            pts['Data'] = 0; notes.append("❌ Data bulunamadı")
-
-    # 4) Ön Koşul (YALNIZCA CSV)
-    if 4 in active:
-        if precond_provided_csv:
-            pts['Ön Koşul'] = base; notes.append("✅ Pre-Condition association var (CSV)")
-            total += base
-        else:
-            pts['Ön Koşul'] = 0; notes.append("❌ Pre-Condition association eksik (CSV)")
-
-    # 5) Stepler
-    if 5 in active:
-        n_blocks = len(action_blocks)
-        if n_blocks == 0:
-            pts['Stepler'] = 0; notes.append("❌ Stepler boş")
-        elif n_blocks >= 2:
-            pts['Stepler'] = base; notes.append(f"✅ Stepler ayrı ve düzgün ({n_blocks} adım)"); total += base
-        else:
-            t = (action_blocks[0] or "")
-            if block_has_many_substeps(t) or PASSIVE_PATTERNS.search(t):
-                pts['Stepler'] = 1; notes.append("❌ Tek blokta çok adım veya edilgen ifade (1 puan)"); total += 1
-            else:
-                pts['Stepler'] = base; notes.append("✅ Tek step ama net/tek eylem"); total += base
-
-    # 6) Client
-    if 6 in active:
-        ck = ["android","ios","web","mac","windows","chrome","safari","firefox","edge"]
-        all_text = " ".join([summary] + action_blocks)
-        if any(c in all_text.lower() for c in ck) or any(c in labels_text.lower() for c in ck):
-            pts['Client'] = base; notes.append("✅ Client bilgisi var"); total += base
-        else:
-            pts['Client'] = 0; notes.append("❌ Client bilgisi eksik")
-
-    # 7) Expected (+ yazım cezası)
-    if 7 in active:
-        if expected_present:
-            pts['Expected'] = base
-            hits, pen = expected_style_penalty(expected_blocks)
-            if pen > 0:
-                pts['Expected'] = max(0, pts['Expected'] - pen)
-                notes.append(f"✏️ Expected yazımı (geçmiş zaman) -{pen} (isabet: {hits})")
-            else:
-                notes.append("✅ Expected mevcut (en az bir adım)")
-            total += pts['Expected']
-        else:
-            pts['Expected'] = 0; notes.append("❌ Expected result eksik")
-
-    result = {
-        "Key": key, "Summary": summary, "Tablo": table, "Toplam Puan": total,
-        **pts, "Açıklama": " | ".join(notes),
-        "_type": test_type
-    }
-    if debug:
-        hits_dbg, pen_dbg = expected_style_penalty(expected_blocks)
-        result.update({
-            "_data_sigs": ", ".join(sorted(data_sigs)) or "-",
-            "_pre_sigs":  ", ".join(sorted(pre_sigs)) or "-",
-            "_data_needed": data_needed,
-            "_pre_needed":  pre_needed,
-            "_data_strong": data_strong,
-            "_data_written": data_present_for_scoring,
-            "_pre_written_csv": precond_provided_csv,
-            "_exp_hits": hits_dbg,
-            "_exp_penalty": pen_dbg,
-            "_actions_join": " ⏵ ".join(action_blocks)[:1200],
-            "_expected_join": " ⏵ ".join(expected_blocks)[:1200],
-            "_data_join": " ⏵ ".join(data_blocks)[:1200],
-        })
-    return result
+uploaded = st.file_uploader("📤 CSV yükle (`;` ayraçlı) — birden fazla dosya tek raporda birleşir", type="csv",
+                            accept_multiple_files=True)
+
+# ---------- Önbellek ----------
+@st.cache_resource(max_entries=4, show_spinner=False)
+def cached_parsed_steps(file_hash: str, _df: pd.DataFrame, _source_cols=None) -> pd.Series:
+    """Steps JSON'u dosya içeriği hash'i başına bir kez çözer (slider/reroll/debug rerun'larında tekrar yok).
+    `_source_cols`: çoklu dosyada her kaynağın kendi steps kolonu."""
+    return per_source(_df, _source_cols, lambda part, cols: parse_steps_frame(part))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def cached_filter_index(file_hash: str, _df: pd.DataFrame) -> FilterIndex:
+    """Prefix / otomasyon konum indeksi; dosya başına bir kez kurulur."""
+    return FilterIndex(_df)
+
+@st.cache_resource(max_entries=4, show_spinner="Tablo tahmini (katmanlı örnekleme)...")
+def cached_table_codes(file_hash: str, _df: pd.DataFrame, _parsed: pd.Series, _source_cols=None):
+    return category_codes(per_source(_df, _source_cols, lambda part, cols: predict_tables(part, cols, parsed=_parsed)))
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def cached_debug_details(file_hash: str, _df: pd.DataFrame, _parsed: pd.Series, _source_cols=None) -> LazyDebug:
+    """Debug ayrıntıları dosya başına tek yerde; bakılan satırlar rerun'lar arasında saklanır."""
+    return LazyDebug(_df, parsed=_parsed, source_cols=_source_cols)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def scoring_pool(workers: int) -> ScoringPool:
+    """Süreç havuzu rerun'lar arasında canlı tutulur (işçiler Streamlit import etmez)."""
+    return ScoringPool(workers)
+
+@st.cache_resource(show_spinner=False)
+def score_store() -> ScoreStore:
+    return ScoreStore()
+
+@st.cache_resource(show_spinner=False)
+def history_store() -> HistoryStore:
+    return HistoryStore()
+
+ANALYTICS_CACHE_ENTRIES = 4
+
+@st.cache_resource(show_spinner=False)
+def analytics_cache() -> dict:
+    """(dosya hash'i, kural parmak izi) → tüm satırların ScoreAnalytics'i (rerun ve oturumlar arasında)."""
+    return {}
+
+# ---------- Arka plan işleri ----------
+JOB_LIMIT = 6
+POLL_SECONDS = 0.2
+
+def session_job(key: tuple, make) -> Job:
+    """Oturumdaki işi anahtarıyla bulur (rerun yarım işi sürdürür); yoksa make() ile kurup başlatır.
+    Aynı türden koşan diğer işler duraklatılır — kısmi sonuçları korunur, geri dönülünce devam eder."""
+    jobs = st.session_state.setdefault("jobs", {})
+    for k, other in jobs.items():
+        if k != key and k[0] == key[0] and other.running:
+            other.pause()
+    job = jobs.get(key)
+    if job is None:
+        job = jobs[key] = make().start()
+        idle = [k for k, j in jobs.items() if not j.running]
+        for k in idle[:max(0, len(jobs) - JOB_LIMIT)]:
+            del jobs[k]
+    elif job.paused:
+        job.wait()
+        job.resume()
+    return job
+
+def follow_job(job: Job, status, title: str):
+    """İşi izler: ilerleme/ETA status etiketinde ve çubukta, yanında İptal / Devam et.
+    Bitince sonucu döner; iptal edilmişse kısmi ilerlemeyle script durur."""
+    if not (job.finished and not job.stopped):
+        panel = st.empty()
+        with panel.container():
+            c1, c2 = st.columns([5, 1])
+            bar = c1.empty()
+            if job.stopped:
+                if c2.button("▶ Devam et", key=f"job_resume_{job.id}"):
+                    job.resume()
+                    st.rerun()
+            elif c2.button("⏹ İptal", key=f"job_cancel_{job.id}"):
+                job.cancel()
+                job.wait()
+                st.rerun()
+        while not job.finished:
+            text = job.describe(title)
+            status.update(label=text, state="running")
+            bar.progress(job.fraction, text=text)
+            job.wait(POLL_SECONDS)
+        if job.stopped:
+            text = f"⏹ İptal edildi — {job.describe(title)}"
+            status.update(label=text, state="error")
+            bar.progress(job.fraction, text=text)
+            st.stop()
+        panel.empty()
+    if job.error is not None:
+        raise job.error
+    return job.result
 
 # ---------- Görselleştirme yardımcıları ----------
-def render_case_card(r, max_by_table_map, show_debug=False):
+def render_case_card(r, max_by_table_map, show_debug=False, details=None, slot=""):
     badge_map = {"A":"badge badge-a","B":"badge badge-b","C":"badge badge-c","D":"badge badge-d"}
     max_pt = max_by_table_map.get(r["Tablo"], 100)
     pct = float(r["Toplam Puan"]) / max_pt if max_pt else 0.0
@@ -549,78 +298,341 @@ def render_case_card(r, max_by_table_map, show_debug=False):
             st.markdown(f"- **{k}**: {int(r[k])} puan")
 
     if show_debug:
-        with st.expander(f"🔎 Debug — {r['Key']}"):
-            st.markdown(f"- need:data: `{r.get('_data_needed')}`, strong_combo: `{r.get('_data_strong')}` — sinyaller: {r.get('_data_sigs')}")
-            st.markdown(f"- need:pre : `{r.get('_pre_needed')}` — sinyaller: {r.get('_pre_sigs')}")
-            st.markdown(f"- has:data(stepsJSON): `{r.get('_data_written')}` • has:pre(CSV): `{r.get('_pre_written_csv')}`")
-            st.markdown(f"- ✏️ Expected yazım isabet: `{r.get('_exp_hits')}`, ceza: `{r.get('_exp_penalty')}`")
+        dbg, lazy = (r, False) if "_data_sigs" in r else (None, details is not None)
+        # Skorlama debug kolonsuz yapıldıysa ayrıntı yalnızca açıldığında üretilir (LazyDebug'da saklanır)
+        if lazy and st.toggle(f"🔎 Debug — {r['Key']}", key=f"debug_{slot}_{r.name}"):
+            dbg = details.get(r.name)
+        if dbg is not None:
+            with st.expander(f"🔎 Debug — {r['Key']}", expanded=lazy):
+                st.markdown(f"- need:data: `{dbg.get('_data_needed')}`, strong_combo: `{dbg.get('_data_strong')}` — sinyaller: {dbg.get('_data_sigs')}")
+                st.markdown(f"- need:pre : `{dbg.get('_pre_needed')}` — sinyaller: {dbg.get('_pre_sigs')}")
+                st.markdown(f"- has:data(stepsJSON): `{dbg.get('_data_written')}` • has:pre(CSV): `{dbg.get('_pre_written_csv')}`")
+                st.markdown(f"- ✏️ Expected yazım isabet: `{dbg.get('_exp_hits')}`, ceza: `{dbg.get('_exp_penalty')}`")
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-# ---------- Çalıştır ----------
-if uploaded:
-    with st.status("📥 CSV yükleniyor...", expanded=False) as s:
-        try:
-            try:
-                df = pd.read_csv(uploaded, sep=';')
-            except Exception:
-                df = pd.read_csv(uploaded)
-            s.update(label=f"✅ CSV okundu — {df.shape[0]} satır, {df.shape[1]} sütun", state="complete")
-        except Exception as e:
-            st.exception(e)
-            st.stop()
-
+def render_kpis(total_cases, dist, avg_score, min_score, max_score):
+    k1, k2, k3, k4 = st.columns(4)
+    with k1:
+        st.markdown(f'<div class="kpi"><div class="kpi-title">Toplam Örnek</div><div class="kpi-value">{total_cases}</div><div class="kpi-sub">Değerlendirilen</div></div>', unsafe_allow_html=True)
+    with k2:
+        st.markdown(f'<div class="kpi"><div class="kpi-title">Dağılım (A/B/C/D)</div><div class="kpi-value">{int(dist.get("A",0))}/{int(dist.get("B",0))}/{int(dist.get("C",0))}/{int(dist.get("D",0))}</div><div class="kpi-sub">Tablo adetleri</div></div>', unsafe_allow_html=True)
+    with k3:
+        st.markdown(f'<div class="kpi"><div class="kpi-title">Ortalama Skor</div><div class="kpi-value">{avg_score}</div><div class="kpi-sub">Min: {min_score} • Max: {max_score}</div></div>', unsafe_allow_html=True)
+    with k4:
+        st.markdown(f'<div class="kpi"><div class="kpi-title">Rapor Zamanı</div><div class="kpi-value">{datetime.now().strftime("%H:%M")}</div><div class="kpi-sub">Yerel saat</div></div>', unsafe_allow_html=True)
+
+def render_distribution(dist, auto_ot, auto_man, show_debug=False):
+    # Otomasyon/Manuel sayacı (bilgi amaçlı)
+    st.caption(f"🧪 Çalıştırma tipi dağılımı (filtre sonrası kaynak veri): **Otomasyon:** {auto_ot} • **Manuel:** {auto_man}")
+
+    st.markdown("### 📈 Tablo Dağılımı")
     try:
-        # ✅ Prefix sütunu üret ve sidebar filtre ekle (örneklemeden ÖNCE)
-        key_col_name = pick_first_existing(['Issue key', 'Issue Key', 'Key', 'IssueKey'], df.columns)
-        if key_col_name:
-            df['_KeyRaw'] = df[key_col_name].astype(str)
-            df['_Prefix'] = df['_KeyRaw'].apply(_key_prefix)
-
-            prefix_options = sorted([p for p in df['_Prefix'].unique() if p])
-            selected_prefixes = st.sidebar.multiselect(
-                "🔎 Projeye göre filtrele (Key prefix)",
-                options=prefix_options,
-                help="Key değerindeki '-' öncesi kısma göre filtreler (örn. QB284050, QM284050). Boş bırakılırsa tümü."
-            )
-            if selected_prefixes:
-                df = df[df['_Prefix'].isin(selected_prefixes)]
-
-        # ✅ Automated sütunu tespit et + durum sütunu üret + sidebar filtresi
-        auto_col = None
-        for c in df.columns:
-            cl = str(c).strip().lower()
-            if cl == "automated" or "automated" in cl:
-                auto_col = c
-                break
-        if auto_col:
-            df["_Automation"] = df[auto_col].apply(_detect_automation)
+        st.bar_chart(dist)
+    except Exception as e:
+        st.info("Dağılım grafiği çizilemedi, tablo boş olabilir.")
+        if show_debug: st.exception(e)
+
+def render_analytics(an, scope: str, sources: bool=False):
+    """Analiz küpünden: Skor % histogramı, puan yüzdelikleri, kriter geçme oranları ve kırılımlar."""
+    st.markdown("## 📊 Skor Analizi")
+    if an.count == 0:
+        st.info("Analiz için satır yok.")
+        return
+    st.caption(f"Kapsam: **{scope}** — {an.count} satır • Ortalama: {an.avg} • Min: {an.min} • Max: {an.max}")
+    c1, c2 = st.columns([3, 2])
+    with c1:
+        st.markdown("#### Skor % histogramı")
+        st.bar_chart(an.histogram())
+    with c2:
+        st.markdown("#### Toplam puan yüzdelikleri")
+        st.dataframe(an.percentiles().rename("Puan").rename_axis("Yüzdelik").reset_index(),
+                     use_container_width=True, hide_index=True)
+    st.markdown("#### ✅ Kriter geçme oranları (tam puan)")
+    st.dataframe(an.pass_rates(), use_container_width=True, hide_index=True,
+                 column_config={"Oran %": st.column_config.ProgressColumn("Oran %", min_value=0, max_value=100)})
+    dims = (["Kaynak"] if sources else []) + ["Prefix", "Automation", "Tip"]
+    for tab, dim in zip(st.tabs([DIM_LABELS[d] for d in dims]), dims):
+        with tab:
+            st.dataframe(an.breakdown(dim), use_container_width=True, hide_index=True)
+
+def render_history(hist, prefixes=None):
+    """Trend geçmişi: prefix başına ortalama Skor % trendi ve seçilen iki çalıştırma arasındaki farklar."""
+    st.markdown("## 🗂 Trend Geçmişi")
+    runs = hist.runs()
+    if len(runs) == 0:
+        st.info("Geçmişte çalıştırma yok — tüm dosya veya akış modunda skorlanan çalıştırmalar eklenir.")
+        return
+    trend = hist.prefix_trend(prefixes or None)
+    if len(trend):
+        top = trend.groupby("Prefix")["Adet"].sum().nlargest(10).index   # en kalabalık 10 prefix
+        st.markdown("#### Prefix başına ortalama Skor % (çalıştırma sırasıyla)")
+        st.line_chart(trend[trend["Prefix"].isin(top)].pivot_table(index="run_id", columns="Prefix", values="Skor %"))
+    if len(runs) < 2:
+        st.caption("Karşılaştırma için en az iki çalıştırma gerekli.")
+        return
+    names = {r["run_id"]: f"#{r['run_id']} • {r['created_at']} • {r['label']}" for r in runs.to_dict("records")}
+    ids = list(names)
+    c1, c2 = st.columns(2)
+    before = c1.selectbox("Önceki çalıştırma", ids, index=len(ids) - 2, format_func=names.get, key="hist_before")
+    after = c2.selectbox("Sonraki çalıştırma", ids, index=len(ids) - 1, format_func=names.get, key="hist_after")
+    if before == after:
+        st.info("Farklı iki çalıştırma seçin.")
+        return
+    ch = hist.key_changes(before, after)
+    st.caption(f"Key: **ortak** {ch['ortak']} • **yeni** {ch['yeni']} • **kaybolan** {ch['kaybolan']}")
+    t1, t2, t3 = st.tabs(["Prefix Δ Skor %", "Düşen Key'ler", "Tablo geçişleri"])
+    with t1:
+        st.dataframe(hist.prefix_deltas(before, after), use_container_width=True, hide_index=True)
+    with t2:
+        st.dataframe(hist.dropped_keys(before, after, limit=500), use_container_width=True, hide_index=True)
+    with t3:
+        st.dataframe(hist.table_moves(before, after), use_container_width=True, hide_index=True)
+
+def render_case_list(title, frame, show_debug=False, details=None, slot=""):
+    st.markdown(title)
+    if len(frame) == 0:
+        st.info("Gösterilecek kayıt yok.")
+    else:
+        for _, rr in frame.iterrows():
+            render_case_card(rr, MAX_BY_TABLE, show_debug=show_debug, details=details, slot=slot)
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+def render_case_pages(frame, show_debug=False, details=None):
+    """Detay kartları sayfa sayfa: yalnızca görünen sayfanın kartları çizilir.
+    Key araması (içerir) listeyi daraltır; tam Key ile 'Case'e git' ilgili sayfaya atlar."""
+    st.markdown("## 📝 Tüm Detaylar")
+    c1, c2, c3 = st.columns([2, 2, 1])
+    query = c1.text_input("🔎 Key ile ara", key="case_query", placeholder="örn. QB284050")
+    jump = c2.text_input("🎯 Case'e git (tam Key)", key="case_jump", placeholder="örn. QB284050-123")
+    page_size = c3.selectbox("Sayfa boyutu", PAGE_SIZES, index=0, key="case_page_size")
+
+    keys = frame["Key"].astype(str)
+    if query.strip():
+        frame = frame[keys.str.contains(query.strip(), case=False, regex=False).to_numpy()]
+        keys = frame["Key"].astype(str)
+    if len(frame) == 0:
+        st.info("Aramaya uyan kayıt yok.")
+        return
+
+    pages = (len(frame) - 1) // page_size + 1
+    if st.session_state.get("case_page", 1) > pages:
+        st.session_state.case_page = 1
+    if jump.strip() and st.session_state.get("case_jump_done") != (jump, query, page_size):
+        hit = (keys.str.strip().str.lower() == jump.strip().lower()).to_numpy().nonzero()[0]
+        if len(hit):
+            st.session_state.case_page = int(hit[0]) // page_size + 1
         else:
-            df["_Automation"] = "Manuel"
+            st.warning(f"`{jump.strip()}` bulunamadı (arama filtresi dahilinde).")
+        st.session_state.case_jump_done = (jump, query, page_size)
+
+    page = st.number_input(f"Sayfa (toplam {pages})", min_value=1, max_value=pages, step=1, key="case_page")
+    start = (int(page) - 1) * page_size
+    st.caption(f"{start + 1}–{min(start + page_size, len(frame))} / {len(frame)} kayıt")
+    for _, rr in frame.iloc[start:start + page_size].iterrows():
+        render_case_card(rr, MAX_BY_TABLE, show_debug=show_debug, details=details, slot="page")
+
+def render_download(write, csv_path=None):
+    """Biçim seçimi + indirme; dosya yalnızca tıklamada geçici dosyaya yazılır (rerun'da kopya yok).
+    `write(path, fmt)` sonucu yazar; `csv_path` verilirse csv için doğrudan o dosya sunulur."""
+    fmt = st.selectbox("💾 İndirme biçimi", EXPORT_FORMATS, index=0, key="export_format",
+                       help="parquet / arrow: kategorik Tablo/Prefix, küçük tamsayı puanlar (BI için hızlı okuma)")
+
+    def build():
+        if csv_path is not None and fmt == "csv":
+            return open(csv_path, "rb")
+        tmp = tempfile.NamedTemporaryFile(prefix="testcase_skorlari_", suffix=f".{fmt}")
+        write(tmp.name, fmt)
+        tmp.seek(0)
+        return tmp
+
+    st.download_button(
+        f"📥 Sonuçları {fmt.upper()} olarak indir",
+        data=build,
+        file_name=f"testcase_skorlari_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt}",
+        mime=MIME_TYPES[fmt],
+        type="primary"
+    )
 
-        auto_choice = st.sidebar.radio(
-            "🧪 Çalıştırma tipi",
-            options=["Tümü", "Sadece Otomasyon", "Sadece Manuel"],
-            index=0,
-            help="CSV'deki 'Automated' alanına göre filtreler."
+def sidebar_filters(prefix_options):
+    selected_prefixes = []
+    if prefix_options is not None:
+        selected_prefixes = st.sidebar.multiselect(
+            "🔎 Projeye göre filtrele (Key prefix)",
+            options=prefix_options,
+            help="Key değerindeki '-' öncesi kısma göre filtreler (örn. QB284050, QM284050). Boş bırakılırsa tümü."
         )
-        if auto_choice == "Sadece Otomasyon":
-            df = df[df["_Automation"] == "Otomasyon"]
-        elif auto_choice == "Sadece Manuel":
-            df = df[df["_Automation"] == "Manuel"]
+    auto_choice = st.sidebar.radio(
+        "🧪 Çalıştırma tipi",
+        options=["Tümü", "Sadece Otomasyon", "Sadece Manuel"],
+        index=0,
+        help="CSV'deki 'Automated' alanına göre filtreler."
+    )
+    return selected_prefixes, auto_choice
+
+# ---------- Akış modu (büyük dosyalar) ----------
+@st.cache_resource(max_entries=2, show_spinner=False)
+def cached_stream_prefixes(file_hash: str, _data):
+    if isinstance(_data, list):
+        return scan_prefixes([(label, io.BytesIO(d)) for label, d in _data])
+    return scan_prefixes(io.BytesIO(_data))
+
+def upload_hash(data) -> str:
+    """Tek dosya: içerik hash'i; çoklu dosya: etiket + içerik hash'leri."""
+    return sources_hash(data) if isinstance(data, list) else content_hash(data)
+
+def upload_label() -> str:
+    return ", ".join(f.name for f in uploaded)
+
+def new_stream_job(data, prefixes: tuple, auto_choice: str, debug: bool, workers: int, incremental: bool,
+                   history: bool=False):
+    """Parça parça skorlar; detay sonuçlar geçici dosyaya yazılır, bellekte yalnızca özet kalır.
+    `history`: çalıştırma trend geçmişine eklenir (aynı dosya + filtre + kural seti daha önce eklenmediyse)."""
+    out = tempfile.NamedTemporaryFile(prefix="testcase_skorlari_", suffix=".csv", delete=False)
+    out.close()
+    key = run_key(upload_hash(data), prefixes, auto_choice, rules_fingerprint())
+    hist = history_store() if history and history_store().find_run(key) is None else None
+    job = Job(stream_job, data, out.name, history=hist, history_label=upload_label(), run_key=key,
+              debug=debug, prefixes=list(prefixes), automation=auto_choice,
+              workers=workers, store=score_store() if incremental else None)
+    job.out_path = out.name
+    return job
+
+def run_streaming(data):
+    multi = isinstance(data, list)
+    file_hash = upload_hash(data)
+    status = st.status("🌊 Akış modunda skorlanıyor...", expanded=False)
+    try:
+        prefix_options = cached_stream_prefixes(file_hash, data)
+        selected_prefixes, auto_choice = sidebar_filters(prefix_options or None)
+        params = (file_hash, tuple(selected_prefixes), auto_choice, show_debug, int(workers), use_store, record_history)
+        job = session_job(("stream", *params), lambda: new_stream_job(data, *params[1:]))
+        stats, out_path = follow_job(job, status, "🌊 Akış"), job.out_path
+        reused = f" (♻️ {stats.reused} depodan)" if use_store else ""
+        status.update(label=f"✅ Akış tamamlandı — {stats.count} satır skorlandı{reused}", state="complete")
+    except Exception as e:
+        st.exception(e)
+        st.stop()
+
+    if stats.count == 0:
+        st.warning("Filtreler sonrası kaynak veri **boş**. Prefix veya Çalıştırma tipi filtresini gevşetmeyi deneyin.")
+        st.stop()
+
+    dist = stats.distribution()
+    render_kpis(stats.count, dist, stats.avg, stats.min, stats.max)
+    render_distribution(dist, int(stats.automation_counts.get("Otomasyon", 0)),
+                        int(stats.automation_counts.get("Manuel", 0)), show_debug)
+
+    # Akış çıktısı zaten diskte (csv); diğer biçimler tıklamada parça parça dönüştürülür
+    if multi:
+        st.caption("📂 Kaynak başına skorlanan satır: " + " • ".join(f"**{k}**: {n}" for k, n in stats.source_counts.items()))
+    render_download(lambda path, fmt: convert_csv(out_path, path, fmt, show_debug, sources=multi), csv_path=out_path)
+
+    render_analytics(stats.analytics, "akış — filtre sonrası tüm satırlar", multi)
+    if record_history:
+        render_history(history_store(), selected_prefixes)
+
+    render_case_list("## 🧩 En Düşük 5 Skor", stats.bottom(), show_debug)
+    render_case_list("## 🏅 En Yüksek 5 Skor", stats.top(), show_debug)
+
+# ---------- Tam çerçeve (örneklem / tüm dosya) ----------
+def population_analytics(file_hash: str, df, parsed, source_cols) -> ScoreAnalytics:
+    """Dosyanın tüm satırlarının analiz küpü; dosya + kural seti başına bir kez, arka plan işinde
+    (parça parça; yarım iş rerun'da devam eder). Prefix / otomasyon filtresi sonra küpte uygulanır."""
+    cache = analytics_cache()
+    key = (file_hash, rules_fingerprint())
+    if key not in cache:
+        pool, part_rows = None, JOB_PART_ROWS
+        if workers > 1 and len(df) > DEFAULT_PARTITION_ROWS:
+            pool = scoring_pool(int(workers))
+            part_rows = max(part_rows, int(workers) * DEFAULT_PARTITION_ROWS)
+        job = session_job(("analytics", *key), lambda: Job(analytics_job, df, source_cols, parsed, pool, part_rows))
+        status = st.status("📊 Popülasyon analizi...", expanded=False)
+        an = follow_job(job, status, "📊 Popülasyon analizi")
+        status.update(label=f"✅ Popülasyon analizi — {an.count} satır", state="complete")
+        cache[key] = an
+        while len(cache) > ANALYTICS_CACHE_ENTRIES:
+            cache.pop(next(iter(cache)))
+    return cache[key]
+
+def run_full(data):
+    prof = current_profiler()
+    multi = isinstance(data, list)
+    status = st.status("📥 CSV yükleniyor...", expanded=False)
+    try:
+        # İçerik hash'i başına bir kez okunur (prefix/otomasyon kolonları dahil); okuma arka planda.
+        # Çoklu dosya eşzamanlı okunur; her kaynak kendi kolon şemasıyla işlenir (source_cols)
+        if multi:
+            job = session_job(("ingest", upload_hash(data)), lambda: Job(ingest_many_job, data))
+            file_hash, df, source_cols = follow_job(job, status, f"📥 {len(data)} CSV")
+        else:
+            job = session_job(("ingest", content_hash(data)), lambda: Job(ingest_job, data))
+            (file_hash, df), source_cols = follow_job(job, status, "📥 CSV"), None
+        files = f"{len(data)} dosya, " if multi else ""
+        status.update(label=f"✅ CSV okundu — {files}{df.shape[0]} satır, {df.shape[1]} sütun", state="complete")
+    except Exception as e:
+        st.exception(e)
+        st.stop()
+
+    try:
+        parsed_steps = cached_parsed_steps(file_hash, df, source_cols)
+        findex = cached_filter_index(file_hash, df)
+
+        selected_prefixes, auto_choice = sidebar_filters(findex.prefix_options)
+        # Filtre = konum dizisi (çerçeve kopyası yok)
+        with prof.stage("filter"):
+            pos = findex.positions(selected_prefixes, auto_choice)
 
         # Filtre sonrası boşsa uyarı ver ve dur
-        if len(df) == 0:
+        if len(pos) == 0:
             st.warning("Filtreler sonrası kaynak veri **boş**. Prefix veya Çalıştırma tipi filtresini gevşetmeyi deneyin.")
             st.stop()
 
-        # Örnekle
-        n = min(sample_size, len(df))
-        rstate = (123 + st.session_state.reroll) if fix_seed else None
-        sample = df.sample(n=n, random_state=rstate) if len(df) > 0 else df
-
-        # Skorla
-        results = sample.apply(lambda r: score_one(r, df.columns, debug=show_debug), axis=1, result_type='expand')
+        # Örnekle (yalnızca seçilen satırlar çerçeveden alınır)
+        def draw_sample():
+            with prof.stage("sample"):
+                if score_all:
+                    return take(df, pos)
+                n = min(sample_size, len(pos))
+                rstate = (123 + st.session_state.reroll) if fix_seed else None
+                if strata_dims:
+                    strata = [cached_table_codes(file_hash, df, parsed_steps, source_cols) if d == "table"
+                              else findex.codes(d)
+                              for d in strata_dims]
+                    return df.iloc[stratified_positions(strata, pos, n, rstate)]
+                return df.iloc[sample_positions(pos, n, rstate)]
+
+        # Skorla (paralel havuzda kriter aşamaları işçi süreçlerde kalır; yalnızca toplam ölçülür)
+        def new_score_job():
+            sample = draw_sample()
+            part_rows = JOB_PART_ROWS
+            pool = None
+            if workers > 1 and len(sample) > DEFAULT_PARTITION_ROWS:
+                pool = scoring_pool(int(workers))
+                scorer = pool.score
+                part_rows = max(part_rows, int(workers) * DEFAULT_PARTITION_ROWS)
+            else:
+                scorer = lambda part, cols, debug: score_frame(part, cols, debug=debug, parsed=parsed_steps)
+            if multi:
+                # Her kaynak kendi kolon şemasıyla; havuz varsa tüm kaynakların bölümleri birlikte dağıtılır
+                one = scorer
+                scorer = lambda part, cols, debug: score_sources(part, source_cols, one, debug, pool)
+            return Job(score_job, sample, df.columns, scorer, score_store() if use_store else None, part_rows)
+
+        # Örneklem işle birlikte bir kez çekilir: aynı ayarlarla rerun (sayfa, debug...) yarım işi sürdürür,
+        # yeni örneklem için 🎲 Yeniden örnekle
+        sample_key = (file_hash, tuple(selected_prefixes), auto_choice, score_all, int(sample_size), fix_seed,
+                      st.session_state.reroll, sample_mode, tuple(strata_dims))
+        job = session_job(("score", *sample_key, use_store, int(workers)), new_score_job)
+        with prof.stage("score"):
+            results, reused = follow_job(job, status, "🧮 Skorlama")
+        status.update(label=f"✅ {len(results)} satır skorlandı — {df.shape[0]} satırlık CSV", state="complete")
+        if use_store:
+            st.caption(f"♻️ {reused} / {len(results)} satır skor deposundan okundu")
+
+        # Debug ayrıntıları skorlamada üretilmez; kart / kolon açıldıkça satır başına hesaplanır
+        details = cached_debug_details(file_hash, df, parsed_steps, source_cols) if show_debug else None
         if results is None or len(results) == 0:
             st.error("Skorlama sonucu boş döndü.")
             st.stop()
@@ -632,50 +644,26 @@ if uploaded:
         max_score  = int(results["Toplam Puan"].max()) if total_cases else 0
         dist = results['Tablo'].value_counts().reindex(["A","B","C","D"]).fillna(0).astype(int)
 
-        k1, k2, k3, k4 = st.columns(4)
-        with k1:
-            st.markdown(f'<div class="kpi"><div class="kpi-title">Toplam Örnek</div><div class="kpi-value">{total_cases}</div><div class="kpi-sub">Değerlendirilen</div></div>', unsafe_allow_html=True)
-        with k2:
-            st.markdown(f'<div class="kpi"><div class="kpi-title">Dağılım (A/B/C/D)</div><div class="kpi-value">{int(dist.get("A",0))}/{int(dist.get("B",0))}/{int(dist.get("C",0))}/{int(dist.get("D",0))}</div><div class="kpi-sub">Tablo adetleri</div></div>', unsafe_allow_html=True)
-        with k3:
-            st.markdown(f'<div class="kpi"><div class="kpi-title">Ortalama Skor</div><div class="kpi-value">{avg_score}</div><div class="kpi-sub">Min: {min_score} • Max: {max_score}</div></div>', unsafe_allow_html=True)
-        with k4:
-            st.markdown(f'<div class="kpi"><div class="kpi-title">Rapor Zamanı</div><div class="kpi-value">{datetime.now().strftime("%H:%M")}</div><div class="kpi-sub">Yerel saat</div></div>', unsafe_allow_html=True)
-
-        # Otomasyon/Manuel sayacı (bilgi amaçlı)
-        auto_counts_all = df["_Automation"].value_counts()
-        auto_ot = int(auto_counts_all.get("Otomasyon", 0))
-        auto_man = int(auto_counts_all.get("Manuel", 0))
-        st.caption(f"🧪 Çalıştırma tipi dağılımı (filtre sonrası kaynak veri): **Otomasyon:** {auto_ot} • **Manuel:** {auto_man}")
-
-        st.markdown("### 📈 Tablo Dağılımı")
-        try:
-            st.bar_chart(dist)
-        except Exception as e:
-            st.info("Dağılım grafiği çizilemedi, tablo boş olabilir.")
-            if show_debug: st.exception(e)
-
-        # Skor % ve tablo
-        MAX_BY_TABLE = {"A": 100, "B": 102, "C": 102, "D": 98}
-        results["Maks Puan"] = results["Tablo"].map(MAX_BY_TABLE).fillna(100)
-        results["Skor %"] = (results["Toplam Puan"] / results["Maks Puan"]).clip(0, 1) * 100
-        results["Skor %"] = results["Skor %"].round(1)
-
-        # Görünüm kolonu: Prefix + Automation
-        results["Prefix"] = results["Key"].str.extract(r'^([^\-\s]+)')
-        results["Automation"] = df.loc[sample.index, "_Automation"].values
-
-        show_cols = ["Prefix", "Key", "Summary", "Tablo", "Toplam Puan", "Skor %", "Automation", "Açıklama", "_type"]
-        if show_debug:
-            show_cols += ["_data_needed", "_pre_needed", "_data_strong", "_data_written", "_pre_written_csv",
-                          "_data_sigs", "_pre_sigs", "_exp_hits", "_exp_penalty"]
+        render_kpis(total_cases, dist, avg_score, min_score, max_score)
+        auto_counts_all = findex.automation_counts(pos)
+        render_distribution(dist, auto_counts_all.get("Otomasyon", 0), auto_counts_all.get("Manuel", 0), show_debug)
+
+        # Skor % ve tablo + Görünüm kolonu: Prefix + Automation
+        finalize_results(results, df)
+        show_cols = result_columns(sources=multi)
+        if show_debug and st.toggle("🛠 Debug kolonlarını tabloda göster", value=False, key="debug_cols",
+                                    help="Sinyal/karar kolonları yalnızca açıldığında hesaplanır (satır başına saklanır)."):
+            with prof.stage("debug_details"):
+                results = details.attach(results)
+            show_cols = result_columns(True, sources=multi)
 
         st.markdown("## 📊 Değerlendirme Tablosu")
         st.dataframe(
-            results[show_cols].copy(),
+            results[show_cols],
             use_container_width=True,
             hide_index=True,
             column_config={
+                "Kaynak": st.column_config.TextColumn("Kaynak", help="Yüklenen dosya"),
                 "Prefix": st.column_config.TextColumn("Prefix", help="Key ön eki (proje/ürün kodu)"),
                 "Key": st.column_config.TextColumn("Key", help="Issue key"),
                 "Summary": st.column_config.TextColumn("Summary", width="medium"),
@@ -697,38 +685,87 @@ if uploaded:
             }
         )
 
-        st.download_button(
-            "📥 Sonuçları CSV olarak indir",
-            data=results[show_cols].to_csv(index=False, sep=';', encoding='utf-8'),
-            file_name=f"testcase_skorlari_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-            mime="text/csv",
-            type="primary"
-        )
+        def write(path, fmt):
+            # Debug çıktısı istenirse eksik ayrıntılar yalnızca indirme anında üretilir
+            out = details.attach(results) if show_debug and "_data_sigs" not in results else results
+            write_results(out, path, fmt, show_debug, sources=multi)
+        render_download(write)
+
+        if multi:
+            st.markdown("### 📂 Kaynak Bazında Özet")
+            st.dataframe(source_summary(results), use_container_width=True, hide_index=True)
+
+        # ---------- Skor analizi: örneklem ya da tüm popülasyon (küp bir kez kurulur) ----------
+        with prof.stage("analytics"):
+            if population and not score_all:
+                an = population_analytics(file_hash, df, parsed_steps, source_cols).filtered(selected_prefixes, auto_choice)
+                scope = "tüm satırlar (filtre sonrası)"
+            else:
+                if getattr(job, "analytics", None) is None:
+                    job.analytics = ScoreAnalytics().add_results(results, df)
+                an = job.analytics
+                scope = "filtre sonrası tüm satırlar" if score_all else "örneklem"
+            render_analytics(an, scope, multi)
+
+        # ---------- Trend geçmişi: yalnızca tüm satırlar skorlandıysa kaydedilir ----------
+        if record_history:
+            hist = history_store()
+            if score_all:
+                key = run_key(file_hash, selected_prefixes, auto_choice, rules_fingerprint())
+                if hist.find_run(key) is None:
+                    with prof.stage("history"):
+                        hist.record(results, df, upload_label(), key, rules_fingerprint())
+            else:
+                st.caption("🗂 Geçmişe yalnızca tüm dosya (📚) veya akış modundaki çalıştırmalar eklenir.")
+            render_history(hist, selected_prefixes)
 
         # ---------- En Düşük 5 & En Yüksek 5 ----------
-        st.markdown("## 🧩 En Düşük 5 Skor")
-        bottom5 = results.sort_values(by=["Toplam Puan","Skor %","Key"], ascending=[True, True, True]).head(5)
-        if len(bottom5) == 0:
-            st.info("Gösterilecek kayıt yok.")
-        else:
-            for _, rr in bottom5.iterrows():
-                render_case_card(rr, MAX_BY_TABLE, show_debug=show_debug)
-
-        st.markdown("## 🏅 En Yüksek 5 Skor")
-        top5 = results.sort_values(by=["Toplam Puan","Skor %","Key"], ascending=[False, False, True]).head(5)
-        if len(top5) == 0:
-            st.info("Gösterilecek kayıt yok.")
-        else:
-            for _, rr in top5.iterrows():
-                render_case_card(rr, MAX_BY_TABLE, show_debug=show_debug)
+        with prof.stage("render_cards"):
+            bottom5, top5 = extremes(results, 5)
+            render_case_list("## 🧩 En Düşük 5 Skor", bottom5, show_debug, details, slot="bottom")
+            render_case_list("## 🏅 En Yüksek 5 Skor", top5, show_debug, details, slot="top")
 
-        # ---------- Detay kartları (tüm örneklem) ----------
-        st.markdown("## 📝 Tüm Detaylar")
-        for _, r in results.iterrows():
-            render_case_card(r, MAX_BY_TABLE, show_debug=show_debug)
+            # ---------- Detay kartları (tüm örneklem, sayfalı) ----------
+            render_case_pages(results, show_debug, details)
 
     except Exception as e:
         st.exception(e)
         st.stop()
+
+# ---------- Profil (debug) ----------
+def render_profile(prof):
+    """Aşama süreleri ve sayaçlar; JSON olarak indirilebilir."""
+    if not prof.enabled:
+        return
+    report = prof.to_dict()
+    with st.expander("⏱ Profil — aşama süreleri & sayaçlar", expanded=False):
+        if report["stages"]:
+            stages = pd.DataFrame(report["stages"])
+            stages["ms"] = (stages["seconds"] * 1000).round(2)
+            st.dataframe(stages[["stage", "ms", "calls"]], use_container_width=True, hide_index=True)
+        st.caption("Önbellekten gelen adımlar (CSV okuma, steps çözme) yalnızca ilk çalıştırmada görünür.")
+        if report["counters"]:
+            st.dataframe(pd.Series(report["counters"], name="adet").rename_axis("sayaç").reset_index(),
+                         use_container_width=True, hide_index=True)
+        st.download_button(
+            "📥 Profili JSON olarak indir",
+            data=prof.to_json(),
+            file_name=f"profil_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+        )
+
+# ---------- Çalıştır ----------
+if uploaded:
+    # Tek dosya: bytes (önceki davranış); çoklu: [(etiket, bytes)]
+    if len(uploaded) == 1:
+        data = uploaded[0].getvalue()
+    else:
+        data = list(zip(source_labels([f.name for f in uploaded]), (f.getvalue() for f in uploaded)))
+    with profiling(Profiler() if show_debug else NULL_PROFILER) as prof:
+        if stream_mode:
+            run_streaming(data)
+        else:
+            run_full(data)
+    render_profile(prof)
 else:
     st.info("Başlamak için `;` ayraçlı CSV dosyanızı yükleyin.")
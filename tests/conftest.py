@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Test Case Evaluator — test ortak ayarları
+# - Modüller depo kökünde düz duruyor: kök sys.path'e eklenir
+# - `corpus`: kenar durumlu küçük regresyon korpusu (tests/fixtures/regression_corpus.csv)
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+
+from ingest import load_export  # noqa: E402
+
+CORPUS = FIXTURES / "regression_corpus.csv"
+
+@pytest.fixture
+def corpus():
+    return load_export(CORPUS)
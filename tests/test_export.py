@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Akış CSV'sinden parquet / arrow dönüşümü: metin kolonları tip çıkarımına takılmamalı
+
+import pytest
+
+from export import ResultWriter, convert_csv
+from scoring import finalize_results, score_frame
+
+pa = pytest.importorskip("pyarrow")
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(path)
+    import pyarrow.feather as feather
+    return feather.read_table(path)
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_convert_numeric_text_columns(tmp_path, corpus, fmt):
+    results = finalize_results(score_frame(corpus), corpus)
+    results["Summary"] = ["12345", "678"] * (len(results) // 2) + ["00042"] * (len(results) % 2)
+    results["Key"] = [str(i) for i in range(len(results))]
+    results["Prefix"] = "678"
+    src = tmp_path / "stream.csv"
+    with ResultWriter(src) as w:
+        w.write(results)
+
+    out = tmp_path / f"out.{fmt}"
+    assert convert_csv(src, out, fmt, chunksize=5) == len(results)
+    table = _read(out, fmt)
+    assert table.schema.field("Summary").type == pa.string()
+    got = table.to_pandas()
+    assert got["Summary"].tolist() == results["Summary"].tolist()
+    assert got["Key"].tolist() == results["Key"].tolist()
+    assert got["Prefix"].astype(str).tolist() == ["678"] * len(results)
+    assert got["Toplam Puan"].tolist() == results["Toplam Puan"].tolist()
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Özellik yolu (metin hattı → özellikler → puanlama) ↔ tam skorlama: birebir aynı sonuç
+
+import pandas as pd
+import pytest
+
+from features import extract_features, load_features, save_features
+from scoring import finalize_results, score_feature_frame, score_frame
+
+# Steps metinleri özelliklerde saklanmaz; bu debug kolonları özellik yolunda boştur (dışa aktarılmaz)
+TEXT_JOIN_COLS = ["_actions_join", "_expected_join", "_data_join"]
+
+def _comparable(results: pd.DataFrame) -> pd.DataFrame:
+    return results.drop(columns=[c for c in TEXT_JOIN_COLS if c in results.columns])
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_feature_path_matches_full_scoring(corpus, debug):
+    expected = score_frame(corpus, debug=debug)
+    got = score_feature_frame(extract_features(corpus), debug=debug)
+    pd.testing.assert_frame_equal(_comparable(got), _comparable(expected))
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_saved_features_match_full_scoring(tmp_path, corpus, debug):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "features.parquet"
+    save_features(extract_features(corpus), path)
+    feats = load_features(path)
+    expected = finalize_results(score_frame(corpus, debug=debug), corpus)
+    got = finalize_results(score_feature_frame(feats, debug=debug), feats)
+    pd.testing.assert_frame_equal(_comparable(got).reset_index(drop=True), _comparable(expected).reset_index(drop=True))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Kural parmak izleri: skoru değiştiren her kural ScoreStore'u (rules) boşaltmalı;
+#    metin kuralları özellik dosyasını (features) da geçersiz kılmalı
+
+import re
+
+import pytest
+
+import scoring
+
+TEXT_RULES = [
+    ("_LIST_ITEM_RX", re.compile(r'(^|\n)\s*(\d+[\)\.])\s+\S+')),
+    ("_JOINER_RX", re.compile(r'(?:,|\bve\b)', re.I)),
+    ("_MEANINGLESS", frozenset({"", "-"})),
+    ("_PUNCT_ONLY_RX", re.compile(r'[\s\.,;:\-]*')),
+    ("TITLE_MIN_LEN", 12),
+    ("TITLE_WEAK_PHRASES", ["test edilir"]),
+    ("SUBSTEP_MIN_JOINERS", 4),
+    ("CLIENT_KEYWORDS", ["android", "ios"]),
+]
+SCORE_RULES = [
+    ("TITLE_WEAK_DEDUCTION", 2),
+    ("DATA_MIN_SIGNALS", 3),
+    ("MAX_BY_TABLE", {"A": 100, "B": 100, "C": 100, "D": 100}),
+]
+
+@pytest.mark.parametrize("name,value", TEXT_RULES)
+def test_text_rule_changes_both_fingerprints(monkeypatch, name, value):
+    rules, feats = scoring.rules_fingerprint(), scoring.features_fingerprint()
+    monkeypatch.setattr(scoring, name, value)
+    assert scoring.rules_fingerprint() != rules
+    assert scoring.features_fingerprint() != feats
+
+@pytest.mark.parametrize("name,value", SCORE_RULES)
+def test_score_rule_changes_only_rules_fingerprint(monkeypatch, name, value):
+    rules, feats = scoring.rules_fingerprint(), scoring.features_fingerprint()
+    monkeypatch.setattr(scoring, name, value)
+    assert scoring.rules_fingerprint() != rules
+    assert scoring.features_fingerprint() == feats
+
+def test_penalty_ladder_changes_rules_fingerprint(monkeypatch):
+    rules = scoring.rules_fingerprint()
+    monkeypatch.setattr(scoring, "penalty_for_hits", lambda hits: min(max(hits, 0), 3))
+    assert scoring.rules_fingerprint() != rules
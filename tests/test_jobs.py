@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Akış işi ilerlemesi: çoklu dosyada okunan bayt toplamı aşmamalı ve geri gitmemeli
+
+from pathlib import Path
+
+import jobs
+
+CORPUS = Path(__file__).resolve().parent / "fixtures" / "regression_corpus.csv"
+
+def test_multi_file_stream_progress(tmp_path):
+    data = CORPUS.read_bytes()
+    files = [("a.csv", data), ("b.csv", data), ("c.csv", data)]
+    total = sum(len(d) for _, d in files)
+    job = jobs.Job(jobs.stream_job)
+    seen = []
+    report = job.report
+    def record(stage, done, total=None, rows=None):
+        seen.append(done)
+        return report(stage, done, total, rows)
+    job.report = record
+
+    stats = jobs.stream_job(job, files, tmp_path / "out.csv", chunksize=4)
+    assert stats.count > 0
+    assert max(seen) == total
+    assert seen == sorted(seen)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# 📌 HTTP skorlama servisi: toplu / satır bazlı yol eşitliği, kolonsuz case'ler, localhost uçtan uca
+
+import http.client
+import json
+import threading
+
+import pytest
+
+import service
+from scoring import STEPS_COLS
+
+def _cases(df) -> list:
+    df = df.drop(columns=[c for c in df.columns if c.startswith("_")])
+    df = df.astype(object).where(df.notna(), None)
+    return [dict(zip(df.columns, row)) for row in df.itertuples(index=False)]
+
+def _check(results, cases):
+    assert len(results) == len(cases)
+    assert all(r is not None for r in results)
+
+@pytest.mark.parametrize("rowwise_max", [0, 10**6])
+def test_columnar_and_rowwise_paths_agree(monkeypatch, corpus, rowwise_max):
+    cases = _cases(corpus)
+    cases += [{k: v for k, v in c.items() if k != STEPS_COLS[0]} for c in cases[:5]]   # ikinci şema
+    monkeypatch.setattr(service, "ROWWISE_MAX", rowwise_max)
+    got = service.score_cases(cases)
+    _check(got, cases)
+    assert got == [service._row_result(c) for c in cases]
+
+@pytest.mark.parametrize("rowwise_max", [0, 10**6])
+def test_cases_without_columns(monkeypatch, rowwise_max):
+    cases = [{}] * 300 + [{"Summary": "Kısa"}]
+    monkeypatch.setattr(service, "ROWWISE_MAX", rowwise_max)
+    got = service.score_cases(cases)
+    _check(got, cases)
+    assert got[0] == service._row_result({})
+
+@pytest.fixture
+def server():
+    srv = service.serve("127.0.0.1", 0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def _request(srv, method, path, body=None):
+    conn = http.client.HTTPConnection(*srv.server_address[:2], timeout=10)
+    try:
+        conn.request(method, path, body)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+def test_http_round_trip(server, corpus):
+    cases = _cases(corpus)
+    status, single = _request(server, "POST", "/score", json.dumps(cases[0]))
+    assert status == 200 and single == service._row_result(cases[0])
+
+    status, body = _request(server, "POST", "/score", json.dumps({"cases": cases}))
+    assert status == 200 and body["rules"] == server.rules
+    _check(body["results"], cases)
+    assert body["results"] == json.loads(json.dumps(service.score_cases(cases)))
+
+    status, body = _request(server, "POST", "/score", json.dumps([{}] * 300))
+    assert status == 200
+    _check(body["results"], [{}] * 300)
+
+def test_http_errors(server):
+    assert _request(server, "POST", "/score", b"{bad")[0] == 400
+    assert _request(server, "POST", "/score", json.dumps([1]))[0] == 400
+    assert _request(server, "GET", "/nope")[0] == 404
+    status, stats = _request(server, "GET", "/stats")
+    assert status == 200 and stats["errors"] == 2
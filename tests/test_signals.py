@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# 📌 Derlenmiş sinyal tarayıcı / hızlı steps çözümü ↔ eski desen-desen arama (reference_*)
+
+import pytest
+
+import scoring
+from scoring import (
+    STEPS_COLS, block_has_many_substeps, expected_style_hits, pick_first_existing, row_texts, verify_steps_cell,
+    verify_text_rules,
+)
+from signals import reference_data_signals, reference_precond_signals, verify_row
+
+def test_steps_cells_match_reference(corpus):
+    steps_col = pick_first_existing(STEPS_COLS, corpus.columns)
+    diffs = {str(cell): verify_steps_cell(cell) for cell in dict.fromkeys(corpus[steps_col].tolist())}
+    assert {cell: d for cell, d in diffs.items() if d} == {}
+
+def test_row_signals_match_reference(corpus):
+    diffs = {}
+    for key, summary, actions, expecteds, pre_text, labels_text in row_texts(corpus):
+        d = verify_row(summary, actions, expecteds, pre_text, labels_text)
+        if d:
+            diffs[key] = d
+    assert diffs == {}
+
+def test_corpus_exercises_signals(corpus):
+    """Korpus sinyal üretmeseydi karşılaştırma boşuna geçerdi."""
+    data = pre = 0
+    for _, summary, actions, expecteds, pre_text, _ in row_texts(corpus):
+        data += bool(reference_data_signals(" \n ".join([summary] + actions + expecteds)))
+        pre += bool(reference_precond_signals(" \n ".join([summary] + actions + [pre_text or ""])))
+    assert data >= 5 and pre >= 3
+
+def test_text_rules_match_reference(corpus):
+    """Derlenmiş Expected yazım sayımı / tek blok kuralı ↔ desen-desen referans: aynı isabet sayıları."""
+    diffs = {}
+    for key, _, actions, expecteds, _, _ in row_texts(corpus):
+        d = verify_text_rules(actions, expecteds)
+        if d:
+            diffs[key] = d
+    assert diffs == {}
+
+def test_corpus_exercises_text_rules(corpus):
+    """Korpusta geçmiş zaman isabeti olan ve tek blokta çok adımlı satırlar olmalı."""
+    style = substeps = 0
+    for _, _, actions, expecteds, _, _ in row_texts(corpus):
+        style += expected_style_hits(" . ".join(expecteds)) > 0
+        substeps += len(actions) == 1 and block_has_many_substeps(actions[0] or "")
+    assert style >= 7 and substeps >= 3
+
+@pytest.mark.parametrize("name,value", [("SUBSTEP_MIN_LINES", 2), ("SUBSTEP_MIN_SEMICOLONS", 1),
+                                        ("SUBSTEP_MIN_JOINERS", 2)])
+def test_substep_reference_follows_tuned_thresholds(monkeypatch, corpus, name, value):
+    """Eşik ayarı referansla derlenmiş yolu ayırmamalı (referans aynı sabitleri okur)."""
+    texts = [a for _, _, actions, _, _, _ in row_texts(corpus) for a in actions]
+    monkeypatch.setattr(scoring, name, value)
+    scoring.block_has_many_substeps.cache_clear()
+    try:
+        got = [scoring.block_has_many_substeps(t) for t in texts]
+        assert got == [scoring.reference_block_has_many_substeps(t) for t in texts]
+    finally:
+        scoring.block_has_many_substeps.cache_clear()   # ayarlı eşikle hesaplanan sonuçlar kalmasın